@@ -0,0 +1,79 @@
+from typing import Dict, Any, Optional, Tuple, Callable
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]  # (workflow content hash, target, converter version)
+
+@dataclass
+class Artifact:
+    body: bytes
+    etag: str
+
+def content_hash(data: Any) -> str:
+    """Stable hash of a workflow document, independent of key order and whitespace"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def make_etag(key: CacheKey) -> str:
+    """Strong ETag for an artifact; outputs are deterministic per key so the key identifies the bytes"""
+    return '"' + hashlib.sha256('\x1f'.join(key).encode('utf-8')).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header (weak comparison, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = (t.strip() for t in if_none_match.split(','))
+    return any((t[2:] if t.startswith('W/') else t) == etag for t in tags)
+
+class ArtifactCache:
+    """LRU cache of serialized conversion outputs bounded by total body size"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[CacheKey, Artifact]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[Artifact]:
+        with self._lock:
+            artifact = self._items.get(key)
+            if artifact is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return artifact
+
+    def put(self, key: CacheKey, body: bytes) -> Artifact:
+        artifact = Artifact(body=body, etag=make_etag(key))
+        if len(body) > self.max_bytes:
+            return artifact
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old.body)
+            self._items[key] = artifact
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted.body)
+        return artifact
+
+    def get_or_build(self, key: CacheKey, build: Callable[[], bytes]) -> Artifact:
+        artifact = self.get(key)
+        if artifact is None:
+            artifact = self.put(key, build())
+        return artifact
+
+    def stats(self) -> Dict[str, Any]:
+        return {'entries': len(self._items), 'bytes': self.size, 'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
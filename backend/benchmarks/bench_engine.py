@@ -0,0 +1,175 @@
+"""Measure WorkflowEngine's own per-step cost with zero-latency executors.
+
+Every engine category is served by a no-op executor and the inter-step delay is zero, so what
+remains is dispatch in execute_items, the log callback and WorkflowExecution.add_log, data copies
+and to_dict. Results are reported per step against workflow length and input payload size, and
+per item when steps run over --items items (batch serves each chunk in one call).
+
+    cd backend
+    python -m benchmarks.bench_engine --steps 10,100,1000 --payload-bytes 100,10000 --output engine.json
+    python -m benchmarks.bench_engine --log   # include the cost of emitting INFO records
+    python -m benchmarks.bench_engine --executors copy,batch --items 1000 --steps 10
+"""
+from typing import Dict, Any, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from workflow_engine import WorkflowEngine, WorkflowExecution
+from executors.base_executor import BaseExecutor
+from parsers.n8n_parser import N8nParser
+from benchmarks.synthetic import n8n_workflow
+
+CATEGORIES = ['http', 'ai', 'email', 'database', 'generic']
+
+class PassthroughExecutor(BaseExecutor):
+    """Returns its input untouched: isolates dispatch and logging"""
+
+    async def execute(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
+        return data
+
+class CopyExecutor(BaseExecutor):
+    """Adds a result key to a copy of its input, like the built-in executors do"""
+
+    async def execute(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
+        return {**data, f"{step['name']}_result": 'success'}
+
+class BatchCopyExecutor(CopyExecutor):
+    """CopyExecutor results, produced for a whole chunk of items per call"""
+    batch_size = 100
+
+    async def execute_batch(self, step, items, credentials, parameters=None):
+        key = f"{step['name']}_result"
+        return [{**data, key: 'success'} for data in items]
+
+EXECUTORS = {'passthrough': PassthroughExecutor, 'copy': CopyExecutor, 'batch': BatchCopyExecutor}
+
+def workflow_of(steps: int, seed: int) -> Dict[str, Any]:
+    # +1 for the trigger node the generator always adds
+    return N8nParser().parse(n8n_workflow(steps + 1, 1, 64, seed))
+
+def payload_of(size: int, items: int = 1) -> Any:
+    if items > 1:
+        return [{'id': i, 'email': 'test@example.com', 'name': 'Benchmark', 'body': 'x' * size} for i in range(items)]
+    return {'id': 1, 'email': 'test@example.com', 'name': 'Benchmark', 'body': 'x' * size}
+
+async def run_once(engine: WorkflowEngine, workflow: Dict[str, Any], payload: Dict[str, Any]) -> WorkflowExecution:
+    """Mirrors main.run_workflow_background"""
+    execution = WorkflowExecution(id='bench', workflow_id='bench', status='running', started_at=datetime.now())
+    execution.add_log('info', 'Starting')
+    execution.result = await engine.execute(workflow, payload, {}, lambda log: execution.add_log(log['level'], log['message']))
+    execution.status = 'completed'
+    execution.completed_at = datetime.now()
+    execution.add_log('success', 'Completed')
+    return execution
+
+async def measure(mode: str, steps: int, payload_bytes: int, repeat: int, seed: int, items: int = 1) -> Dict[str, Any]:
+    engine = WorkflowEngine(executors={category: EXECUTORS[mode]() for category in CATEGORIES}, step_delay=0)
+    workflow = workflow_of(steps, seed)
+    payload = payload_of(payload_bytes, items)
+    await run_once(engine, workflow, payload)  # warm-up: imports, registry memo, client setup
+
+    run_times, dict_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        execution = await run_once(engine, workflow, payload)
+        run_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        execution.to_dict()
+        dict_times.append(time.perf_counter() - start)
+
+    # Allocations in a separate pass, since tracing inflates the timings
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    execution = await run_once(engine, workflow, payload)
+    serialized = execution.to_dict()
+    _, peak = tracemalloc.get_traced_memory()
+    diff = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    tracemalloc.stop()
+    del serialized
+
+    return {
+        'executor': mode, 'steps': steps, 'payload_bytes': payload_bytes, 'items': items, 'repeat': repeat,
+        'run_us': round(statistics.median(run_times) * 1e6, 2),
+        'step_us': round(statistics.median(run_times) / steps * 1e6, 2),
+        'item_step_us': round(statistics.median(run_times) / (steps * items) * 1e6, 3),
+        'step_min_us': round(min(run_times) / steps * 1e6, 2),
+        'to_dict_us': round(statistics.median(dict_times) * 1e6, 2),
+        'retained_blocks_per_step': round(sum(d.count_diff for d in diff) / steps, 1),
+        'retained_bytes_per_step': round(sum(d.size_diff for d in diff) / steps, 1),
+        'peak_bytes_per_step': round(peak / steps, 1),
+        'log_entries': len(execution.logs)
+    }
+
+async def run(modes: List[str], steps: List[int], payloads: List[int], repeat: int, seed: int, items: int = 1) -> List[Dict[str, Any]]:
+    results = []
+    for mode in modes:
+        for n in steps:
+            for size in payloads:
+                # Keep total work per configuration roughly constant
+                r = await measure(mode, n, size, max(3, repeat * 100 // max(n * items, 100)), seed, items)
+                results.append(r)
+                per_item = f"{r['item_step_us']:>9.3f} us/item-step  " if items > 1 else ''
+                print(f"{mode:12} steps={n:<6} payload={size:<8} {r['step_us']:>9.2f} us/step  {per_item}"
+                      f"{r['retained_bytes_per_step']:>10.1f} B retained/step  {r['peak_bytes_per_step']:>10.1f} B peak/step", file=sys.stderr)
+    return results
+
+def fit(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Split run time into a fixed per-run cost and a marginal per-step cost (least squares over step counts)"""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for r in results:
+        groups.setdefault((r['executor'], r['payload_bytes']), []).append(r)
+    fits = []
+    for (mode, size), rows in groups.items():
+        if len({r['steps'] for r in rows}) < 2:
+            continue
+        xs, ys = [r['steps'] for r in rows], [r['run_us'] for r in rows]
+        mx, my = statistics.fmean(xs), statistics.fmean(ys)
+        slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+        fits.append({'executor': mode, 'payload_bytes': size, 'fixed_us': round(my - slope * mx, 1), 'marginal_step_us': round(slope, 2)})
+        print(f"{mode:12} payload={size:<8} fixed {my - slope * mx:>10.1f} us/run  marginal {slope:>8.2f} us/step", file=sys.stderr)
+    return fits
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-step WorkflowEngine overhead with no-op executors")
+    parser.add_argument('--executors', default='passthrough,copy', help="passthrough returns data as is; copy mimics the built-ins' {**data} results; batch does copy per chunk of 100 items")
+    parser.add_argument('--steps', default='10,100,1000')
+    parser.add_argument('--payload-bytes', default='100,10000,1000000')
+    parser.add_argument('--items', type=int, default=1, help="items each step runs over")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--log', action='store_true', help="format and emit the engine's INFO records (to a discarded stream)")
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.log:
+        logging.basicConfig(level=logging.INFO, stream=open(os.devnull, 'w'), force=True)
+    else:
+        logging.disable(logging.INFO)
+    results = asyncio.run(run(
+        args.executors.split(','), [int(n) for n in args.steps.split(',')], [int(n) for n in args.payload_bytes.split(',')], args.repeat, args.seed, args.items
+    ))
+    report = {
+        'meta': {'timestamp': datetime.now().isoformat(), 'python': platform.python_version(), 'machine': platform.machine(), 'args': vars(args)},
+        'results': results,
+        'fit': fit(results)
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Time and memory-profile parse -> IR -> convert -> codegen on synthetic workflows.
+
+    cd backend
+    python -m benchmarks.bench_pipeline --sizes 10,100,1000,10000 --output bench.json
+    python -m benchmarks.bench_pipeline --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_pipeline --baseline benchmarks/baseline.json   # exits 1 on regressions
+"""
+from typing import Dict, Any, List, Callable, Optional
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from parsers.n8n_parser import N8nParser
+from parsers.zapier_parser import ZapierParser
+from parsers.make_parser import MakeParser
+from converters.ir import build_ir
+from converters.make_converter import convert_to_make
+from converters.zapier_converter import convert_to_zapier
+from converters.n8n_converter import convert_to_n8n
+from codegen.python_generator import generate_python_code, generate_async_python_code
+from benchmarks.synthetic import GENERATORS
+
+PARSERS = {'n8n': N8nParser(), 'zapier': ZapierParser(), 'make': MakeParser()}
+NOISE_FLOOR_MS = 0.05  # differences below this are timer noise, never regressions
+
+def stages(platform_name: str, workflow: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """Each stage gets its inputs precomputed so only the stage itself is measured"""
+    parsed = PARSERS[platform_name].parse(workflow)
+    ir = build_ir(parsed)
+    out = {
+        'parse': lambda: PARSERS[platform_name].parse(workflow),
+        'build_ir': lambda: build_ir(parsed),
+        'convert_to_make': lambda: convert_to_make(ir),
+        'convert_to_zapier': lambda: convert_to_zapier(ir),
+        'generate_python_code': lambda: generate_python_code(parsed),
+        'generate_async_python_code': lambda: generate_async_python_code(ir),
+    }
+    if platform_name != 'n8n':
+        out['convert_to_n8n'] = lambda: convert_to_n8n(ir)
+    return out
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    # Memory is profiled in a separate run: tracemalloc slows allocation-heavy code several-fold
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'median_ms': round(statistics.median(times), 4), 'min_ms': round(min(times), 4), 'peak_kib': round(peak / 1024, 1)}
+
+def result_key(r: Dict[str, Any]) -> str:
+    return f"{r['platform']}/{r['nodes']}/{r['branching']}/{r['param_bytes']}/{r['stage']}"
+
+def run(platforms: List[str], sizes: List[int], branching: List[int], param_bytes: int, repeat: int, seed: int) -> List[Dict[str, Any]]:
+    results = []
+    for platform_name in platforms:
+        for nodes in sizes:
+            for fanout in branching:
+                workflow = GENERATORS[platform_name](nodes, fanout, param_bytes, seed)
+                # Large inputs take long enough that a few repeats give a stable median
+                reps = max(3, repeat * 100 // max(nodes, 100)) if nodes > 100 else repeat
+                for stage, fn in stages(platform_name, workflow).items():
+                    r = {'platform': platform_name, 'nodes': nodes, 'branching': fanout, 'param_bytes': param_bytes, 'stage': stage, 'repeat': reps}
+                    r.update(measure(fn, reps))
+                    results.append(r)
+                    print(f"{result_key(r):55} {r['median_ms']:>10.3f} ms {r['peak_kib']:>10.1f} KiB", file=sys.stderr)
+    return results
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Results slower or hungrier than baseline by more than tolerance (a fraction)"""
+    base = {result_key(r): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        b = base.get(result_key(r))
+        if not b:
+            continue
+        for metric, floor in (('median_ms', NOISE_FLOOR_MS), ('peak_kib', 1.0)):
+            if r[metric] > b[metric] * (1 + tolerance) and r[metric] - b[metric] > floor:
+                regressions.append({'key': result_key(r), 'metric': metric, 'baseline': b[metric], 'current': r[metric], 'ratio': round(r[metric] / b[metric], 2) if b[metric] else None})
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parse/convert/codegen on synthetic workflows")
+    parser.add_argument('--platforms', default='n8n,zapier,make')
+    parser.add_argument('--sizes', default='10,100,1000,10000')
+    parser.add_argument('--branching', default='1,4', help="fan-out per node; 1 is a linear chain")
+    parser.add_argument('--param-bytes', type=int, default=64, help="size of each node's text parameter")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    parser.add_argument('--baseline', help="compare against this results file")
+    parser.add_argument('--save-baseline', help="also write the results here as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown fraction before flagging")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)  # parsers log per call
+    results = run(
+        args.platforms.split(','), [int(n) for n in args.sizes.split(',')], [int(b) for b in args.branching.split(',')],
+        args.param_bytes, args.repeat, args.seed
+    )
+    report: Dict[str, Any] = {
+        'meta': {'timestamp': datetime.now().isoformat(), 'python': platform.python_version(), 'machine': platform.machine(), 'args': vars(args)},
+        'results': results
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(results, json.load(f), args.tolerance)
+        for r in report['regressions']:
+            print(f"REGRESSION {r['key']} {r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']})", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(text)
+    return 1 if report.get('regressions') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
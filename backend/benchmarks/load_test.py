@@ -0,0 +1,252 @@
+"""Drive the real API with mixed traffic and report throughput, latency and server memory.
+
+Starts `uvicorn main:app` in a subprocess (or targets --url) and runs --concurrency clients
+for --duration seconds, each picking upload / execute / status / download / export requests
+by weight. A separate probe hits /health at a fixed interval: its latency stays near zero
+unless something blocks the event loop.
+
+    cd backend
+    python -m benchmarks.load_test --concurrency 32 --duration 30 --output load.json
+    python -m benchmarks.load_test --url http://localhost:8000 --pid $(pgrep -f "uvicorn main:app")
+"""
+from typing import Dict, Any, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+from benchmarks.synthetic import GENERATORS
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = 'upload=1,execute=2,status=6,download=4,export=3'
+TARGETS = ['n8n', 'zapier', 'make']
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def rss_kib(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+
+    def add(self, endpoint: str, seconds: float, status: int):
+        self.latencies.setdefault(endpoint, []).append(seconds * 1000)
+        codes = self.statuses.setdefault(endpoint, {})
+        codes[status] = codes.get(status, 0) + 1
+        if status == 0 or status >= 500:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            endpoint: {
+                'requests': len(values), 'errors': self.errors.get(endpoint, 0), 'rps': round(len(values) / elapsed, 1),
+                'p50_ms': round(percentile(values, 50), 2), 'p95_ms': round(percentile(values, 95), 2),
+                'p99_ms': round(percentile(values, 99), 2), 'max_ms': round(max(values), 2),
+                'statuses': {str(code): n for code, n in sorted(self.statuses[endpoint].items())}
+            }
+            for endpoint, values in sorted(self.latencies.items())
+        }
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], nodes: int, seed: int):
+        self.client = client
+        self.mix = mix
+        self.nodes = nodes
+        self.rng = random.Random(seed)
+        self.stats = Stats()
+        self.workflow_ids: List[str] = []
+        self.execution_ids: List[str] = []
+        self._uploads = 0
+
+    async def timed(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.add(endpoint, time.perf_counter() - start, 0)
+            return None
+        self.stats.add(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def upload(self):
+        self._uploads += 1
+        source = self.rng.choice(TARGETS)
+        workflow = GENERATORS[source](self.nodes, self.rng.choice([1, 3]), 64, self._uploads)
+        body = json.dumps(workflow).encode('utf-8')
+        r = await self.timed('upload', 'POST', '/api/workflows/upload', files={'file': (f"load_{self._uploads}.json", body, 'application/json')})
+        if r is not None and r.status_code == 200:
+            self.workflow_ids.append(r.json()['workflow_id'])
+
+    async def execute(self):
+        r = await self.timed('execute', 'POST', '/api/workflows/execute', json={'workflow_id': self.rng.choice(self.workflow_ids), 'input_data': {'load_test': True}})
+        if r is not None and r.status_code == 200:
+            self.execution_ids.append(r.json()['execution_id'])
+
+    async def status(self):
+        if not self.execution_ids:
+            return await self.execute()
+        await self.timed('status', 'GET', f"/api/executions/{self.rng.choice(self.execution_ids[-200:])}")
+
+    async def download(self):
+        await self.timed('download', 'GET', f"/api/workflows/{self.rng.choice(self.workflow_ids)}/download/{self.rng.choice(TARGETS)}")
+
+    async def export(self):
+        runtime = self.rng.choice(['sync', 'async'])
+        await self.timed('export', 'GET', f"/api/workflows/{self.rng.choice(self.workflow_ids)}/export/python", params={'runtime': runtime})
+
+    async def client_loop(self, deadline: float):
+        names, weights = list(self.mix), list(self.mix.values())
+        while time.monotonic() < deadline:
+            await getattr(self, self.rng.choices(names, weights)[0])()
+
+    async def probe(self, deadline: float, interval: float):
+        while time.monotonic() < deadline:
+            await self.timed('health_probe', 'GET', '/health')
+            await asyncio.sleep(interval)
+
+async def sample_memory(pid: Optional[int], deadline: float, samples: List[int]):
+    while pid and time.monotonic() < deadline:
+        value = rss_kib(pid)
+        if value is not None:
+            samples.append(value)
+        await asyncio.sleep(0.5)
+
+async def wait_until_up(client: httpx.AsyncClient, server: Optional[subprocess.Popen], timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if (await client.get('/health')).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become healthy in time")
+
+async def run(args, base_url: str, pid: Optional[int], server: Optional[subprocess.Popen]) -> Dict[str, Any]:
+    mix = {name: float(weight) for name, weight in (part.split('=') for part in args.mix.split(','))}
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        await wait_until_up(client, server)
+        test = LoadTest(client, mix, args.nodes, args.seed)
+        for _ in range(args.workflows):
+            await test.upload()
+        if not test.workflow_ids:
+            raise RuntimeError("No workflow could be uploaded")
+        test.stats = Stats()  # seeding uploads are not part of the measured run
+
+        rss_before = rss_kib(pid) if pid else None
+        samples: List[int] = []
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(
+            sample_memory(pid, deadline, samples), test.probe(deadline, args.probe_interval),
+            *(test.client_loop(deadline) for _ in range(args.concurrency))
+        )
+        elapsed = time.monotonic() - started
+        rss_after = rss_kib(pid) if pid else None
+
+    endpoints = test.stats.summary(elapsed)
+    total = sum(e['requests'] for name, e in endpoints.items() if name != 'health_probe')
+    return {
+        'meta': {'timestamp': datetime.now().isoformat(), 'python': platform.python_version(), 'url': base_url, 'args': vars(args)},
+        'throughput_rps': round(total / elapsed, 1),
+        'requests': total,
+        'elapsed_s': round(elapsed, 2),
+        'endpoints': endpoints,
+        'memory_kib': {
+            'before': rss_before, 'after': rss_after, 'peak': max(samples + [rss_after or 0]) or None,
+            'growth': rss_after - rss_before if rss_before and rss_after else None
+        } if pid else None
+    }
+
+def start_server(port: int, workdir: str) -> subprocess.Popen:
+    # A scratch cwd keeps anything the app or executed scripts write out of the source tree
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get('PYTHONPATH')]))}
+    with open(os.path.join(workdir, 'server.log'), 'wb') as log:
+        return subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+            cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the MigroMat API with mixed traffic")
+    parser.add_argument('--url', help="target a running server instead of starting one")
+    parser.add_argument('--pid', type=int, help="server pid for memory sampling when --url is used")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds of measured traffic")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="relative weights per operation")
+    parser.add_argument('--workflows', type=int, default=20, help="workflows uploaded before the run starts")
+    parser.add_argument('--nodes', type=int, default=25, help="steps per uploaded workflow")
+    parser.add_argument('--probe-interval', type=float, default=0.1, help="seconds between /health probes")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the report JSON here (default: stdout)")
+    parser.add_argument('--max-p99-ms', type=float, help="exit 1 if any endpoint's p99 exceeds this")
+    args = parser.parse_args(argv)
+
+    server = None
+    workdir = tempfile.mkdtemp(prefix='migromat_load_')
+    if args.url:
+        base_url, pid = args.url.rstrip('/'), args.pid
+    else:
+        port = free_port()
+        server = start_server(port, workdir)
+        base_url, pid = f"http://127.0.0.1:{port}", server.pid
+        print(f"server log: {os.path.join(workdir, 'server.log')}", file=sys.stderr)
+    try:
+        report = asyncio.run(run(args, base_url, pid, server))
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    for name, e in report['endpoints'].items():
+        print(f"{name:14} {e['requests']:>7} req {e['rps']:>8.1f}/s  p50 {e['p50_ms']:>8.2f}  p95 {e['p95_ms']:>8.2f}  p99 {e['p99_ms']:>8.2f} ms  errors {e['errors']}", file=sys.stderr)
+    print(f"throughput {report['throughput_rps']} req/s; memory {report['memory_kib']}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.max_p99_ms is not None and any(e['p99_ms'] > args.max_p99_ms for e in report['endpoints'].values()):
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Synthetic n8n, Zapier and Make workflows of arbitrary size for benchmarking.
+
+Node types are drawn from node_types.json so parsing, registry lookups and code generation
+follow the same paths real uploads do. Output is deterministic for a given seed.
+"""
+from typing import Dict, Any, List, Callable
+from functools import lru_cache
+import json
+import random
+
+from node_registry import NODE_REGISTRY
+
+@lru_cache(maxsize=1)
+def _catalog() -> List[Dict[str, Any]]:
+    with open(NODE_REGISTRY.path, encoding='utf-8') as f:
+        types = json.load(f)['types']
+    return [dict(entry, key=key) for key, entry in sorted(types.items()) if entry.get('n8n')]
+
+def _parameters(rng: random.Random, param_bytes: int) -> Dict[str, Any]:
+    return {
+        'text': ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(param_bytes)),
+        'options': {'retry': rng.randint(0, 3), 'timeout': rng.choice([10, 30, 60])},
+        'fields': [{'name': f"field_{n}", 'value': f"={{{{ $json.field_{n} }}}}"} for n in range(3)]
+    }
+
+def _parent(i: int, branching: int) -> int:
+    """Index of node i's upstream node: a chain for branching=1, otherwise a tree with that fan-out"""
+    return (i - 1) // branching
+
+def n8n_workflow(nodes: int, branching: int = 1, param_bytes: int = 64, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    catalog = _catalog()
+    items = [{'id': 'n0', 'name': 'Start', 'type': 'n8n-nodes-base.manualTrigger', 'typeVersion': 1, 'position': [0, 0], 'parameters': {}}]
+    for i in range(1, nodes):
+        entry = rng.choice(catalog)
+        items.append({
+            'id': f"n{i}", 'name': f"{entry['key']} {i}", 'type': entry['n8n'], 'typeVersion': 1,
+            'position': [200 * i, 100 * (i % branching)], 'parameters': _parameters(rng, param_bytes)
+        })
+    connections: Dict[str, Any] = {}
+    for i in range(1, nodes):
+        source = items[_parent(i, branching)]['name']
+        connections.setdefault(source, {'main': [[]]})['main'][0].append({'node': items[i]['name'], 'type': 'main', 'index': 0})
+    return {'name': f"Synthetic n8n {nodes}x{branching}", 'nodes': items, 'connections': connections}
+
+def zapier_workflow(nodes: int, branching: int = 1, param_bytes: int = 64, seed: int = 0) -> Dict[str, Any]:
+    # Zaps are linear; branching only changes which step each one reads from
+    rng = random.Random(seed)
+    catalog = _catalog()
+    steps = []
+    for i in range(1, nodes):
+        entry = rng.choice(catalog)
+        params = _parameters(rng, param_bytes)
+        params['input'] = f"{{{{steps.{_parent(i, branching)}.output}}}}"
+        steps.append({'app': entry['key'], 'action': 'run', 'params': params})
+    return {'name': f"Synthetic Zap {nodes}x{branching}", 'trigger': {'app': 'webhook', 'action': 'catch_hook', 'params': {}}, 'steps': steps}
+
+def make_workflow(nodes: int, branching: int = 1, param_bytes: int = 64, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    modules_with_make = [e for e in _catalog() if (e.get('make') or {}).get('module')]
+    flow = [{'id': 1, 'module': 'gateway:CustomWebHook', 'version': 1, 'parameters': {}, 'mapper': {}}]
+    for i in range(1, nodes):
+        entry = rng.choice(modules_with_make)
+        params = _parameters(rng, param_bytes)
+        flow.append({'id': i + 1, 'module': entry['make']['module'], 'version': entry['make'].get('version', 1), 'parameters': params, 'mapper': {'input': f"{{{{{_parent(i, branching) + 1}.output}}}}"}})
+    return {'name': f"Synthetic scenario {nodes}x{branching}", 'flow': flow, 'metadata': {'version': 1}}
+
+GENERATORS: Dict[str, Callable[..., Dict[str, Any]]] = {'n8n': n8n_workflow, 'zapier': zapier_workflow, 'make': make_workflow}
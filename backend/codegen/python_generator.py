@@ -0,0 +1,202 @@
+from typing import Dict, Any, List, Callable
+from string import Formatter
+import logging
+
+from node_registry import NODE_REGISTRY
+from converters.ir import WorkflowIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when generated output changes so cached artifacts are not reused
+GENERATOR_VERSION = '3.2'
+
+# Minimum migromat_runtime version generated scripts are written against
+RUNTIME_REQUIRES = '1.0'
+
+def compile_template(template: str) -> Callable[..., str]:
+    """Pre-split a str.format template into literal and field segments once, at import"""
+    parts = list(Formatter().parse(template))
+    def render(**values) -> str:
+        out = []
+        for literal, field_name, _, _ in parts:
+            out.append(literal)
+            if field_name is not None:
+                out.append(str(values[field_name]))
+        return ''.join(out)
+    return render
+
+HEADER = compile_template('''#!/usr/bin/env python3
+"""
+{name}
+Generated by MigroMat v3.0 - Ultimate Edition
+Total Steps: {total}
+"""
+from typing import Dict, Any
+from migromat_runtime import require, logger
+require("{runtime}")
+from migromat_runtime.sync import api, main
+
+''')
+
+STEP_TEMPLATES = {
+    'airtable': compile_template('''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    api.airtable_create("Table", {{"Name": d.get("name", "Unknown")}}, lambda r: r and d.__setitem__("airtable_id", r.get("id")))
+    return d
+
+'''),
+    'openai': compile_template('''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    api.openai_queue(f"Process: {{d}}", lambda r: r and d.__setitem__("ai_response", r))
+    return d
+
+'''),
+    'email': compile_template('''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    api.email_queue(d.get("email", "test@example.com"), "Notification", "Done")
+    return d
+
+'''),
+    'generic': compile_template('''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    d["step{i}_done"] = True
+    return d
+
+'''),
+}
+
+RUN_HEADER = 'STEPS = [\n'
+
+RUN_CALL = compile_template('    step{i}_{safe},\n')
+
+FOOTER = compile_template(''']
+
+if __name__ == "__main__":
+    main("{name}", STEPS)
+''')
+
+def safe_identifier(name: str, i: int) -> str:
+    return ''.join(c if c.isalnum() or c == '_' else '_' for c in name.lower())[:30].strip('_') or f's{i}'
+
+def generate_python_code(workflow: Dict[str, Any]) -> str:
+    """Generate production-ready Python automation code"""
+    try:
+        steps = workflow.get('steps', [])
+        if not steps:
+            return "# Error: No steps found"
+
+        name = workflow.get('name', 'workflow').replace('"', "'")
+
+        # Each step's identifier and template are resolved exactly once
+        plan = []
+        for i, step in enumerate(steps, 1):
+            sn = step.get('name', f'step_{i}')
+            kind = NODE_REGISTRY.category('codegen', step.get('type', 'action'), sn)
+            plan.append((i, sn, safe_identifier(sn, i), STEP_TEMPLATES.get(kind, STEP_TEMPLATES['generic'])))
+
+        parts: List[str] = [HEADER(name=name, total=len(steps), runtime=RUNTIME_REQUIRES)]
+        parts.extend(template(i=i, safe=safe, sn=sn) for i, sn, safe, template in plan)
+        parts.append(RUN_HEADER)
+        parts.extend(RUN_CALL(i=i, safe=safe) for i, _, safe, _ in plan)
+        parts.append(FOOTER(name=name))
+        return ''.join(parts)
+    except Exception as e:
+        logger.error(f"Python generation error: {e}")
+        return f"# Error: {e}"
+
+# ============================================================================
+# ASYNC SCRIPTS
+# ============================================================================
+ASYNC_HEADER = compile_template('''#!/usr/bin/env python3
+"""
+{name}
+Generated by MigroMat v3.0 - Ultimate Edition (async runtime)
+Total Steps: {total}
+"""
+import asyncio
+from typing import Dict, Any, List
+from migromat_runtime import require, logger, merge
+require("{runtime}")
+from migromat_runtime.aio import api, each, main
+
+''')
+
+ASYNC_STEP_TEMPLATES = {
+    'airtable': compile_template('''async def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    r = await api.airtable_create("Table", {{"Name": d.get("name", "Unknown")}})
+    if r: d["airtable_id"] = r.get("id")
+    return d
+
+'''),
+    'openai': compile_template('''async def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    r = await api.openai_queue(f"Process: {{d}}")
+    if r: d["ai_response"] = r
+    return d
+
+'''),
+    'email': compile_template('''async def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    await api.email_queue(d.get("email", "test@example.com"), "Notification", "Done")
+    return d
+
+'''),
+    'generic': compile_template('''async def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
+    logger.log("INFO", "Step {i}: {sn}")
+    d["step{i}_done"] = True
+    return d
+
+'''),
+}
+
+ASYNC_RUN_HEADER = '''async def flow(d0: List[Dict[str, Any]]):
+    """Independent branches run concurrently; returns each step's outputs for the runtime to merge"""
+'''
+
+ASYNC_FOOTER = compile_template('''    return [{results}]
+
+if __name__ == "__main__":
+    main("{name}", flow)
+''')
+
+def generate_async_python_code(ir: WorkflowIR) -> str:
+    """Generate an asyncio script that runs independent branches concurrently on one pooled client"""
+    try:
+        if not ir.nodes:
+            return "# Error: No steps found"
+
+        name = (ir.name or 'workflow').replace('"', "'")
+
+        numbers = {}
+        parts: List[str] = [ASYNC_HEADER(name=name, total=len(ir.nodes), runtime=RUNTIME_REQUIRES)]
+        for i, node in enumerate(ir.nodes, 1):
+            numbers[node.id] = i
+            kind = NODE_REGISTRY.category('codegen', node.kind, node.name)
+            parts.append(ASYNC_STEP_TEMPLATES.get(kind, ASYNC_STEP_TEMPLATES['generic'])(i=i, safe=safe_identifier(node.name, i), sn=node.name))
+
+        parts.append(ASYNC_RUN_HEADER)
+        preds = ir.predecessors()
+        done = set()
+        for wave in ir.levels():
+            calls = []
+            for node in wave:
+                i = numbers[node.id]
+                inputs = [f"r{numbers[p]}" for p in preds[node.id] if p in done]
+                if len(inputs) > 1:
+                    arg = f"[merge(*xs) for xs in zip({', '.join(inputs)})]"
+                else:
+                    arg = f"[dict(x) for x in {inputs[0] if inputs else 'd0'}]"
+                calls.append((i, f"each(step{i}_{safe_identifier(node.name, i)}, {arg})"))
+            if len(calls) == 1:
+                parts.append(f"    r{calls[0][0]} = await {calls[0][1]}\n")
+            else:
+                targets = ', '.join(f"r{i}" for i, _ in calls)
+                parts.append(f"    {targets} = await asyncio.gather({', '.join(c for _, c in calls)})\n")
+            done.update(node.id for node in wave)
+
+        parts.append(ASYNC_FOOTER(name=name, results=', '.join(f"r{numbers[n.id]}" for n in ir.nodes)))
+        return ''.join(parts)
+    except Exception as e:
+        logger.error(f"Async Python generation error: {e}")
+        return f"# Error: {e}"
@@ -0,0 +1,123 @@
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+import re
+import logging
+
+from node_registry import NODE_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class IRNode:
+    id: str
+    name: str
+    kind: str  # platform-neutral node type, e.g. 'airtable', 'webhook', 'openai'
+    source_type: str  # type as it appeared in the source platform
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    credentials: Dict[str, Any] = field(default_factory=dict)
+    position: Optional[List[float]] = None
+    action: str = ''
+
+@dataclass
+class IREdge:
+    source: str
+    target: str
+    output: int = 0
+
+@dataclass
+class WorkflowIR:
+    """Platform-neutral workflow graph shared by every target emitter"""
+    name: str
+    source_platform: str
+    nodes: List[IRNode]
+    edges: List[IREdge]
+
+    def node_by_id(self) -> Dict[str, IRNode]:
+        return {n.id: n for n in self.nodes}
+
+    def predecessors(self) -> Dict[str, List[str]]:
+        preds: Dict[str, List[str]] = {n.id: [] for n in self.nodes}
+        for edge in self.edges:
+            if edge.source not in preds[edge.target]:
+                preds[edge.target].append(edge.source)
+        return preds
+
+    def levels(self) -> List[List[IRNode]]:
+        """Group nodes into waves whose members have no dependencies on each other.
+
+        A node lands one level after its deepest predecessor. Nodes caught in cycles are
+        appended one per level, in declaration order, after everything else.
+        """
+        preds = self.predecessors()
+        indegree = {nid: len(p) for nid, p in preds.items()}
+        successors: Dict[str, List[str]] = {n.id: [] for n in self.nodes}
+        for target, sources in preds.items():
+            for source in sources:
+                successors[source].append(target)
+
+        depth: Dict[str, int] = {}
+        ready = [n.id for n in self.nodes if indegree[n.id] == 0]
+        for nid in ready:
+            depth[nid] = 0
+        while ready:
+            nid = ready.pop()
+            for succ in successors[nid]:
+                depth[succ] = max(depth.get(succ, 0), depth[nid] + 1)
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    ready.append(succ)
+
+        waves: List[List[IRNode]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        leftovers = []
+        for node in self.nodes:
+            if node.id in depth and indegree[node.id] == 0:
+                waves[depth[node.id]].append(node)
+            else:
+                leftovers.append(node)
+        return waves + [[node] for node in leftovers]
+
+def _slug(value: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', value.lower())
+
+def normalize_kind(platform: str, step: Dict[str, Any]) -> str:
+    """Reduce a parsed step's platform type to the neutral node kind"""
+    if platform == 'make':
+        module = step.get('module') or step.get('name', 'unknown')
+        return NODE_REGISTRY.kind_for_make_module(module) or _slug(module.split(':')[0])
+    node_type = step.get('type', 'unknown')
+    mapping = NODE_REGISTRY.lookup(node_type)
+    if mapping is not None:
+        return mapping.kind
+    return _slug(node_type.split('.')[-1]) or 'unknown'
+
+def build_ir(parsed: Dict[str, Any]) -> WorkflowIR:
+    """Build the IR from any parser's output"""
+    platform = parsed.get('platform', 'unknown')
+    nodes = []
+    for i, step in enumerate(parsed.get('steps', [])):
+        nodes.append(IRNode(
+            id=str(step.get('id') or f'node{i}'),
+            name=step.get('name', f'Step {i + 1}'),
+            kind=normalize_kind(platform, step),
+            source_type=step.get('module') or step.get('type', 'unknown'),
+            parameters=step.get('parameters') or {},
+            credentials=step.get('credentials') or {},
+            position=step.get('position') or None,
+            action=step.get('action', '')
+        ))
+
+    edges = []
+    if platform == 'n8n':
+        ids = {n.name: n.id for n in nodes}
+        for source, outputs in parsed.get('connections', {}).items():
+            for branches in outputs.values():
+                for output, branch in enumerate(branches):
+                    for target in branch or []:
+                        if source in ids and target.get('node') in ids:
+                            edges.append(IREdge(ids[source], ids[target['node']], output))
+    else:
+        # Zapier and Make scenarios are linear chains
+        edges = [IREdge(a.id, b.id) for a, b in zip(nodes, nodes[1:])]
+
+    logger.info(f"Built IR for {platform} workflow: {len(nodes)} nodes, {len(edges)} edges")
+    return WorkflowIR(name=parsed.get('name', 'Workflow'), source_platform=platform, nodes=nodes, edges=edges)
@@ -0,0 +1,125 @@
+from typing import Dict, Any, Iterator, Optional
+import re
+import logging
+
+from converters.ir import WorkflowIR
+from node_registry import NODE_REGISTRY
+from expressions import is_expression, to_make_mapping
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = re.compile(r'\{\{parameters\.(\w+)\}\}')
+
+def fill_placeholders(template: Any, params: Dict[str, Any], upstream: Optional[int], modules: Dict[str, int]) -> Any:
+    """Replace {{parameters.X}} in a make_parameters template with the node's own parameter X.
+
+    n8n expressions become Make mappings when they are plain paths ($json.a -> {{<upstream>.a}});
+    placeholders without a usable value are left in place for the user to map.
+    """
+    if isinstance(template, dict):
+        return {k: fill_placeholders(v, params, upstream, modules) for k, v in template.items()}
+    if isinstance(template, list):
+        return [fill_placeholders(v, params, upstream, modules) for v in template]
+    if not isinstance(template, str):
+        return template
+
+    def value_for(m):
+        name = m.group(1)
+        value = params.get(name, params.get(name[:-2]) if name.endswith('Id') else None)
+        if isinstance(value, dict) and '__rl' in value:  # n8n resource locator
+            value = value.get('value')
+        if is_expression(value):
+            value = to_make_mapping(value, upstream, modules)
+        if value is None or isinstance(value, (dict, list)):
+            return m.group(0)
+        return str(value).lower() if isinstance(value, bool) else str(value)
+    return PLACEHOLDER.sub(value_for, template)
+
+class MakeModuleMapper:
+    """Build Make.com module specifications from the node registry"""
+    
+    @staticmethod
+    def get_module_spec(kind: str, node_name: str, params: Dict) -> Dict[str, Any]:
+        """Get complete Make.com module specification"""
+        mapping = NODE_REGISTRY.resolve(kind)
+        
+        if mapping.make_module is None:
+            return None
+        
+        return {
+            "id": 1,
+            "module": mapping.make_module,
+            "version": mapping.make_version,
+            "parameters": NODE_REGISTRY.make_parameters(mapping.params or NODE_REGISTRY.category('params', kind)),
+            "mapper": {},
+            "metadata": {
+                "designer": {"x": 0, "y": 0},
+                "restore": {
+                    "parameters": {},
+                    "expect": {}
+                },
+                "parameters": [],
+                "expect": []
+            }
+        }
+
+def iter_make_modules(ir: WorkflowIR) -> Iterator[Dict[str, Any]]:
+    """Yield Make.com modules one at a time"""
+    x_pos = 100
+    modules = {node.name: idx for idx, node in enumerate(ir.nodes, 1)}
+    ids = {node.id: idx for idx, node in enumerate(ir.nodes, 1)}
+    preds = ir.predecessors()
+    
+    for idx, node in enumerate(ir.nodes, 1):
+        module_spec = MakeModuleMapper.get_module_spec(node.kind, node.name, node.parameters)
+        
+        if module_spec is None:
+            continue
+        
+        # $json is the item coming in: from the first predecessor, else the module before
+        upstream = ids[preds[node.id][0]] if preds[node.id] else (idx - 1 or None)
+        module_spec['parameters'] = fill_placeholders(module_spec['parameters'], node.parameters, upstream, modules)
+        module_spec['id'] = idx
+        module_spec['metadata']['designer']['x'] = x_pos
+        module_spec['metadata']['designer']['y'] = 100
+        
+        yield module_spec
+        x_pos += 200
+
+def convert_to_make(ir: WorkflowIR, lazy: bool = False) -> Dict[str, Any]:
+    """Convert a workflow IR to proper Make.com blueprint format.
+
+    With lazy=True the 'flow' list is a generator, for streaming very large blueprints.
+    """
+    try:
+        flow_modules = iter_make_modules(ir)
+        if not lazy:
+            flow_modules = list(flow_modules)
+        
+        return {
+            "name": ir.name or 'Converted Scenario',
+            "flow": flow_modules,
+            "metadata": {
+                "instant": False,
+                "version": 1,
+                "scenario": {
+                    "roundtrips": 1,
+                    "maxErrors": 3,
+                    "autoCommit": True,
+                    "autoCommitTriggerLast": True,
+                    "sequential": False,
+                    "confidential": False,
+                    "dataloss": False,
+                    "dlq": False,
+                    "freshVariables": False
+                },
+                "designer": {
+                    "orphans": []
+                },
+                "zone": "us1.make.com"
+            }
+        }
+    except Exception as e:
+        logger.error(f"Make conversion error: {e}")
+        raise
+
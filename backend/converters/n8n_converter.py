@@ -0,0 +1,63 @@
+from typing import Dict, Any, List, Iterator
+import logging
+
+from converters.ir import WorkflowIR
+from node_registry import NODE_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+def _unique_names(ir: WorkflowIR) -> Dict[str, str]:
+    """n8n addresses nodes by name, so names must be unique"""
+    names: Dict[str, str] = {}
+    used = set()
+    for node in ir.nodes:
+        name = node.name
+        n = 2
+        while name in used:
+            name = f"{node.name} {n}"
+            n += 1
+        used.add(name)
+        names[node.id] = name
+    return names
+
+def iter_n8n_nodes(ir: WorkflowIR, names: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    for idx, node in enumerate(ir.nodes):
+        if ir.source_platform == 'n8n':
+            node_type = node.source_type
+        else:
+            node_type = NODE_REGISTRY.resolve(node.kind).n8n_type or f"n8n-nodes-base.{node.kind}"
+        
+        yield {
+            "id": node.id,
+            "name": names[node.id],
+            "type": node_type,
+            "typeVersion": 1,
+            "position": node.position or [250 + idx * 200, 300],
+            "parameters": node.parameters,
+            **({"credentials": node.credentials} if node.credentials else {})
+        }
+
+def convert_to_n8n(ir: WorkflowIR, lazy: bool = False) -> Dict[str, Any]:
+    """Convert a workflow IR to an importable n8n workflow; lazy=True makes 'nodes' a generator"""
+    try:
+        names = _unique_names(ir)
+        nodes = iter_n8n_nodes(ir, names)
+        if not lazy:
+            nodes = list(nodes)
+        
+        connections: Dict[str, Dict[str, List[List[Dict[str, Any]]]]] = {}
+        for edge in ir.edges:
+            outputs = connections.setdefault(names[edge.source], {"main": []})["main"]
+            while len(outputs) <= edge.output:
+                outputs.append([])
+            outputs[edge.output].append({"node": names[edge.target], "type": "main", "index": 0})
+        
+        return {
+            "name": ir.name or 'Converted Workflow',
+            "nodes": nodes,
+            "connections": connections,
+            "settings": {"executionOrder": "v1"}
+        }
+    except Exception as e:
+        logger.error(f"n8n conversion error: {e}")
+        raise
@@ -0,0 +1,39 @@
+from typing import Dict, Any
+import logging
+
+from converters.ir import WorkflowIR
+
+logger = logging.getLogger(__name__)
+
+def convert_to_zapier(ir: WorkflowIR, lazy: bool = False) -> Dict[str, Any]:
+    """Convert a workflow IR to Zapier format; lazy=True makes 'actions' a generator"""
+    try:
+        if not ir.nodes:
+            return {"name": ir.name or 'Workflow', "steps": []}
+        
+        trigger_node = ir.nodes[0]
+        actions = (
+            {
+                "id": str(i),
+                "app": node.kind,
+                "action": node.action or node.name,
+                "title": node.name or f'Step {i}',
+                "config": node.parameters
+            }
+            for i, node in enumerate(ir.nodes[1:], 1)
+        )
+        
+        return {
+            "name": ir.name or 'Converted Zap',
+            "description": f"Converted from {ir.source_platform} by MigroMat",
+            "trigger": {
+                "app": trigger_node.kind or 'webhook',
+                "event": "trigger",
+                "title": trigger_node.name or 'Trigger',
+                "config": trigger_node.parameters
+            },
+            "actions": actions if lazy else list(actions)
+        }
+    except Exception as e:
+        logger.error(f"Zapier conversion error: {e}")
+        raise
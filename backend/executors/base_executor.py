@@ -1,10 +1,41 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import asyncio
 
 class BaseExecutor(ABC):
-    """Base class for step executors"""
-    
+    """Base class for step executors
+
+    A step runs over a list of items. The engine hands execute_batch chunks of up to batch_size
+    items; the default implementation calls execute once per item, max_concurrency at a time.
+    Executors that have a bulk API (batched writes, bulk sends) override execute_batch.
+    """
+    batch_size: int = 1
+    max_concurrency: int = 1
+
     @abstractmethod
     async def execute(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
         """Execute a workflow step"""
         pass
+
+    async def execute_batch(
+        self,
+        step: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        credentials: Dict[str, str],
+        parameters: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute a step for a chunk of items, returning the output items.
+
+        parameters[i] holds step['parameters'] evaluated for items[i]; it is None when the step
+        has no expressions, so every item shares step['parameters'].
+        """
+        if len(items) == 1:
+            return [await self.execute(step if parameters is None else {**step, 'parameters': parameters[0]}, items[0], credentials)]
+        steps = [step] * len(items) if parameters is None else [{**step, 'parameters': p} for p in parameters]
+        if self.max_concurrency <= 1:
+            return [await self.execute(s, item, credentials) for s, item in zip(steps, items)]
+        gate = asyncio.Semaphore(self.max_concurrency)
+        async def one(s, item):
+            async with gate:
+                return await self.execute(s, item, credentials)
+        return list(await asyncio.gather(*(one(s, item) for s, item in zip(steps, items))))
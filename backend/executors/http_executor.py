@@ -0,0 +1,282 @@
+from typing import Dict, Any, Optional, AsyncIterator, Callable, Iterator, List, Set
+from contextvars import ContextVar
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+import httpx
+
+from executors.base_executor import BaseExecutor
+
+logger = logging.getLogger(__name__)
+
+# Bodies up to SPILL_BYTES stay in memory; larger ones stream to a file in SPILL_DIR and the item
+# carries its path for the rest of the run. Responses over MAX_RESPONSE_BYTES fail the step.
+SPILL_BYTES = int(os.getenv('ENGINE_HTTP_SPILL_BYTES', 1024 * 1024))
+MAX_RESPONSE_BYTES = int(os.getenv('ENGINE_HTTP_MAX_RESPONSE_BYTES', 512 * 1024 * 1024))
+SPILL_DIR = os.getenv('ENGINE_HTTP_SPILL_DIR') or os.path.join(tempfile.gettempdir(), 'migromat-http')
+# Runs delete their own spill files; at startup older leftovers (from a crashed process) are swept
+SPILL_MAX_AGE = float(os.getenv('ENGINE_HTTP_SPILL_MAX_AGE', 6 * 3600))
+HTTP_CONCURRENCY = int(os.getenv('ENGINE_HTTP_CONCURRENCY', 8))
+HTTP_TIMEOUT = float(os.getenv('ENGINE_HTTP_TIMEOUT', 60))
+HTTP_MAX_CONNECTIONS = int(os.getenv('ENGINE_HTTP_MAX_CONNECTIONS', 100))
+CHUNK_BYTES = 64 * 1024
+TEXT_TYPES = ('text/', 'application/json', 'application/xml', 'application/javascript', '+json', '+xml')
+
+class ResponseTooLarge(Exception):
+    pass
+
+# Spill files created by the running workflow execution; see spill_scope
+_run_spills: ContextVar[Optional[Set[str]]] = ContextVar('run_spills', default=None)
+
+@contextlib.contextmanager
+def spill_scope() -> Iterator[Set[str]]:
+    """Track the files HTTP steps spill inside the block and delete them when it exits"""
+    paths: Set[str] = set()
+    token = _run_spills.set(paths)
+    try:
+        yield paths
+    finally:
+        _run_spills.reset(token)
+        for path in paths:
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+
+def release_spills(items: List[Dict[str, Any]], paths: Set[str]) -> List[Dict[str, Any]]:
+    """Items with references to the given (about to be deleted) spill files dropped from their binary data"""
+    if not paths:
+        return items
+    out = []
+    for item in items:
+        binary = item.get('binary') if isinstance(item, dict) else None
+        if isinstance(binary, dict) and any(isinstance(b, dict) and b.get('path') in paths for b in binary.values()):
+            binary = {k: ({f: v for f, v in b.items() if f != 'path'} if isinstance(b, dict) and b.get('path') in paths else b) for k, b in binary.items()}
+            item = {**item, 'binary': binary}
+        out.append(item)
+    return out
+
+def sweep_spill_dir(max_age: float = SPILL_MAX_AGE, spill_dir: str = SPILL_DIR) -> int:
+    """Delete spill files older than max_age seconds, left behind by runs of a process that died"""
+    removed, cutoff = 0, time.time() - max_age
+    with contextlib.suppress(FileNotFoundError):
+        for entry in os.scandir(spill_dir):
+            if entry.name.startswith('response-') and entry.is_file() and entry.stat().st_mtime < cutoff:
+                with contextlib.suppress(OSError):
+                    os.unlink(entry.path)
+                    removed += 1
+    return removed
+
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+def http_client() -> httpx.AsyncClient:
+    """The pooled client for the running event loop, created on first use"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        for stale in [l for l in _clients if l.is_closed()]:
+            del _clients[stale]
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT, follow_redirects=True,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+        )
+    return client
+
+async def close_http_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+# ============================================================================
+# Request building: n8n httpRequest (v1-v4), Zapier webhooks, Make http modules
+# ============================================================================
+
+def _pairs(value: Any) -> Dict[str, Any]:
+    """[{name, value}] lists, {parameters: [...]} wrappers, dicts and JSON strings -> dict"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value.strip() else {}
+        except ValueError:
+            return {}
+    if isinstance(value, dict) and isinstance(value.get('parameters'), list):
+        value = value['parameters']
+    if isinstance(value, list):
+        return {str(p.get('name') or p.get('key')): p.get('value') for p in value if isinstance(p, dict) and (p.get('name') or p.get('key'))}
+    return dict(value) if isinstance(value, dict) else {}
+
+async def _file_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+def spilled_path(path: Any, spill_dir: str = SPILL_DIR) -> str:
+    """`path` if it is a file the running execution spilled into spill_dir, else ValueError.
+
+    Item data can come from webhook payloads and caller input, so a binary 'path' is never
+    trusted on its own: it must be one this run created.
+    """
+    spills = _run_spills.get()
+    real = os.path.realpath(str(path))
+    inside = os.path.dirname(real) == os.path.realpath(spill_dir)
+    if not inside or spills is None or not any(os.path.realpath(p) == real for p in spills):
+        raise ValueError("Binary input is not a file downloaded by this run")
+    return real
+
+def build_request(step: Dict[str, Any], data: Dict[str, Any], spill_dir: str = SPILL_DIR) -> Dict[str, Any]:
+    """httpx request arguments for a step, from its (already evaluated) parameters"""
+    params = step.get('parameters') or {}
+    method = str(params.get('method') or params.get('requestMethod') or step.get('method') or 'GET').upper()
+    url = params.get('url') or step.get('url')
+    if not url:
+        raise ValueError("HTTP request has no URL")
+    headers = {**_pairs(step.get('headers')), **_pairs(params.get('headers')), **_pairs(params.get('headerParameters')), **_pairs(params.get('headerParametersJson'))}
+    query = {**_pairs(params.get('qs')), **_pairs(params.get('queryParameters')), **_pairs(params.get('queryParametersJson'))}
+    request: Dict[str, Any] = {'method': method, 'url': str(url), 'headers': {k: str(v) for k, v in headers.items()}}
+    if query:
+        request['params'] = query
+
+    content_type = params.get('contentType') or params.get('bodyType') or ''
+    if content_type in ('binaryData', 'binary'):
+        ref = (data.get('binary') or {}).get(params.get('inputDataFieldName') or 'data') or {}
+        if ref.get('path'):
+            path = spilled_path(ref['path'], spill_dir)
+            request['content'] = _file_chunks(path)
+            request['headers'].setdefault('Content-Length', str(os.path.getsize(path)))
+        elif ref.get('data'):
+            request['content'] = base64.b64decode(ref['data'])
+        if ref.get('mimeType'):
+            request['headers'].setdefault('Content-Type', ref['mimeType'])
+        return request
+    if 'jsonBody' in params:
+        body = params['jsonBody']
+        request['json'] = json.loads(body) if isinstance(body, str) and body.strip() else body
+    elif 'bodyParameters' in params or 'bodyParametersJson' in params:
+        fields = {**_pairs(params.get('bodyParameters')), **_pairs(params.get('bodyParametersJson'))}
+        request['data' if content_type in ('form-urlencoded', 'urlencoded') else 'json'] = fields
+    elif 'body' in params or 'data' in params or 'body' in step:
+        body = params.get('body', params.get('data', step.get('body')))
+        if isinstance(body, (dict, list)):
+            request['json'] = body
+        elif body not in (None, ''):
+            request['content'] = str(body).encode('utf-8')
+    return request
+
+def response_format(step: Dict[str, Any]) -> str:
+    """'json', 'text', 'file' or 'autodetect'"""
+    params = step.get('parameters') or {}
+    nested = ((params.get('options') or {}).get('response') or {}).get('response') or {}
+    return nested.get('responseFormat') or params.get('responseFormat') or 'autodetect'
+
+# ============================================================================
+# Streaming reads with spill to disk
+# ============================================================================
+
+class SpooledBody:
+    """Response bytes, held in memory until spill_bytes and in a named temp file after that"""
+
+    def __init__(self, spill_bytes: int, max_bytes: int, spill_dir: str):
+        self.spill_bytes, self.max_bytes, self.spill_dir = spill_bytes, max_bytes, spill_dir
+        self.buffer = bytearray()
+        self.file = None
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise ResponseTooLarge(f"Response exceeds {self.max_bytes} bytes")
+        if self.file is None and self.size > self.spill_bytes:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self.file = tempfile.NamedTemporaryFile(dir=self.spill_dir, prefix='response-', delete=False)
+            spills = _run_spills.get()
+            if spills is not None:
+                spills.add(self.file.name)
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+        if self.file is not None:
+            self.file.write(chunk)
+        else:
+            self.buffer += chunk
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.file.name if self.file is not None else None
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def discard(self):
+        self.close()
+        if self.file is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(self.file.name)
+            spills = _run_spills.get()
+            if spills is not None:
+                spills.discard(self.file.name)
+
+def _file_name(response: httpx.Response) -> str:
+    disposition = response.headers.get('content-disposition', '')
+    if 'filename=' in disposition:
+        return disposition.split('filename=', 1)[1].split(';')[0].strip().strip('"')
+    return os.path.basename(response.url.path) or 'response'
+
+class HttpExecutor(BaseExecutor):
+    """HTTP Request steps on a pooled client, streaming responses.
+
+    JSON and text bodies land in item['http_result']['body']. Files, and any body over
+    spill_bytes, land in item['binary']['data']: base64 'data' when small, else 'path' to the
+    spilled file, so large downloads never sit in worker memory. Spilled files live until the
+    enclosing spill_scope (the workflow run) ends.
+    """
+    batch_size = HTTP_CONCURRENCY
+    max_concurrency = HTTP_CONCURRENCY
+
+    def __init__(self, client: Callable[[], httpx.AsyncClient] = http_client, spill_bytes: int = SPILL_BYTES,
+                 max_bytes: int = MAX_RESPONSE_BYTES, spill_dir: str = SPILL_DIR):
+        self.client = client
+        self.spill_bytes, self.max_bytes, self.spill_dir = spill_bytes, max_bytes, spill_dir
+
+    async def execute(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
+        request = build_request(step, data, self.spill_dir)
+        fmt = response_format(step)
+        logger.info(f"HTTP {request['method']} {request['url']}")
+        body = SpooledBody(self.spill_bytes, self.max_bytes, self.spill_dir)
+        try:
+            async with self.client().stream(**request) as r:
+                declared = int(r.headers.get('content-length') or 0)
+                if declared > self.max_bytes:
+                    raise ResponseTooLarge(f"Response of {declared} bytes exceeds {self.max_bytes}")
+                r.raise_for_status()
+                async for chunk in r.aiter_bytes(CHUNK_BYTES):
+                    body.write(chunk)
+            body.close()
+        except BaseException:
+            body.discard()
+            raise
+        return {**data, **self.result(r, body, fmt)}
+
+    def result(self, r: httpx.Response, body: SpooledBody, fmt: str) -> Dict[str, Any]:
+        content_type = r.headers.get('content-type', '').split(';')[0].strip()
+        meta = {'status': r.status_code, 'headers': {k: v for k, v in r.headers.items() if k in ('content-type', 'content-length', 'etag', 'last-modified', 'location')}}
+        textual = fmt in ('json', 'text') or (fmt == 'autodetect' and any(t in content_type for t in TEXT_TYPES))
+        if body.path is None and textual:
+            text = bytes(body.buffer).decode(r.encoding or 'utf-8', errors='replace')
+            if fmt == 'json' or (fmt == 'autodetect' and 'json' in content_type):
+                try:
+                    return {'http_result': {**meta, 'body': json.loads(text) if text else None}}
+                except ValueError:
+                    if fmt == 'json':
+                        raise ValueError(f"Response from {r.url} is not JSON")
+            return {'http_result': {**meta, 'body': text}}
+        binary = {'mimeType': content_type or 'application/octet-stream', 'fileName': _file_name(r), 'fileSize': body.size}
+        if body.path is None:
+            binary['data'] = base64.b64encode(bytes(body.buffer)).decode('ascii')
+        else:
+            binary['path'] = body.path
+        return {'http_result': meta, 'binary': {'data': binary}}
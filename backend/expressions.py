@@ -0,0 +1,787 @@
+"""Compiled n8n expressions.
+
+Parameter strings starting with '=' are templates whose {{ ... }} segments hold JavaScript
+expressions. A template is parsed once into a tree of Python closures; evaluating it for an
+item is a call with an ExpressionContext, no re-parsing. Compiled templates are cached by
+text, so workflows (and steps) sharing an expression share its closure.
+
+Supported: literals, array/object literals, member and index access (incl. ?.), calls to a
+whitelist of string/array/number methods and of Math, JSON, Object, Array, String, Number,
+Boolean, parseInt, parseFloat, the usual unary/binary/logical operators, ?? and ?:, and the
+variables $json, $input, $node["Name"], $("Name"), $now, $today, $itemIndex and $runIndex.
+Arrow functions, assignments and anything touching Python objects are rejected when parsing.
+"""
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from datetime import datetime
+from functools import lru_cache
+import json
+import math
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+Evaluator = Callable[['ExpressionContext'], Any]
+MAX_DEPTH = 64
+MAX_PAD = 10000  # widths for padStart/padEnd come from workflow authors; cap what one call can allocate
+
+class ExpressionError(ValueError):
+    pass
+
+class ExpressionContext:
+    """What an expression can see while one step runs for one item.
+
+    items are the step's input items ($input) and json is items[item_index]; outputs maps the
+    names of steps already run to their output items ($node["Name"], $("Name")).
+    """
+    __slots__ = ('json', 'items', 'outputs', 'item_index', 'run_index')
+
+    def __init__(self, json: Any, outputs: Optional[Dict[str, List[Any]]] = None, item_index: int = 0, run_index: int = 0, items: Optional[List[Any]] = None):
+        self.json = json
+        self.items = items if items is not None else [json]
+        self.outputs = outputs or {}
+        self.item_index = item_index
+        self.run_index = run_index
+
+# ============================================================================
+# JavaScript value semantics (undefined and null are both None)
+# ============================================================================
+
+def js_truthy(v: Any) -> bool:
+    if v is None or v is False:
+        return False
+    if isinstance(v, (int, float)):
+        return v != 0 and v == v
+    if isinstance(v, str):
+        return v != ''
+    return True
+
+def js_number(v: Any) -> float:
+    if isinstance(v, bool):
+        return int(v)
+    if isinstance(v, (int, float)):
+        return v
+    if v is None:
+        return 0
+    if isinstance(v, str):
+        text = v.strip()
+        if not text:
+            return 0
+        try:
+            return int(text) if re.fullmatch(r'[+-]?\d+', text) else float(text)
+        except ValueError:
+            return math.nan
+    return math.nan
+
+def js_str(v: Any) -> str:
+    if v is None:
+        return 'null'
+    if v is True:
+        return 'true'
+    if v is False:
+        return 'false'
+    if isinstance(v, float):
+        if v != v:
+            return 'NaN'
+        if v in (math.inf, -math.inf):
+            return 'Infinity' if v > 0 else '-Infinity'
+        return str(int(v)) if v.is_integer() else repr(v)
+    if isinstance(v, str):
+        return v
+    if isinstance(v, datetime):
+        return v.isoformat()
+    if isinstance(v, ItemsProxy):
+        return json.dumps(v.items, default=str)
+    return json.dumps(v, default=str)
+
+def _tidy(v: float) -> Any:
+    """Keep integral results as ints so 1 + 1 renders as 2, not 2.0"""
+    return int(v) if isinstance(v, float) and v.is_integer() and abs(v) < 2 ** 53 else v
+
+def js_add(a: Any, b: Any) -> Any:
+    if isinstance(a, str) or isinstance(b, str) or isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return js_str(a) + js_str(b)
+    return _tidy(js_number(a) + js_number(b))
+
+def _arith(op: str, a: Any, b: Any) -> Any:
+    x, y = js_number(a), js_number(b)
+    if op == '-':
+        return _tidy(x - y)
+    if op == '*':
+        return _tidy(x * y)
+    if y == 0:
+        if op == '%' or x == 0 or x != x:
+            return math.nan
+        return math.inf if x > 0 else -math.inf
+    return _tidy(x / y) if op == '/' else _tidy(math.fmod(x, y))
+
+def _kind(v: Any) -> str:
+    if v is None:
+        return 'null'
+    if isinstance(v, bool):
+        return 'boolean'
+    if isinstance(v, (int, float)):
+        return 'number'
+    if isinstance(v, str):
+        return 'string'
+    return 'object'
+
+def js_strict_equal(a: Any, b: Any) -> bool:
+    if _kind(a) != _kind(b):
+        return False
+    if _kind(a) == 'object':
+        return a is b
+    return a == b
+
+def js_loose_equal(a: Any, b: Any) -> bool:
+    ka, kb = _kind(a), _kind(b)
+    if ka == kb or 'null' in (ka, kb):
+        return js_strict_equal(a, b)
+    if 'object' in (ka, kb):
+        return False
+    return js_number(a) == js_number(b)
+
+def js_compare(op: str, a: Any, b: Any) -> bool:
+    if not (isinstance(a, str) and isinstance(b, str)):
+        a, b = js_number(a), js_number(b)
+        if a != a or b != b:
+            return False
+    return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b}[op]
+
+# ============================================================================
+# Runtime objects and the method whitelist
+# ============================================================================
+
+class ItemsProxy:
+    """Items of $input or of a named node, as n8n exposes them ($input.first().json, $('X').item.json)"""
+    __slots__ = ('items', 'index')
+
+    def __init__(self, items: List[Any], index: int = 0):
+        self.items, self.index = items, index
+
+    def member(self, key: Any) -> Any:
+        if key == 'item':
+            return {'json': self.items[self.index] if self.index < len(self.items) else None}
+        if key == 'json':
+            return self.items[0] if self.items else None
+        return None
+
+    def call(self, name: str, args: List[Any]) -> Any:
+        if name == 'first':
+            return {'json': self.items[0]} if self.items else None
+        if name == 'last':
+            return {'json': self.items[-1]} if self.items else None
+        if name == 'all':
+            return [{'json': item} for item in self.items]
+        if name == 'itemMatching':
+            i = int(js_number(args[0])) if args else 0
+            return {'json': self.items[i]} if 0 <= i < len(self.items) else None
+        raise ExpressionError(f"Unknown method: {name}()")
+
+class NodesProxy:
+    """$node["Name"]"""
+    __slots__ = ('outputs', 'index')
+
+    def __init__(self, outputs: Dict[str, Any], index: int):
+        self.outputs, self.index = outputs, index
+
+    def member(self, key: Any) -> Any:
+        return ItemsProxy(self.outputs[key], self.index) if key in self.outputs else None
+
+class Namespace:
+    """Math, JSON, Object, Array: method calls only"""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+def _index(v: Any) -> Optional[int]:
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)) and float(v).is_integer():
+        return int(v)
+    if isinstance(v, str) and v.isdigit():
+        return int(v)
+    return None
+
+def get_member(obj: Any, key: Any) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(key if isinstance(key, str) else js_str(key))
+    if isinstance(obj, (list, str)):
+        if key == 'length':
+            return len(obj)
+        i = _index(key)
+        return obj[i] if i is not None and 0 <= i < len(obj) else None
+    if isinstance(obj, (ItemsProxy, NodesProxy)):
+        return obj.member(key)
+    if isinstance(obj, datetime):
+        return {'year': obj.year, 'month': obj.month, 'day': obj.day, 'hour': obj.hour, 'minute': obj.minute, 'second': obj.second, 'weekday': obj.isoweekday()}.get(key)
+    return None
+
+def _js_slice(seq, args: List[Any]):
+    start = int(js_number(args[0])) if args and args[0] is not None else 0
+    end = int(js_number(args[1])) if len(args) > 1 and args[1] is not None else len(seq)
+    return seq[start:end]
+
+def _pad_width(n: Any) -> int:
+    width = js_number(n)
+    if width != width:
+        return 0
+    if width > MAX_PAD:
+        raise ExpressionError(f"Pad width {js_str(width)} exceeds {MAX_PAD}")
+    return int(width)
+
+def _to_fixed(n: Any, d: Any = 0) -> str:
+    digits = js_number(d)
+    if not 0 <= digits <= 100:
+        raise ExpressionError("toFixed() digits must be between 0 and 100")
+    return f"{n:.{int(digits)}f}"
+
+STRING_METHODS: Dict[str, Callable[..., Any]] = {
+    'toUpperCase': lambda s: s.upper(),
+    'toLowerCase': lambda s: s.lower(),
+    'trim': lambda s: s.strip(),
+    'trimStart': lambda s: s.lstrip(),
+    'trimEnd': lambda s: s.rstrip(),
+    'includes': lambda s, sub='': js_str(sub) in s,
+    'startsWith': lambda s, sub='': s.startswith(js_str(sub)),
+    'endsWith': lambda s, sub='': s.endswith(js_str(sub)),
+    'indexOf': lambda s, sub='': s.find(js_str(sub)),
+    'split': lambda s, sep=None, *_: list(s) if sep == '' else s.split(js_str(sep)) if sep is not None else [s],
+    'replace': lambda s, old='', new='': s.replace(js_str(old), js_str(new), 1),
+    'replaceAll': lambda s, old='', new='': s.replace(js_str(old), js_str(new)),
+    'charAt': lambda s, i=0: s[int(js_number(i))] if 0 <= int(js_number(i)) < len(s) else '',
+    'padStart': lambda s, n=0, fill=' ': s.rjust(_pad_width(n), (js_str(fill) or ' ')[0]),
+    'padEnd': lambda s, n=0, fill=' ': s.ljust(_pad_width(n), (js_str(fill) or ' ')[0]),
+    'concat': lambda s, *more: s + ''.join(js_str(m) for m in more),
+    'toString': lambda s: s,
+}
+
+ARRAY_METHODS: Dict[str, Callable[..., Any]] = {
+    'join': lambda a, sep=',': js_str(sep).join('' if v is None else js_str(v) for v in a),
+    'includes': lambda a, v=None: any(js_strict_equal(x, v) for x in a),
+    'indexOf': lambda a, v=None: next((i for i, x in enumerate(a) if js_strict_equal(x, v)), -1),
+    'concat': lambda a, *more: a + [x for m in more for x in (m if isinstance(m, list) else [m])],
+    'first': lambda a: a[0] if a else None,
+    'last': lambda a: a[-1] if a else None,
+    'isEmpty': lambda a: not a,
+    'toString': lambda a: ','.join('' if v is None else js_str(v) for v in a),
+}
+
+NUMBER_METHODS: Dict[str, Callable[..., Any]] = {
+    'toFixed': _to_fixed,
+    'toString': lambda n: js_str(n),
+    'round': lambda n, d=0: _tidy(round(n, int(js_number(d)))),
+}
+
+def _math(fn: Callable[..., float]) -> Callable[..., Any]:
+    def call(*args):
+        try:
+            return _tidy(fn(*(js_number(a) for a in args)))
+        except OverflowError:
+            return math.inf
+        except ValueError:
+            return math.nan
+    return call
+
+def _integral(fn: Callable[[float], int]) -> Callable[[float], float]:
+    """floor/ceil/trunc pass Infinity and NaN through, as in JS"""
+    return lambda x: fn(x) if math.isfinite(x) else x
+
+def _pow(x: float, y: float) -> float:
+    try:
+        return math.pow(x, y)
+    except OverflowError:
+        return -math.inf if x < 0 and y % 2 == 1 else math.inf
+    except ValueError:  # 0 ** -1 is Infinity, (-8) ** 0.5 is NaN
+        return math.inf if x == 0 else math.nan
+
+def _json_parse(text: Any) -> Any:
+    try:
+        return json.loads(js_str(text))
+    except ValueError as e:
+        raise ExpressionError(f"JSON.parse: {e}")
+
+NAMESPACES: Dict[str, Dict[str, Callable[..., Any]]] = {
+    'Math': {
+        'round': _math(_integral(lambda x: math.floor(x + 0.5))), 'floor': _math(_integral(math.floor)), 'ceil': _math(_integral(math.ceil)), 'abs': _math(abs),
+        'min': _math(lambda *xs: min(xs) if xs else math.inf), 'max': _math(lambda *xs: max(xs) if xs else -math.inf),
+        'pow': _math(_pow), 'sqrt': _math(lambda x: math.sqrt(x) if x >= 0 else math.nan), 'trunc': _math(_integral(math.trunc)),
+    },
+    'JSON': {'stringify': lambda v=None, *_: json.dumps(v, default=str), 'parse': _json_parse},
+    'Object': {'keys': lambda o=None: list(o) if isinstance(o, dict) else [], 'values': lambda o=None: list(o.values()) if isinstance(o, dict) else [],
+               'entries': lambda o=None: [[k, v] for k, v in o.items()] if isinstance(o, dict) else []},
+    'Array': {'isArray': lambda v=None: isinstance(v, list)},
+}
+
+def _parse_int(v: Any = None, base: Any = 10) -> Any:
+    """Longest valid prefix, as in JS: parseInt('42px') == 42"""
+    text, radix = js_str(v).strip(), int(js_number(base)) or 10
+    sign = -1 if text[:1] == '-' else 1
+    text = text[1:] if text[:1] in '+-' else text
+    digits = ''
+    for c in text:
+        if not c.isalnum() or not c.isascii() or int(c, 36) >= radix:
+            break
+        digits += c
+    return sign * int(digits, radix) if digits and 2 <= radix <= 36 else math.nan
+
+def _parse_float(v: Any = None) -> Any:
+    m = re.match(r'\s*([+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?)', js_str(v))
+    return _tidy(float(m.group(1))) if m else math.nan
+
+FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    'String': lambda v='': js_str(v),
+    'Number': lambda v=0: _tidy(js_number(v)),
+    'Boolean': lambda v=None: js_truthy(v),
+    'parseInt': _parse_int,
+    'parseFloat': _parse_float,
+    'isNaN': lambda v=None: js_number(v) != js_number(v),
+}
+
+def call_method(obj: Any, name: str, args: List[Any]) -> Any:
+    if isinstance(obj, Namespace):
+        fn = NAMESPACES[obj.name].get(name)
+    elif isinstance(obj, ItemsProxy):
+        return obj.call(name, args)
+    elif isinstance(obj, str):
+        fn = STRING_METHODS.get(name) or ({'slice': _js_slice, 'substring': _js_slice}.get(name) and (lambda s, *a: _js_slice(s, list(a))))
+    elif isinstance(obj, list):
+        fn = ARRAY_METHODS.get(name) or (name == 'slice' and (lambda a, *rest: _js_slice(a, list(rest))))
+    elif isinstance(obj, bool):
+        fn = {'toString': js_str}.get(name)
+    elif isinstance(obj, (int, float)):
+        fn = NUMBER_METHODS.get(name)
+    elif isinstance(obj, datetime):
+        fn = {'toISO': datetime.isoformat, 'toISOString': datetime.isoformat, 'toMillis': lambda d: int(d.timestamp() * 1000), 'toString': datetime.isoformat}.get(name)
+    elif obj is None:
+        raise ExpressionError(f"Cannot call {name}() on null or undefined")
+    else:
+        fn = None
+    if not fn:
+        raise ExpressionError(f"Unknown method: {name}()")
+    if isinstance(obj, Namespace):
+        return fn(*args)
+    try:
+        return fn(obj, *args)
+    except ExpressionError:
+        raise
+    except (TypeError, ValueError, OverflowError):
+        raise ExpressionError(f"Bad arguments to {name}()")
+
+# ============================================================================
+# Tokenizer and parser: each parse method returns the compiled closure
+# ============================================================================
+
+TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\$]|\\.|\$(?!\{))*`)
+  | (?P<name>[A-Za-z_$][A-Za-z0-9_$]*)
+  | (?P<op>===|!==|\?\?|\?\.|==|!=|<=|>=|&&|\|\||=>|[-+*/%<>!?:.,()\[\]{}])
+""", re.VERBOSE)
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+def _unquote(text: str) -> str:
+    return re.sub(r'\\(u[0-9a-fA-F]{4}|.)', lambda m: chr(int(m.group(1)[1:], 16)) if m.group(1)[0] == 'u' and len(m.group(1)) == 5 else ESCAPES.get(m.group(1), m.group(1)), text[1:-1])
+
+def tokenize(source: str) -> List[Tuple[str, Any]]:
+    tokens, pos = [], 0
+    while pos < len(source):
+        m = TOKEN.match(source, pos)
+        if not m:
+            raise ExpressionError(f"Unexpected character {source[pos]!r} at {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == 'ws':
+            continue
+        text = m.group(kind)
+        if kind == 'number':
+            tokens.append(('value', _tidy(float(text)) if any(c in text for c in '.eE') else int(text)))
+        elif kind == 'string':
+            tokens.append(('value', _unquote(text)))
+        else:
+            tokens.append((kind, text))
+    tokens.append(('end', None))
+    return tokens
+
+KEYWORDS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+
+def _constant(value: Any) -> Evaluator:
+    return lambda ctx: value
+
+class Parser:
+    def __init__(self, source: str):
+        self.tokens = tokenize(source)
+        self.pos = 0
+        self.depth = 0
+        # Member chains rooted at $json / $node["X"] / $("X"), keyed by their compiled closure; path
+        # is set only when the whole expression is one such chain, for translation to other platforms
+        self.paths: Dict[Evaluator, Tuple[Any, List[Any]]] = {}
+        self.path: Optional[Tuple[Any, List[Any]]] = None
+
+    def peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.pos]
+
+    def next(self) -> Tuple[str, Any]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def accept(self, op: str) -> bool:
+        if self.tokens[self.pos] == ('op', op):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, op: str):
+        if not self.accept(op):
+            kind, found = self.peek()
+            raise ExpressionError(f"Expected {op!r}, found {'end of expression' if kind == 'end' else repr(found)}")
+
+    def parse(self) -> Evaluator:
+        fn = self.ternary()
+        if self.peek()[0] != 'end':
+            raise ExpressionError(f"Unexpected {self.peek()[1]!r}")
+        # Operators, calls and ternaries wrap chains in new closures, so only a bare chain matches
+        self.path = self.paths.get(fn)
+        return fn
+
+    def ternary(self) -> Evaluator:
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ExpressionError("Expression nested too deeply")
+        test = self.logical_or()
+        if self.accept('?'):
+            yes = self.ternary()
+            self.expect(':')
+            no = self.ternary()
+            fn = lambda ctx: yes(ctx) if js_truthy(test(ctx)) else no(ctx)
+        else:
+            fn = test
+        self.depth -= 1
+        return fn
+
+    def logical_or(self) -> Evaluator:
+        left = self.logical_and()
+        while True:
+            if self.accept('||'):
+                right, prev = self.logical_and(), left
+                left = lambda ctx, a=prev, b=right: (lambda v: v if js_truthy(v) else b(ctx))(a(ctx))
+            elif self.accept('??'):
+                right, prev = self.logical_and(), left
+                left = lambda ctx, a=prev, b=right: (lambda v: v if v is not None else b(ctx))(a(ctx))
+            else:
+                return left
+
+    def logical_and(self) -> Evaluator:
+        left = self.equality()
+        while self.accept('&&'):
+            right, prev = self.equality(), left
+            left = lambda ctx, a=prev, b=right: (lambda v: b(ctx) if js_truthy(v) else v)(a(ctx))
+        return left
+
+    def equality(self) -> Evaluator:
+        left = self.relational()
+        while self.peek()[0] == 'op' and self.peek()[1] in ('===', '!==', '==', '!='):
+            op = self.next()[1]
+            right, prev = self.relational(), left
+            test = js_strict_equal if op in ('===', '!==') else js_loose_equal
+            negate = op.startswith('!')
+            left = lambda ctx, a=prev, b=right, t=test, n=negate: t(a(ctx), b(ctx)) != n
+        return left
+
+    def relational(self) -> Evaluator:
+        left = self.additive()
+        while self.peek()[0] == 'op' and self.peek()[1] in ('<', '<=', '>', '>='):
+            op = self.next()[1]
+            right, prev = self.additive(), left
+            left = lambda ctx, a=prev, b=right, o=op: js_compare(o, a(ctx), b(ctx))
+        return left
+
+    def additive(self) -> Evaluator:
+        left = self.multiplicative()
+        while self.peek()[0] == 'op' and self.peek()[1] in ('+', '-'):
+            op = self.next()[1]
+            right, prev = self.multiplicative(), left
+            if op == '+':
+                left = lambda ctx, a=prev, b=right: js_add(a(ctx), b(ctx))
+            else:
+                left = lambda ctx, a=prev, b=right: _arith('-', a(ctx), b(ctx))
+        return left
+
+    def multiplicative(self) -> Evaluator:
+        left = self.unary()
+        while self.peek()[0] == 'op' and self.peek()[1] in ('*', '/', '%'):
+            op = self.next()[1]
+            right, prev = self.unary(), left
+            left = lambda ctx, a=prev, b=right, o=op: _arith(o, a(ctx), b(ctx))
+        return left
+
+    def unary(self) -> Evaluator:
+        kind, op = self.peek()
+        if kind != 'op' or op not in ('!', '-', '+'):
+            return self.postfix()
+        self.next()
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ExpressionError("Expression nested too deeply")
+        operand = self.unary()
+        self.depth -= 1
+        if op == '!':
+            return lambda ctx: not js_truthy(operand(ctx))
+        if op == '-':
+            return lambda ctx: _tidy(-js_number(operand(ctx)))
+        return lambda ctx: _tidy(js_number(operand(ctx)))
+
+    def postfix(self) -> Evaluator:
+        fn, path = self.primary()
+        while True:
+            if self.accept('.') or self.accept('?.'):
+                kind, name = self.next()
+                if kind != 'name':
+                    raise ExpressionError(f"Expected a property name, found {name!r}")
+                if self.accept('('):
+                    args = self.arguments()
+                    fn = lambda ctx, o=fn, m=name, a=args: call_method(o(ctx), m, [x(ctx) for x in a])
+                    # $("X").first() reads the same item as $("X").item
+                    is_node = path and path[0] == '$node' and len(path[1]) == 1
+                    path = (path[0], path[1] + ['item']) if is_node and name == 'first' and not args else None
+                else:
+                    fn = lambda ctx, o=fn, k=name: get_member(o(ctx), k)
+                    path = path and (path[0], path[1] + [name])
+            elif self.accept('['):
+                key = self.ternary()
+                self.expect(']')
+                literal = self._literal(key)
+                fn = lambda ctx, o=fn, k=key: get_member(o(ctx), k(ctx))
+                path = path and literal is not None and (path[0], path[1] + [literal])
+            elif self.peek() == ('op', '('):
+                raise ExpressionError("Only methods and built-in functions can be called")
+            else:
+                if path:
+                    self.paths[fn] = path
+                return fn
+
+    @staticmethod
+    def _literal(fn: Evaluator) -> Any:
+        """The value of a constant sub-expression, or None"""
+        try:
+            return fn(None)
+        except Exception:
+            return None
+
+    def arguments(self) -> List[Evaluator]:
+        args = []
+        if not self.accept(')'):
+            while True:
+                args.append(self.ternary())
+                if self.accept(')'):
+                    break
+                self.expect(',')
+        return args
+
+    def primary(self) -> Tuple[Evaluator, Optional[Tuple[Any, List[Any]]]]:
+        kind, value = self.next()
+        if kind == 'value':
+            return _constant(value), None
+        if kind == 'op' and value == '(':
+            fn = self.ternary()
+            self.expect(')')
+            return fn, None
+        if kind == 'op' and value == '[':
+            items = [] if self.accept(']') else self.arguments_until(']')
+            return (lambda ctx: [i(ctx) for i in items]), None
+        if kind == 'op' and value == '{':
+            return self.object_literal(), None
+        if kind == 'name':
+            return self.identifier(value)
+        raise ExpressionError(f"Unexpected {value!r}")
+
+    def arguments_until(self, close: str) -> List[Evaluator]:
+        items = []
+        while True:
+            items.append(self.ternary())
+            if self.accept(close):
+                return items
+            self.expect(',')
+
+    def object_literal(self) -> Evaluator:
+        entries: List[Tuple[str, Evaluator]] = []
+        while not self.accept('}'):
+            kind, key = self.next()
+            if kind not in ('name', 'value'):
+                raise ExpressionError(f"Invalid object key {key!r}")
+            self.expect(':')
+            entries.append((js_str(key), self.ternary()))
+            if not self.accept(','):
+                self.expect('}')
+                break
+        return lambda ctx: {k: v(ctx) for k, v in entries}
+
+    def identifier(self, name: str) -> Tuple[Evaluator, Optional[Tuple[Any, List[Any]]]]:
+        if self.peek() == ('op', '=>'):
+            raise ExpressionError("Arrow functions are not supported")
+        if name in KEYWORDS:
+            return _constant(KEYWORDS[name]), None
+        if name == '$json':
+            return (lambda ctx: ctx.json), ('$json', [])
+        if name == '$input':
+            return (lambda ctx: ItemsProxy(ctx.items, ctx.item_index)), None
+        if name == '$node':
+            return (lambda ctx: NodesProxy(ctx.outputs, ctx.item_index)), ('$node', [])
+        if name in ('$itemIndex', '$index'):
+            return (lambda ctx: ctx.item_index), None
+        if name == '$runIndex':
+            return (lambda ctx: ctx.run_index), None
+        if name == '$now':
+            return (lambda ctx: datetime.now()), None
+        if name == '$today':
+            return (lambda ctx: datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)), None
+        if name in NAMESPACES:
+            namespace = Namespace(name)
+            return (lambda ctx: namespace), None
+        if name == '$' or name in FUNCTIONS:
+            self.expect('(')
+            args = self.arguments()
+            if name == '$':
+                if len(args) != 1:
+                    raise ExpressionError("$() takes a node name")
+                node = self._literal(args[0])
+                return (lambda ctx: ItemsProxy(ctx.outputs[n], ctx.item_index) if isinstance(n := args[0](ctx), str) and n in ctx.outputs else None), (('$node', [node]) if isinstance(node, str) else None)
+            fn = FUNCTIONS[name]
+            return (lambda ctx: fn(*(a(ctx) for a in args))), None
+        raise ExpressionError(f"Unknown variable: {name}")
+
+# ============================================================================
+# Templates and parameters
+# ============================================================================
+
+def is_expression(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith('=')
+
+def split_template(text: str) -> List[Tuple[bool, str]]:
+    """'=a {{ x }} b' -> [(False, 'a '), (True, ' x '), (False, ' b')]; braces inside string literals are skipped"""
+    body = text[1:] if text.startswith('=') else text
+    parts, pos = [], 0
+    while True:
+        start = body.find('{{', pos)
+        if start < 0:
+            if pos < len(body):
+                parts.append((False, body[pos:]))
+            return parts
+        if start > pos:
+            parts.append((False, body[pos:start]))
+        i, quote = start + 2, None
+        while i < len(body):
+            c = body[i]
+            if quote:
+                if c == '\\':
+                    i += 1
+                elif c == quote:
+                    quote = None
+            elif c in '\'"`':
+                quote = c
+            elif body.startswith('}}', i):
+                break
+            i += 1
+        else:
+            raise ExpressionError("Unclosed {{ in expression")
+        parts.append((True, body[start + 2:i]))
+        pos = i + 2
+
+def _render(v: Any) -> str:
+    return '' if v is None else js_str(v)
+
+@lru_cache(maxsize=8192)
+def compile_template(text: str) -> Evaluator:
+    """Compile an '=...' parameter value. A lone {{ }} keeps its value's type; anything else renders a string.
+
+    Errors surface when the template is evaluated, so one bad expression fails its step, not the upload.
+    """
+    try:
+        parts = [(True, Parser(src).parse()) if is_code else (False, src) for is_code, src in split_template(text)]
+    except (ExpressionError, RecursionError) as e:
+        message = f"{e if isinstance(e, ExpressionError) else 'Expression nested too deeply'} in {text!r}"
+        def fail(ctx):
+            raise ExpressionError(message)
+        return fail
+    if not parts:
+        return _constant('')
+    if len(parts) == 1:
+        is_code, part = parts[0]
+        return part if is_code else _constant(part)
+    def render(ctx):
+        return ''.join(_render(part(ctx)) if is_code else part for is_code, part in parts)
+    return render
+
+def compile_parameters(params: Any) -> Optional[Callable[[ExpressionContext], Any]]:
+    """Closure producing `params` with every expression evaluated, or None when there are none"""
+    if is_expression(params):
+        return compile_template(params)
+    if isinstance(params, dict):
+        compiled = {k: compile_parameters(v) for k, v in params.items()}
+        if not any(compiled.values()):
+            return None
+        return lambda ctx: {k: (compiled[k](ctx) if compiled[k] else v) for k, v in params.items()}
+    if isinstance(params, list):
+        compiled_items = [compile_parameters(v) for v in params]
+        if not any(compiled_items):
+            return None
+        return lambda ctx: [(c(ctx) if c else v) for c, v in zip(compiled_items, params)]
+    return None
+
+# ============================================================================
+# Translation to Make mappings
+# ============================================================================
+
+def _make_path(parts: List[Any]) -> Optional[str]:
+    out = ''
+    for part in parts:
+        if isinstance(part, int) and not isinstance(part, bool):
+            out += f"[{part + 1}]"  # Make arrays are 1-based
+        elif isinstance(part, str) and re.fullmatch(r'[A-Za-z_][A-Za-z0-9_ -]*', part):
+            out += f".{part}"
+        else:
+            return None
+    return out
+
+def to_make_mapping(value: str, upstream: Optional[int], modules: Dict[str, int]) -> Optional[str]:
+    """Rewrite an n8n template whose expressions are all plain paths into Make's {{module.path}} syntax.
+
+    $json paths read from `upstream` (the previous module's id); $node["X"] / $("X") paths from
+    modules[X]. Returns None when any expression is more than a path.
+    """
+    try:
+        parts = split_template(value)
+    except ExpressionError:
+        return None
+    out = []
+    for is_code, src in parts:
+        if not is_code:
+            out.append(src)
+            continue
+        try:
+            parser = Parser(src)
+            parser.parse()
+        except ExpressionError:
+            return None
+        if not parser.path:
+            return None
+        root, path = parser.path
+        if root == '$json':
+            module = upstream
+        else:
+            # $node["X"].json.a / $("X").item.json.a / $("X").first().json.a all read node X's item
+            if not path or path[0] not in modules:
+                return None
+            module, path = modules[path[0]], path[1:]
+            if path[:1] == ['item'] or path[:1] == ['json']:
+                path = path[1:] if path[:1] == ['json'] else path[2:] if path[1:2] == ['json'] else None
+            else:
+                return None
+        rendered = _make_path(path) if path is not None else None
+        if module is None or rendered is None or not rendered:
+            return None
+        out.append(f"{{{{{module}{rendered}}}}}")
+    return ''.join(out)
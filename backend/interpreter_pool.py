@@ -0,0 +1,172 @@
+from typing import Dict, Any, Optional, List, AsyncIterator
+from dataclasses import dataclass
+import asyncio
+import json
+import os
+import struct
+import sys
+import tempfile
+import shutil
+import logging
+
+from process_runner import ExitStatus, OutputEvent, collect_output, describe_signal, kill_tree, limit_output
+from sandbox import Limits, limited_command
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pool_worker.py')
+
+@dataclass
+class RunResult:
+    stdout: str
+    stderr: str
+    exit_code: Optional[int]
+    timed_out: bool = False
+
+class Worker:
+    """One warm interpreter process; the protocol is described in pool_worker.py"""
+
+    def __init__(self, proc: asyncio.subprocess.Process, workdir: str):
+        self.proc = proc
+        self.workdir = workdir
+        self.runs = 0
+
+    @classmethod
+    async def spawn(cls, env: Dict[str, str], limits: Optional[Limits] = None) -> 'Worker':
+        workdir = tempfile.mkdtemp(prefix='migromat_worker_')
+        args = [sys.executable, WORKER_SCRIPT]
+        proc = await asyncio.create_subprocess_exec(
+            *(limited_command(args, limits, cpu=False) if limits else args), cwd=workdir, env=env,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=hasattr(os, 'killpg')
+        )
+        worker = cls(proc, workdir)
+        await worker.receive()  # ready frame, sent once the preloads are imported
+        return worker
+
+    async def send(self, message: Dict[str, Any]):
+        body = json.dumps(message).encode('utf-8')
+        self.proc.stdin.write(struct.pack('>I', len(body)) + body)
+        await self.proc.stdin.drain()
+
+    async def receive(self) -> Dict[str, Any]:
+        (size,) = struct.unpack('>I', await self.proc.stdout.readexactly(4))
+        return json.loads(await self.proc.stdout.readexactly(size))
+
+    async def events(self, code: str, name: str, cpu_seconds: Optional[int] = None) -> AsyncIterator[OutputEvent]:
+        self.runs += 1
+        await self.send({'code': code, 'name': name, 'cpu_seconds': cpu_seconds})
+        while True:
+            frame = await self.receive()
+            if 'exit_code' in frame:
+                yield 'exit', ExitStatus(frame['exit_code'])
+                return
+            yield frame['stream'], frame['text']
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def close(self):
+        if self.alive:
+            try:
+                self.proc.stdin.close()
+                await asyncio.wait_for(self.proc.wait(), 1)
+            except (asyncio.TimeoutError, OSError):
+                self.kill()
+                await self.proc.wait()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def kill(self):
+        kill_tree(self.proc)
+
+class InterpreterPool:
+    """Pre-started interpreters with the runtime's dependencies already imported.
+
+    Scripts are sent in memory and executed in a fresh namespace; a worker is replaced after
+    max_runs scripts, or immediately if a script times out, floods output or kills its interpreter.
+    """
+
+    def __init__(self, size: int, max_runs: int, env: Optional[Dict[str, str]] = None, limits: Optional[Limits] = None):
+        self.size = size
+        self.max_runs = max_runs
+        self.env = env or dict(os.environ)
+        self.limits = limits
+        self.runs = 0
+        self.recycled = 0
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[Worker] = []
+        self._tasks = set()
+
+    async def start(self):
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        await asyncio.gather(*(self._replenish() for _ in range(self.size)))
+        logger.info(f"Interpreter pool ready: {len(self._workers)} workers")
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*(w.close() for w in self._workers), return_exceptions=True)
+        self._workers.clear()
+        self._idle = None
+
+    async def _replenish(self):
+        try:
+            worker = await Worker.spawn(self.env, self.limits)
+        except Exception as e:
+            logger.error(f"Interpreter pool: worker failed to start: {e}")
+            await asyncio.sleep(1)
+            self._background(self._replenish())
+            return
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+
+    def _background(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _retire(self, worker: Worker):
+        self._workers.remove(worker)
+        self.recycled += 1
+        self._background(self._replenish())
+        await worker.close()
+
+    async def stream(self, code: str, name: str = '<script>', timeout: float = 60, max_bytes: Optional[int] = None) -> AsyncIterator[OutputEvent]:
+        """Execute a script on an idle worker, yielding its output as it is written; the last event is ('exit', ExitStatus)"""
+        await self.start()
+        worker = await self._idle.get()
+        self.runs += 1
+        finished = False
+
+        async def kill():
+            worker.kill()
+
+        try:
+            cpu_seconds = self.limits.cpu_seconds if self.limits else None
+            async for kind, payload in limit_output(worker.events(code, name, cpu_seconds), timeout, max_bytes, kill):
+                if kind == 'exit':
+                    finished = payload.returncode is not None
+                yield kind, payload
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            returncode = await worker.proc.wait()
+            reason = describe_signal(-returncode) if returncode < 0 else f'Interpreter exited unexpectedly ({returncode})'
+            yield 'stderr', reason + '\n'
+            yield 'exit', ExitStatus(1)
+        finally:
+            if finished and worker.runs < self.max_runs:
+                self._idle.put_nowait(worker)
+            else:
+                if not finished:
+                    worker.kill()  # timed out, truncated, crashed or abandoned mid-run
+                self._background(self._retire(worker))
+
+    async def run(self, code: str, name: str = '<script>', timeout: float = 60) -> RunResult:
+        """Execute a script and collect its output"""
+        stdout, stderr, status = await collect_output(self.stream(code, name, timeout))
+        return RunResult(stdout, stderr, status.returncode, timed_out=status.timed_out)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'workers': len(self._workers), 'idle': self._idle.qsize() if self._idle else 0, 'runs': self.runs, 'recycled': self.recycled}
@@ -0,0 +1,54 @@
+from typing import Any, Iterator, List
+import json
+
+CHUNK_SIZE = 64 * 1024
+STRUCTURAL_DEPTH = 2  # containers below this depth are encoded in one json.dumps call
+
+def _is_stream(value: Any) -> bool:
+    return hasattr(value, '__next__')
+
+def _dump(value: Any, indent: int, level: int) -> str:
+    text = json.dumps(value, indent=indent)
+    # Encoded strings never contain raw newlines, so re-indenting the subtree is a plain replace
+    return text.replace('\n', '\n' + ' ' * (indent * level)) if level else text
+
+def _encode(value: Any, indent: int, level: int) -> Iterator[str]:
+    if isinstance(value, dict) and level < STRUCTURAL_DEPTH:
+        if not value:
+            yield '{}'
+            return
+        pad = '\n' + ' ' * (indent * (level + 1))
+        sep = '{' + pad
+        for key, item in value.items():
+            yield sep + json.dumps(key if isinstance(key, str) else _dump(key, indent, 0)) + ': '
+            yield from _encode(item, indent, level + 1)
+            sep = ',' + pad
+        yield '\n' + ' ' * (indent * level) + '}'
+    elif _is_stream(value) or (isinstance(value, list) and level < STRUCTURAL_DEPTH):
+        pad = '\n' + ' ' * (indent * (level + 1))
+        sep = '[' + pad
+        for item in value:
+            yield sep
+            yield from _encode(item, indent, level + 1)
+            sep = ',' + pad
+        yield '[]' if sep.startswith('[') else '\n' + ' ' * (indent * level) + ']'
+    else:
+        yield _dump(value, indent, level)
+
+def iter_json(document: Any, indent: int = 2, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode a document in chunks, byte-identical to json.dumps(document, indent=indent).
+
+    Generators anywhere in the document are consumed lazily and encoded as arrays, so emitters
+    can produce one module at a time without materializing the whole output.
+    """
+    buffer: List[str] = []
+    size = 0
+    for piece in _encode(document, indent, 0):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
@@ -1,9 +1,9 @@
 # backend/main.py - ULTIMATE PRODUCTION VERSION WITH PERFECT CONVERSIONS
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse, JSONResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable, Union
 import json
 import uuid
 import asyncio
@@ -11,30 +11,89 @@ from datetime import datetime
 import os
 import logging
 import tempfile
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from workflow_engine import WorkflowEngine, WorkflowExecution
+from workflow_engine import WorkflowEngine, WorkflowExecution, CompiledPlan, STATUS_FIELDS, Plan
+from executors.http_executor import close_http_client, sweep_spill_dir
+from webhooks import WebhookRegistry, WebhookRoute
+from run_dispatcher import RunDispatcher
+from scheduler import Scheduler, ScheduledJob, CronError
 from parsers.n8n_parser import N8nParser
 from parsers.zapier_parser import ZapierParser
 from parsers.make_parser import MakeParser
+from parsers.schemas import validate_workflow
+from converters.ir import WorkflowIR, build_ir
+from converters.make_converter import convert_to_make
+from converters.zapier_converter import convert_to_zapier
+from converters.n8n_converter import convert_to_n8n
+from node_registry import NODE_REGISTRY
+from workflow_index import WorkflowIndex, InvalidQuery
+from artifact_cache import Artifact, ArtifactCache, content_hash, etag_matches, make_etag
+from zipstream import stream_zip
+from jsonstream import iter_json
+from interpreter_pool import InterpreterPool
+from process_runner import ExitStatus, OutputEvent, collect_output, result_of, stream_process
+from sandbox import ExecutionPool, Limits, QueueFull, limited_command
+from codegen.python_generator import generate_python_code, generate_async_python_code, GENERATOR_VERSION
+import migromat_runtime
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="MigroMat API v3.0 - Ultimate Edition", version="3.0.0")
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+                   expose_headers=["ETag"])  # the frontend polls cross-origin and sends ETags back as If-None-Match
 
 executions: Dict[str, WorkflowExecution] = {}
 workflows: Dict[str, Dict[str, Any]] = {}
+WORKFLOW_INDEX = WorkflowIndex()  # listing summaries and sort orders, kept in step with `workflows`
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
 
 PARSERS = {'n8n': N8nParser(), 'zapier': ZapierParser(), 'make': MakeParser()}
+# Base URLs the engine calls instead of placeholders, e.g. ENGINE_SERVICES_URL=http://localhost:8900 for mock_services.py
+ENGINE_SERVICE_URLS = {name: os.environ['ENGINE_SERVICES_URL'] for name in ('airtable', 'openai', 'sendgrid')} if os.getenv('ENGINE_SERVICES_URL') else {}
+
+# Bump when converter output changes so cached artifacts are not reused
+CONVERTER_VERSION = '3.0'
+ARTIFACT_CACHE = ArtifactCache(int(os.getenv('ARTIFACT_CACHE_BYTES', 64 * 1024 * 1024)))
+STREAM_MIN_STEPS = int(os.getenv('STREAM_MIN_STEPS', 500))
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 4))
+BATCH_POOL = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch')
+# Generated scripts import migromat_runtime, which lives next to this file
+RUNTIME_DIR = os.path.dirname(os.path.abspath(migromat_runtime.__file__))
+SCRIPT_ENV = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [os.path.dirname(RUNTIME_DIR), os.environ.get('PYTHONPATH')]))}
+# Warm interpreters for execute/python; PYTHON_POOL_SIZE=0 falls back to one process per run
+PYTHON_POOL_SIZE = int(os.getenv('PYTHON_POOL_SIZE', 2))
+# Per-job quotas for user code; output past output_bytes is dropped and the process killed
+SANDBOX_LIMITS = Limits(
+    cpu_seconds=int(os.getenv('SANDBOX_CPU_SECONDS', 60)),
+    memory_bytes=int(os.getenv('SANDBOX_MEMORY_MB', 1024)) * 1024 * 1024,
+    open_files=int(os.getenv('SANDBOX_OPEN_FILES', 256)),
+    output_bytes=int(os.getenv('OUTPUT_LIMIT_BYTES', 1024 * 1024))
+)
+EXECUTION_POOL = ExecutionPool(int(os.getenv('MAX_CONCURRENT_EXECUTIONS', 4)), int(os.getenv('MAX_QUEUED_EXECUTIONS', 32)))
+PYTHON_POOL = InterpreterPool(PYTHON_POOL_SIZE, int(os.getenv('PYTHON_POOL_MAX_RUNS', 50)), env=SCRIPT_ENV, limits=SANDBOX_LIMITS)
+# Webhook and scheduled runs are queued for a fixed set of workers; sync webhook callers wait up to WEBHOOK_WAIT_TIMEOUT
+TRIGGER_WORKERS = int(os.getenv('TRIGGER_WORKERS', 8))
+TRIGGER_QUEUE_SIZE = int(os.getenv('TRIGGER_QUEUE_SIZE', 10000))
+WEBHOOK_WAIT_TIMEOUT = float(os.getenv('WEBHOOK_WAIT_TIMEOUT', 30))
+# Last fire times of schedule triggers, so re-uploaded workflows catch up on runs missed while down
+DATA_DIR = os.getenv('MIGROMAT_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))  # state kept across restarts
+SCHEDULE_STATE_FILE = os.getenv('SCHEDULE_STATE_FILE', os.path.join(DATA_DIR, 'schedule_state.json'))
+SCHEDULE_OVERLAP = os.getenv('SCHEDULE_OVERLAP', 'skip')  # 'skip' or 'coalesce' a fire that lands while the previous run is going
+SCHEDULE_MAX_JITTER = float(os.getenv('SCHEDULE_MAX_JITTER', 5))
+SCHEDULE_CATCHUP_HOURS = float(os.getenv('SCHEDULE_CATCHUP_HOURS', 24))
 
 class ExecutionRequest(BaseModel):
     workflow_id: str
-    input_data: Optional[Dict[str, Any]] = {}
+    input_data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = {}  # one item or a list of items
     credentials: Optional[Dict[str, str]] = {}
 
+class BatchExportRequest(BaseModel):
+    workflow_ids: List[str]
+    targets: List[str]
+
 class ExecutionResponse(BaseModel):
     execution_id: str
     status: str
@@ -49,12 +108,12 @@ def detect_platform(data: Dict[str, Any]) -> str:
         return 'make'
     raise ValueError("Unknown platform")
 
-async def run_workflow_background(execution_id: str, workflow: Dict[str, Any], input_data: Dict[str, Any], credentials: Dict[str, str]):
+async def run_workflow_background(execution_id: str, workflow: Dict[str, Any], input_data: Union[Dict[str, Any], List[Dict[str, Any]]], credentials: Dict[str, str], plan: Optional[Plan] = None, trigger: Optional[str] = None):
     execution = executions[execution_id]
-    engine = WorkflowEngine()
+    engine = WorkflowEngine(service_urls=ENGINE_SERVICE_URLS)
     try:
         execution.add_log('info', 'Starting')
-        result = await engine.execute(workflow, input_data, credentials, lambda log: execution.add_log(log['level'], log['message']))
+        result = await engine.execute(workflow, input_data, credentials, lambda log: execution.add_log(log['level'], log['message']), plan=plan, trigger=trigger)
         execution.status = 'completed'
         execution.result = result
         execution.completed_at = datetime.now()
@@ -65,375 +124,163 @@ async def run_workflow_background(execution_id: str, workflow: Dict[str, Any], i
         execution.completed_at = datetime.now()
         execution.add_log('error', f'Failed: {e}')
 
-# ============================================================================
-# MAKE.COM MODULE MAPPER - COMPREHENSIVE
-# ============================================================================
-class MakeModuleMapper:
-    """Complete mapping of n8n nodes to Make.com module specifications"""
-    
-    @staticmethod
-    def get_module_spec(n8n_type: str, node_name: str, params: Dict) -> Dict[str, Any]:
-        """Get complete Make.com module specification"""
-        n8n_type = n8n_type.replace('n8n-nodes-base.', '').replace('@n8n/n8n-nodes-langchain.', '').lower()
-        
-        # Comprehensive module mapping
-        module_map = {
-            # Database & Storage
-            'airtable': ('airtable:ActionCreateRecord', 3),
-            'airtabletool': ('airtable:ActionSearchRecords', 3),
-            'googledrive': ('google-drive:uploadFile', 2),
-            'googlesheets': ('google-sheets:addRow', 4),
-            'mysql': ('mysql:executeQuery', 1),
-            'postgresql': ('postgresql:select', 1),
-            'mongodb': ('mongodb:aggregate', 1),
-            
-            # Communication
-            'gmail': ('google-email:sendEmail', 1),
-            'emailsend': ('email:sendEmail', 1),
-            'sendgrid': ('sendgrid:sendEmail', 1),
-            'slack': ('slack:createMessage', 1),
-            'discord': ('discord:createMessage', 1),
-            'telegram': ('telegram:sendTextMessage', 1),
-            
-            # AI & ML
-            'openai': ('openai:createChatCompletion', 1),
-            'agent': ('openai:createChatCompletion', 1),
-            'lmchatopenai': ('openai:createChatCompletion', 1),
-            'outputparserstructured': ('json:parseJSON', 1),
-            
-            # Triggers & Webhooks
-            'webhook': ('webhook:customWebHook', 1),
-            'formtrigger': ('webhook:customWebHook', 1),
-            'form': ('webhook:customWebHook', 1),
-            
-            # Calendar & Scheduling
-            'googlecalendar': ('google-calendar:createEvent', 1),
-            'googlecalendartool': ('google-calendar:createEvent', 1),
-            
-            # Data Processing
-            'set': ('builtin:BasicRouter', 1),
-            'if': ('builtin:BasicRouter', 1),
-            'switch': ('builtin:Router', 1),
-            'merge': ('builtin:Aggregator', 1),
-            'code': ('builtin:HTTPmodule', 1),
-            'httprequest': ('http:ActionSendData', 1),
-            'extractfromfile': ('tools:textParser', 1),
-            
-            # Notes (skip)
-            'stickynote': (None, None),
-        }
-        
-        module_id, version = module_map.get(n8n_type, ('http:ActionSendData', 1))
-        
-        if module_id is None:
-            return None
-        
-        return {
-            "id": 1,
-            "module": module_id,
-            "version": version,
-            "parameters": MakeModuleMapper._convert_parameters(n8n_type, params),
-            "mapper": {},
-            "metadata": {
-                "designer": {"x": 0, "y": 0},
-                "restore": {
-                    "parameters": {},
-                    "expect": {}
-                },
-                "parameters": [],
-                "expect": []
-            }
-        }
-    
-    @staticmethod
-    def _convert_parameters(node_type: str, params: Dict) -> Dict[str, Any]:
-        """Convert n8n parameters to Make.com format"""
-        if 'airtable' in node_type:
-            return {
-                "base": "{{parameters.baseId}}",
-                "table": "{{parameters.table}}",
-                "typecast": False
-            }
-        elif 'openai' in node_type or 'ai' in node_type:
-            return {
-                "model": "gpt-3.5-turbo",
-                "messages": [{"role": "user", "content": "{{parameters.prompt}}"}],
-                "temperature": 0.7
-            }
-        elif 'email' in node_type:
-            return {
-                "to": "{{parameters.to}}",
-                "subject": "{{parameters.subject}}",
-                "content": "{{parameters.text}}"
-            }
-        elif 'webhook' in node_type:
-            return {
-                "hookType": "post",
-                "responseMode": "onReceived"
-            }
-        return {}
+async def run_webhook(route: WebhookRoute, execution_id: str, payload: Dict[str, Any]):
+    await run_workflow_background(execution_id, {'steps': route.compiled.steps}, payload, {}, plan=route.compiled.plan, trigger=route.compiled.trigger)
+
+def launch_scheduled(job: ScheduledJob, nominal: datetime) -> asyncio.Future:
+    eid = str(uuid.uuid4())
+    done = RUN_DISPATCHER.submit(run_workflow_background, eid, {'steps': job.compiled.steps}, {'scheduled_at': nominal.isoformat(), 'trigger': job.trigger}, {}, job.compiled.plan, job.compiled.trigger)
+    executions[eid] = WorkflowExecution(id=eid, workflow_id=job.workflow_id, status='running', started_at=datetime.now())
+    return done
+
+WEBHOOKS = WebhookRegistry()
+RUN_DISPATCHER = RunDispatcher(TRIGGER_WORKERS, TRIGGER_QUEUE_SIZE)
+SCHEDULER = Scheduler(launch_scheduled, SCHEDULE_STATE_FILE, overlap=SCHEDULE_OVERLAP, max_jitter=SCHEDULE_MAX_JITTER, catchup_window=SCHEDULE_CATCHUP_HOURS * 3600)
 
 # ============================================================================
 # CONVERSION ENGINE - ULTIMATE VERSION
 # ============================================================================
-def convert_to_make(wf: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert n8n workflow to proper Make.com blueprint format"""
+CONVERTERS = {'make': convert_to_make, 'zapier': convert_to_zapier, 'n8n': convert_to_n8n}
+PYTHON_RUNTIMES = {'sync': 'python', 'async': 'python-async'}  # export runtime -> artifact target
+
+def get_workflow_ir(wf: Dict[str, Any]) -> WorkflowIR:
+    """Return the workflow's IR, built on first use and rebuilt if node mappings were reloaded since"""
+    generation = NODE_REGISTRY.generation
+    if wf.get('ir_generation') != generation:
+        wf['ir'], wf['ir_generation'] = build_ir(wf['parsed']), generation
+    return wf['ir']
+
+def convert_workflow(wf: Dict[str, Any], target: str, lazy: bool = False) -> Dict[str, Any]:
+    if target == wf['platform']:
+        return wf['original']
+    return CONVERTERS[target](get_workflow_ir(wf), lazy=lazy)
+
+def artifact_key(wf: Dict[str, Any], target: str) -> tuple:
+    version = GENERATOR_VERSION if target in PYTHON_RUNTIMES.values() else CONVERTER_VERSION
+    return (wf['content_hash'], target, f"{version}+{NODE_REGISTRY.generation}")
+
+def render_artifact(wf: Dict[str, Any], target: str) -> Artifact:
+    """Serialized conversion output for a target platform or Python runtime, served from the artifact cache"""
+    if target == 'python':
+        build = lambda: generate_python_code(wf['parsed']).encode('utf-8')
+    elif target == 'python-async':
+        build = lambda: generate_async_python_code(get_workflow_ir(wf)).encode('utf-8')
+    else:
+        build = lambda: json.dumps(convert_workflow(wf, target), indent=2).encode('utf-8')
+    return ARTIFACT_CACHE.get_or_build(artifact_key(wf, target), build)
+
+def safe_filename(name: str) -> str:
+    return ''.join(c for c in name.lower() if c.isalnum() or c == '_')[:30] or 'wf'
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+def sandboxed(args, timeout: float, token: int, shell: bool = False, env: Optional[Dict[str, str]] = None) -> AsyncIterator[OutputEvent]:
+    """Output stream of a quota-limited process that starts once the execution pool has a free slot"""
+    if shell and os.name == 'posix':
+        args, shell = ['/bin/sh', '-c', args], False
+    if not shell:
+        args = limited_command(args, SANDBOX_LIMITS)
+    return EXECUTION_POOL.gated(stream_process(args, timeout, max_bytes=SANDBOX_LIMITS.output_bytes, shell=shell, env=env), token)
+
+def admit_execution() -> int:
+    """Reservation token for sandboxed() / EXECUTION_POOL.gated(), or 503 when the queue is full"""
     try:
-        nodes = wf.get('nodes', [])
-        flow_modules = []
-        x_pos = 100
-        
-        for idx, node in enumerate(nodes, 1):
-            node_type = node.get('type', '')
-            node_name = node.get('name', f'Step {idx}')
-            params = node.get('parameters', {})
-            
-            module_spec = MakeModuleMapper.get_module_spec(node_type, node_name, params)
-            
-            if module_spec is None:
-                continue
-            
-            module_spec['id'] = idx
-            module_spec['metadata']['designer']['x'] = x_pos
-            module_spec['metadata']['designer']['y'] = 100
-            
-            flow_modules.append(module_spec)
-            x_pos += 200
-        
-        return {
-            "name": wf.get('name', 'Converted Scenario'),
-            "flow": flow_modules,
-            "metadata": {
-                "instant": False,
-                "version": 1,
-                "scenario": {
-                    "roundtrips": 1,
-                    "maxErrors": 3,
-                    "autoCommit": True,
-                    "autoCommitTriggerLast": True,
-                    "sequential": False,
-                    "confidential": False,
-                    "dataloss": False,
-                    "dlq": False,
-                    "freshVariables": False
-                },
-                "designer": {
-                    "orphans": []
-                },
-                "zone": "us1.make.com"
-            }
-        }
-    except Exception as e:
-        logger.error(f"Make conversion error: {e}")
-        raise
+        return EXECUTION_POOL.admit()
+    except QueueFull as e:
+        raise HTTPException(503, f"Execution queue is full: {e}", headers={'Retry-After': '5'})
 
-def convert_to_zapier(wf: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert n8n workflow to Zapier format"""
-    try:
-        nodes = wf.get('nodes', [])
-        
-        if not nodes:
-            return {"name": wf.get('name', 'Workflow'), "steps": []}
-        
-        trigger_node = nodes[0]
-        action_nodes = nodes[1:]
-        
-        return {
-            "name": wf.get('name', 'Converted Zap'),
-            "description": "Converted from n8n by MigroMat",
-            "trigger": {
-                "app": trigger_node.get('type', 'webhook').replace('n8n-nodes-base.', ''),
-                "event": "trigger",
-                "title": trigger_node.get('name', 'Trigger'),
-                "config": trigger_node.get('parameters', {})
-            },
-            "actions": [
-                {
-                    "id": str(i),
-                    "app": node.get('type', '').replace('n8n-nodes-base.', ''),
-                    "action": node.get('name', ''),
-                    "title": node.get('name', f'Step {i}'),
-                    "config": node.get('parameters', {})
-                }
-                for i, node in enumerate(action_nodes, 1)
-            ]
-        }
-    except Exception as e:
-        logger.error(f"Zapier conversion error: {e}")
-        raise
+def sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-def generate_python_code(workflow: Dict[str, Any]) -> str:
-    """Generate production-ready Python automation code"""
-    try:
-        steps = workflow.get('steps', [])
-        if not steps:
-            return "# Error: No steps found"
-        
-        name = workflow.get('name', 'workflow').replace('"', "'")
-        total = len(steps)
-        
-        code = f'''#!/usr/bin/env python3
-"""
-{name}
-Generated by MigroMat v3.0 - Ultimate Edition
-Total Steps: {total}
-"""
-import os, json, requests
-from datetime import datetime
-from typing import Dict, Any
-
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
-class Config:
-    AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY", "")
-    AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID", "")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-    SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY", "")
-
-class Logger:
-    def log(self, l, m): print(f"[{{datetime.now().strftime('%H:%M:%S')}}] [{{l}}] {{m}}")
-
-logger = Logger()
-
-class API:
-    @staticmethod
-    def airtable(method: str, table: str, data: Dict = None, record_id: str = None):
-        url = f"https://api.airtable.com/v0/{{Config.AIRTABLE_BASE_ID}}/{{table}}"
-        if record_id: url += f"/{{record_id}}"
-        headers = {{"Authorization": f"Bearer {{Config.AIRTABLE_API_KEY}}", "Content-Type": "application/json"}}
+def output_stream(events: AsyncIterator[OutputEvent], done: Callable[[ExitStatus], Dict[str, Any]], prologue: str = '', cleanup: Optional[str] = None) -> StreamingResponse:
+    """Server-sent events: 'queued' while waiting for a slot, 'output' per chunk of stdout/stderr, then one 'done'"""
+    async def body():
         try:
-            if method == "GET": r = requests.get(url, headers=headers)
-            elif method == "POST": r = requests.post(url, headers=headers, json={{"fields": data}})
-            elif method == "PATCH": r = requests.patch(url, headers=headers, json={{"fields": data}})
-            r.raise_for_status()
-            return r.json()
-        except Exception as e:
-            logger.log("ERROR", f"Airtable: {{e}}")
-            return None
-    
-    @staticmethod
-    def openai(prompt: str):
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {{"Authorization": f"Bearer {{Config.OPENAI_API_KEY}}", "Content-Type": "application/json"}}
-        data = {{"model": "gpt-3.5-turbo", "messages": [{{"role": "user", "content": prompt}}]}}
-        try:
-            r = requests.post(url, headers=headers, json=data)
-            r.raise_for_status()
-            return r.json()["choices"][0]["message"]["content"]
-        except Exception as e:
-            logger.log("ERROR", f"OpenAI: {{e}}")
-            return None
-    
-    @staticmethod
-    def email(to: str, subject: str, body: str):
-        url = "https://api.sendgrid.com/v3/mail/send"
-        headers = {{"Authorization": f"Bearer {{Config.SENDGRID_API_KEY}}", "Content-Type": "application/json"}}
-        data = {{"personalizations": [{{"to": [{{"email": to}}]}}], "from": {{"email": "noreply@example.com"}}, "subject": subject, "content": [{{"type": "text/plain", "value": body}}]}}
-        try:
-            r = requests.post(url, headers=headers, json=data)
-            r.raise_for_status()
-            return True
-        except Exception as e:
-            logger.log("ERROR", f"Email: {{e}}")
-            return False
-
-api = API()
-
-'''
-        
-        for i, step in enumerate(steps, 1):
-            sn = step.get('name', f'step_{i}')
-            st = step.get('type', 'action')
-            safe = ''.join(c if c.isalnum() or c == '_' else '_' for c in sn.lower())[:30].strip('_') or f's{i}'
-            
-            if 'airtable' in st.lower() or 'airtable' in sn.lower():
-                code += f'''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
-    logger.log("INFO", "Step {i}: {sn}")
-    r = api.airtable("POST", "Table", {{"Name": d.get("name", "Unknown")}})
-    if r: d["airtable_id"] = r.get("id")
-    return d
-
-'''
-            elif any(x in st.lower() or x in sn.lower() for x in ['openai', 'ai', 'gpt']):
-                code += f'''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
-    logger.log("INFO", "Step {i}: {sn}")
-    r = api.openai(f"Process: {{d}}")
-    if r: d["ai_response"] = r
-    return d
-
-'''
-            elif 'email' in st.lower() or 'send' in sn.lower():
-                code += f'''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
-    logger.log("INFO", "Step {i}: {sn}")
-    api.email(d.get("email", "test@example.com"), "Notification", "Done")
-    return d
-
-'''
-            else:
-                code += f'''def step{i}_{safe}(d: Dict[str, Any]) -> Dict[str, Any]:
-    logger.log("INFO", "Step {i}: {sn}")
-    d["step{i}_done"] = True
-    return d
-
-'''
-        
-        code += f'''def run():
-    logger.log("INFO", "Starting: {name}")
-    d = {{"workflow": "{name}", "started": datetime.now().isoformat()}}
-    try:
-'''
-        for i, step in enumerate(steps, 1):
-            sn = step.get('name', f'step_{i}')
-            safe = ''.join(c if c.isalnum() or c == '_' else '_' for c in sn.lower())[:30].strip('_') or f's{i}'
-            code += f'        d = step{i}_{safe}(d)\n'
-        
-        code += '''        logger.log("INFO", "✅ Done")
-        return {"status": "success", "data": d}
-    except Exception as e:
-        logger.log("ERROR", f"Failed: {e}")
-        return {"status": "failed", "error": str(e)}
-
-if __name__ == "__main__":
-    r = run()
-    print(json.dumps(r, indent=2))
-    with open("result.json", "w") as f: json.dump(r, f, indent=2)
-    exit(0 if r.get("status") == "success" else 1)
-'''
-        return code
-    except Exception as e:
-        logger.error(f"Python generation error: {e}")
-        return f"# Error: {e}"
+            if prologue:
+                yield sse('output', {'stream': 'stdout', 'text': prologue})
+            async for kind, payload in events:
+                if kind == 'exit':
+                    yield sse('done', {**done(payload), 'queue_wait_ms': round(payload.queue_wait * 1000)})
+                elif kind == 'queued':
+                    yield sse('queued', {'position': payload})
+                else:
+                    yield sse('output', {'stream': kind, 'text': payload})
+        finally:
+            if cleanup and os.path.exists(cleanup):
+                os.remove(cleanup)
+    return StreamingResponse(body(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
 
+@app.on_event("startup")
+async def start_python_pool():
+    if PYTHON_POOL_SIZE > 0:
+        await PYTHON_POOL.start()
+    await RUN_DISPATCHER.start()
+    await SCHEDULER.start()
+    removed = sweep_spill_dir()
+    if removed:
+        logger.info(f"🧹 Removed {removed} stale HTTP spill files")
+
+@app.on_event("shutdown")
+async def stop_python_pool():
+    await PYTHON_POOL.close()
+    await SCHEDULER.close()
+    await RUN_DISPATCHER.close()
+    await close_http_client()
+
 @app.get("/")
 async def root():
     return {"message": "MigroMat API v3.0 Ultimate", "status": "running"}
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "workflows": len(workflows), "executions": len(executions)}
+    return {"status": "healthy", "workflows": len(workflows), "executions": len(executions), "artifact_cache": ARTIFACT_CACHE.stats(), "python_pool": PYTHON_POOL.stats(), "sandbox": EXECUTION_POOL.stats(), "webhooks": WEBHOOKS.stats(), "triggered_runs": RUN_DISPATCHER.stats(), "scheduler": SCHEDULER.stats()}
 
 @app.post("/api/workflows/upload")
 async def upload_workflow(file: UploadFile = File(...)):
     try:
         content = await file.read()
-        data = json.loads(content)
-        platform = detect_platform(data)
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise HTTPException(400, {'message': 'Invalid JSON', 'errors': [{'loc': f'line {e.lineno}, column {e.colno}', 'message': e.msg, 'type': 'json_invalid'}]})
+        if not isinstance(data, dict):
+            raise HTTPException(400, {'message': 'Workflow must be a JSON object', 'errors': []})
+        try:
+            platform = detect_platform(data)
+        except ValueError as e:
+            raise HTTPException(400, {'message': str(e), 'errors': []})
         parser = PARSERS.get(platform)
         if not parser:
             raise HTTPException(400, f"Unsupported: {platform}")
+        errors = validate_workflow(platform, data)
+        if errors:
+            raise HTTPException(422, {'message': f'Invalid {platform} workflow', 'errors': errors})
         parsed = parser.parse(data)
         wid = str(uuid.uuid4())
-        workflows[wid] = {'id': wid, 'name': data.get('name', file.filename), 'platform': platform, 'parsed': parsed, 'original': data}
+        created_at = datetime.now().isoformat(timespec='microseconds')
+        workflows[wid] = {'id': wid, 'name': data.get('name', file.filename), 'platform': platform, 'parsed': parsed, 'original': data, 'content_hash': content_hash(data), 'created_at': created_at,
+                          'compiled': CompiledPlan(parsed['steps'])}  # expressions are parsed here, once
+        WORKFLOW_INDEX.add(wid, workflows[wid]['name'], platform, len(parsed['steps']), created_at)
+        hooks = WEBHOOKS.register(wid, parsed)
+        try:
+            schedules = SCHEDULER.register(wid, workflows[wid]['content_hash'], parsed)
+        except CronError as e:
+            logger.warning(f"Schedule trigger of {wid} not scheduled: {e}")
+            schedules = [{'error': str(e)}]
         logger.info(f"✅ Uploaded: {wid}")
-        return {'workflow_id': wid, 'name': workflows[wid]['name'], 'platform': platform, 'steps_count': len(parsed['steps']), 'message': 'Ready'}
+        response = {'workflow_id': wid, 'name': workflows[wid]['name'], 'platform': platform, 'steps_count': len(parsed['steps']), 'message': 'Ready'}
+        if hooks:
+            response['webhooks'] = [f"/webhook/{path}" for path in hooks]
+        if schedules:
+            response['schedules'] = schedules
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload failed: {e}")
         raise HTTPException(500, str(e))
@@ -447,137 +294,329 @@ async def execute_workflow(request: ExecutionRequest, background_tasks: Backgrou
         eid = str(uuid.uuid4())
         execution = WorkflowExecution(id=eid, workflow_id=request.workflow_id, status='running', started_at=datetime.now())
         executions[eid] = execution
-        background_tasks.add_task(run_workflow_background, eid, wf['parsed'], request.input_data, request.credentials)
+        background_tasks.add_task(run_workflow_background, eid, wf['parsed'], request.input_data, request.credentials, wf['compiled'].plan)
         return ExecutionResponse(execution_id=eid, status='running', message='Started')
     except Exception as e:
         raise HTTPException(500, str(e))
 
 @app.get("/api/executions/{execution_id}")
-async def get_execution_status(execution_id: str):
+async def get_execution_status(execution_id: str, since: int = 0, fields: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
+    """Pollers pass back log_cursor as ?since= to receive only new log lines, and leave
+    `result` out of ?fields= until status is final; unchanged state answers 304."""
     ex = executions.get(execution_id)
     if not ex:
         raise HTTPException(404, "Not found")
-    return ex.to_dict()
-
+    if since < 0:
+        raise HTTPException(400, "since must be a log cursor (>= 0)")
+    projection = fields.split(',') if fields else None
+    if projection:
+        unknown = [f for f in projection if f not in STATUS_FIELDS]
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    # Logs only grow and the result is only set together with the final status, so these identify the state.
+    # `since` stays out: a poller that echoes log_cursor back has seen every log line this tag covers.
+    etag = make_etag((ex.id, ex.status, str(len(ex.logs)), ','.join(projection or STATUS_FIELDS)))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return JSONResponse(ex.delta(since, projection), headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+@app.get("/api/workflows/{workflow_id}/export/python")
 @app.post("/api/workflows/{workflow_id}/export/python")
-async def export_to_python(workflow_id: str):
+async def export_to_python(workflow_id: str, runtime: str = 'sync', if_none_match: Optional[str] = Header(None)):
     try:
         wf = workflows.get(workflow_id)
         if not wf:
             raise HTTPException(404, "Not found")
-        code = generate_python_code(wf['parsed'])
-        fn = f"workflow_{(''.join(c for c in wf['name'].lower() if c.isalnum() or c == '_')[:30] or 'wf')}.py"
+        if runtime not in PYTHON_RUNTIMES:
+            raise HTTPException(400, f"Unknown runtime: {runtime}")
+        key = artifact_key(wf, PYTHON_RUNTIMES[runtime])
+        if etag_matches(if_none_match, make_etag(key)):
+            return not_modified(make_etag(key))
+        artifact = render_artifact(wf, PYTHON_RUNTIMES[runtime])
+        fn = f"workflow_{safe_filename(wf['name'])}.py"
         logger.info(f"✅ Exported Python: {fn}")
-        return Response(content=code.encode('utf-8'), media_type='text/x-python', headers={'Content-Disposition': f'attachment; filename="{fn}"'})
+        return Response(content=artifact.body, media_type='text/x-python', headers={'Content-Disposition': f'attachment; filename="{fn}"', 'ETag': artifact.etag, 'Cache-Control': 'private, no-cache'})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, str(e))
 
 @app.post("/api/workflows/{workflow_id}/execute/python")
-async def execute_python_code(workflow_id: str):
+async def execute_python_code(workflow_id: str, runtime: str = 'sync', stream: bool = False):
     try:
         wf = workflows.get(workflow_id)
         if not wf:
             raise HTTPException(404, "Not found")
-        code = generate_python_code(wf['parsed'])
-        td = tempfile.gettempdir()
-        sp = os.path.join(td, f"exec_{uuid.uuid4().hex[:8]}.py")
-        with open(sp, 'w', encoding='utf-8') as f:
-            f.write(code)
+        if runtime not in PYTHON_RUNTIMES:
+            raise HTTPException(400, f"Unknown runtime: {runtime}")
+        token = admit_execution()
+        code = render_artifact(wf, PYTHON_RUNTIMES[runtime]).body
         ol = ["="*60, "EXECUTING", "="*60, ""]
+        sp = None
+        if PYTHON_POOL_SIZE > 0:
+            events = EXECUTION_POOL.gated(PYTHON_POOL.stream(code.decode('utf-8'), name=f"workflow_{safe_filename(wf['name'])}.py", timeout=60, max_bytes=SANDBOX_LIMITS.output_bytes), token)
+        else:
+            sp = os.path.join(tempfile.gettempdir(), f"exec_{uuid.uuid4().hex[:8]}.py")
+            with open(sp, 'wb') as f:
+                f.write(code)
+            events = sandboxed([sys.executable, sp], timeout=60, token=token, env=SCRIPT_ENV)
+        
+        if stream:
+            def done(status: ExitStatus) -> Dict[str, Any]:
+                state = 'timeout' if status.timed_out else 'completed'
+                return {"status": state, "exit_code": status.returncode, "success": status.returncode == 0, "truncated": status.truncated}
+            return output_stream(events, done, prologue="\n".join(ol) + "\n", cleanup=sp)
+        
         try:
-            r = subprocess.run([sys.executable, sp], capture_output=True, text=True, timeout=60)
-            ol.append(r.stdout or "No output")
-            if r.stderr:
-                ol.append("\nERRORS:\n" + r.stderr)
-            ol.append(f"\n{'✅ SUCCESS' if r.returncode == 0 else '❌ FAILED'}")
-            os.remove(sp)
-            return {"status": "completed", "exit_code": r.returncode, "output": "\n".join(ol), "success": r.returncode == 0}
-        except subprocess.TimeoutExpired:
-            os.remove(sp)
-            return {"status": "timeout", "output": "\n".join(ol) + "\nTIMEOUT"}
+            stdout, stderr, status = await collect_output(events)
+        finally:
+            if sp:
+                os.remove(sp)
+        wait_ms = round(status.queue_wait * 1000)
+        if status.timed_out:
+            return {"status": "timeout", "output": "\n".join(ol) + "\nTIMEOUT", "queue_wait_ms": wait_ms}
+        ol.append(stdout or "No output")
+        if stderr:
+            ol.append("\nERRORS:\n" + stderr)
+        ol.append(f"\n{'✅ SUCCESS' if status.returncode == 0 else '❌ FAILED'}")
+        return {"status": "completed", "exit_code": status.returncode, "output": "\n".join(ol), "success": status.returncode == 0, "queue_wait_ms": wait_ms}
+    except HTTPException:
+        raise
     except Exception as e:
         return {"status": "error", "output": str(e)}
 
+@app.get("/api/workflows/{workflow_id}/download/{target_platform}")
 @app.post("/api/workflows/{workflow_id}/download/{target_platform}")
-async def download_converted_workflow(workflow_id: str, target_platform: str):
+async def download_converted_workflow(workflow_id: str, target_platform: str, if_none_match: Optional[str] = Header(None)):
     try:
         wf = workflows.get(workflow_id)
         if not wf:
             raise HTTPException(404, "Not found")
         
-        if target_platform == 'make':
-            data = convert_to_make(wf['original'])
-        elif target_platform == 'zapier':
-            data = convert_to_zapier(wf['original'])
-        elif target_platform == wf['platform']:
-            data = wf['original']
-        else:
+        if target_platform != wf['platform'] and target_platform not in CONVERTERS:
             raise HTTPException(400, f"Conversion {wf['platform']} -> {target_platform} not supported")
         
-        fn = f"{(''.join(c for c in wf['name'].lower() if c.isalnum() or c == '_')[:30] or 'wf')}_{target_platform}.json"
+        key = artifact_key(wf, target_platform)
+        if etag_matches(if_none_match, make_etag(key)):
+            return not_modified(make_etag(key))
+        
+        fn = f"{safe_filename(wf['name'])}_{target_platform}.json"
+        headers = {'Content-Disposition': f'attachment; filename="{fn}"', 'ETag': make_etag(key), 'Cache-Control': 'private, no-cache'}
+        artifact = ARTIFACT_CACHE.get(key)
+        if artifact is None and len(wf['parsed']['steps']) >= STREAM_MIN_STEPS:
+            # Large outputs are encoded module by module instead of being held (and cached) whole
+            logger.info(f"✅ Streaming download: {fn}")
+            return StreamingResponse(iter_json(convert_workflow(wf, target_platform, lazy=True)), media_type='application/json', headers=headers)
+        artifact = artifact or render_artifact(wf, target_platform)
+        
         logger.info(f"✅ Downloaded: {fn}")
-        return Response(content=json.dumps(data, indent=2).encode('utf-8'), media_type='application/json', headers={'Content-Disposition': f'attachment; filename="{fn}"'})
+        return Response(content=artifact.body, media_type='application/json', headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Download failed: {e}")
         raise HTTPException(500, str(e))
 
+@app.post("/api/workflows/batch/export")
+async def batch_export(request: BatchExportRequest):
+    """Convert many workflows to many targets concurrently, streaming a zip as entries finish"""
+    missing = [wid for wid in request.workflow_ids if wid not in workflows]
+    if missing:
+        raise HTTPException(404, {'message': 'Workflows not found', 'workflow_ids': missing})
+    targets = list(dict.fromkeys(request.targets))
+    unsupported = [t for t in targets if t not in PYTHON_RUNTIMES.values() and t not in CONVERTERS]
+    if unsupported:
+        raise HTTPException(400, f"Unsupported targets: {', '.join(unsupported)}")
+    
+    jobs = [(wid, t) for wid in dict.fromkeys(request.workflow_ids) for t in targets]
+    window = BATCH_WORKERS * 2
+    
+    def build(wid: str, target: str):
+        wf = workflows[wid]
+        folder = f"{safe_filename(wf['name'])}_{wid[:8]}"
+        ext = 'py' if target in PYTHON_RUNTIMES.values() else 'json'
+        return f"{folder}/{safe_filename(wf['name'])}_{target}.{ext}", render_artifact(wf, target).body
+    
+    async def entries():
+        loop = asyncio.get_running_loop()
+        manifest = []
+        queue = iter(jobs)
+        pending = {}
+        # Sliding window keeps at most `window` finished-but-unsent artifacts in memory
+        while True:
+            for wid, target in queue:
+                pending[loop.run_in_executor(BATCH_POOL, build, wid, target)] = (wid, target)
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                wid, target = pending.pop(fut)
+                try:
+                    name, body = fut.result()
+                    manifest.append({'workflow_id': wid, 'target': target, 'file': name, 'bytes': len(body)})
+                    yield name, body
+                except Exception as e:
+                    logger.error(f"Batch conversion {wid} -> {target} failed: {e}")
+                    manifest.append({'workflow_id': wid, 'target': target, 'error': str(e)})
+        yield 'manifest.json', json.dumps({'entries': manifest}, indent=2).encode('utf-8')
+    
+    logger.info(f"✅ Batch export: {len(jobs)} conversions")
+    return StreamingResponse(stream_zip(entries()), media_type='application/zip', headers={'Content-Disposition': 'attachment; filename="migromat_export.zip"'})
+
+@app.get("/api/runtime")
+async def get_runtime():
+    return {"version": migromat_runtime.__version__, "requires": "httpx", "download": "/api/runtime/download"}
+
+@app.get("/api/runtime/download")
+async def download_runtime():
+    """Zip of the migromat_runtime package; unpack it next to exported scripts or onto PYTHONPATH"""
+    async def entries():
+        for fn in sorted(os.listdir(RUNTIME_DIR)):
+            if fn.endswith('.py'):
+                with open(os.path.join(RUNTIME_DIR, fn), 'rb') as f:
+                    yield f"migromat_runtime/{fn}", f.read()
+    fn = f"migromat_runtime-{migromat_runtime.__version__}.zip"
+    return StreamingResponse(stream_zip(entries()), media_type='application/zip', headers={'Content-Disposition': f'attachment; filename="{fn}"'})
+
+@app.get("/api/mappings")
+async def get_mappings():
+    return {"version": NODE_REGISTRY.version, "generation": NODE_REGISTRY.generation, "path": NODE_REGISTRY.path}
+
+@app.post("/api/mappings/reload")
+async def reload_mappings():
+    version = NODE_REGISTRY.reload()
+    logger.info(f"✅ Node mappings reloaded: v{version}")
+    return {"version": version, "message": "Reloaded"}
+
 @app.delete("/api/workflows/{workflow_id}")
 async def delete_workflow(workflow_id: str):
     if workflow_id not in workflows:
         raise HTTPException(404, "Not found")
     del workflows[workflow_id]
+    WORKFLOW_INDEX.remove(workflow_id)
+    WEBHOOKS.unregister(workflow_id)
+    SCHEDULER.unregister(workflow_id)
     return {"message": "Deleted"}
 
+def index_time(value: datetime) -> str:
+    """created_at is stored as naive local time; convert aware query values to match"""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat(timespec='microseconds')
+
+@app.get("/api/schedules")
+async def list_schedules(workflow_id: Optional[str] = None, limit: int = 100):
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return {"schedules": SCHEDULER.list(limit, workflow_id), "total": len(SCHEDULER.jobs)}
+
 @app.get("/api/workflows")
-async def list_workflows():
-    return {"workflows": [{"id": w['id'], "name": w['name'], "platform": w['platform'], "steps": len(w['parsed']['steps'])} for w in workflows.values()], "total": len(workflows)}
+async def list_workflows(
+    limit: int = 100, cursor: Optional[str] = None, platform: Optional[str] = None, name_prefix: Optional[str] = None,
+    created_after: Optional[datetime] = None, created_before: Optional[datetime] = None, sort: str = '-created_at', fields: Optional[str] = None
+):
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    try:
+        page = WORKFLOW_INDEX.query(
+            limit, cursor=cursor, platform=platform, name_prefix=name_prefix,
+            created_after=index_time(created_after) if created_after else None,
+            created_before=index_time(created_before) if created_before else None,
+            sort=sort, fields=fields.split(',') if fields else None
+        )
+    except InvalidQuery as e:
+        raise HTTPException(400, str(e))
+    return {**page, "total": len(WORKFLOW_INDEX)}
+
+async def webhook_payload(request: Request) -> Dict[str, Any]:
+    """Engine input for a webhook hit, shaped like n8n's webhook node output"""
+    body: Any = None
+    content_type = request.headers.get('content-type', '')
+    if 'application/json' in content_type:
+        raw = await request.body()
+        try:
+            body = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            raise HTTPException(400, "Invalid JSON body")
+    elif 'form' in content_type:
+        body = dict(await request.form())
+    else:
+        body = (await request.body()).decode('utf-8', 'replace')
+    return {'body': body, 'query': dict(request.query_params), 'headers': dict(request.headers)}
+
+@app.api_route("/webhook/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+async def inbound_webhook(path: str, request: Request, wait: Optional[bool] = None):
+    """Start the workflow registered at `path`; ?wait= overrides the trigger's response mode"""
+    route = WEBHOOKS.match(path)
+    if route is None or request.method not in route.methods:
+        raise HTTPException(404, "No webhook registered for this path and method")
+    payload = await webhook_payload(request)
+    eid = str(uuid.uuid4())
+    executions[eid] = WorkflowExecution(id=eid, workflow_id=route.workflow_id, status='running', started_at=datetime.now())
+    try:
+        done = RUN_DISPATCHER.submit(run_webhook, route, eid, payload)
+    except asyncio.QueueFull:
+        del executions[eid]
+        raise HTTPException(503, "Webhook queue is full, retry later", headers={'Retry-After': '1'})
+    if not (route.respond_sync if wait is None else wait):
+        return JSONResponse({'execution_id': eid, 'status': 'running', 'message': 'Accepted'}, status_code=202)
+    try:
+        await asyncio.wait_for(asyncio.shield(done), WEBHOOK_WAIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        return JSONResponse({'execution_id': eid, 'status': 'running', 'message': 'Still running'}, status_code=202)
+    ex = executions[eid]
+    if ex.status == 'failed':
+        return JSONResponse({'execution_id': eid, 'status': ex.status, 'error': ex.error}, status_code=500)
+    return {'execution_id': eid, 'status': ex.status, 'result': ex.result}
+
+def terminal_done(timeout_error: str) -> Callable[[ExitStatus], Dict[str, Any]]:
+    def done(status: ExitStatus) -> Dict[str, Any]:
+        error = timeout_error if status.timed_out else None
+        return {"success": status.returncode == 0, "exit_code": status.returncode, "error": error, "truncated": status.truncated}
+    return done
+
 @app.post("/api/execute/code")
-async def execute_code(request: dict):
-    """Execute Python code or system commands in terminal"""
+async def execute_code(request: dict, stream: bool = False):
+    """Execute Python code or system commands in terminal; ?stream=true sends output as server-sent events"""
     try:
         code = request.get('code', '').strip()
         
         if not code:
             return {"success": False, "error": "No code provided"}
-        
-        import tempfile
-        import subprocess
-        import sys
+        token = admit_execution()
         
         # Handle pip commands
         if code.startswith('pip '):
+            args = [sys.executable, '-m'] + code.split()
+            if stream:
+                return output_stream(sandboxed(args, timeout=60, token=token), terminal_done("Command timeout (60s limit)"))
             try:
-                result = subprocess.run(
-                    [sys.executable, '-m'] + code.split(),
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
+                result = await result_of(sandboxed(args, timeout=60, token=token))
                 return {
                     "success": result.returncode == 0,
                     "output": result.stdout + (result.stderr if result.stderr else ''),
                     "error": None
                 }
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 return {"success": False, "error": "Command timeout (60s limit)"}
             except Exception as e:
                 return {"success": False, "error": str(e)}
         
         # Handle other system commands (ls, pwd, etc.)
         if code.split()[0] in ['ls', 'dir', 'pwd', 'cd', 'mkdir', 'rm', 'cat', 'echo']:
+            if stream:
+                return output_stream(sandboxed(code, timeout=10, token=token, shell=True), terminal_done("Command timeout (10s limit)"))
             try:
-                result = subprocess.run(
-                    code,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
+                result = await result_of(sandboxed(code, timeout=10, token=token, shell=True))
                 return {
                     "success": result.returncode == 0,
                     "output": result.stdout + (result.stderr if result.stderr else ''),
                     "error": None
                 }
+            except asyncio.TimeoutError:
+                return {"success": False, "error": "Command timeout (10s limit)"}
             except Exception as e:
                 return {"success": False, "error": str(e)}
         
@@ -586,13 +625,11 @@ async def execute_code(request: dict):
             f.write(code)
             temp_path = f.name
         
+        if stream:
+            return output_stream(sandboxed([sys.executable, temp_path], timeout=30, token=token), terminal_done("Execution timeout (30s limit)"), cleanup=temp_path)
+        
         try:
-            result = subprocess.run(
-                [sys.executable, temp_path],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = await result_of(sandboxed([sys.executable, temp_path], timeout=30, token=token))
             
             output = result.stdout
             if result.stderr and result.returncode != 0:
@@ -605,7 +642,7 @@ async def execute_code(request: dict):
                 "output": output or "✓ Code executed successfully (no output)",
                 "error": result.stderr if result.returncode != 0 else None
             }
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             try:
                 os.remove(temp_path)
             except:
@@ -618,6 +655,8 @@ async def execute_code(request: dict):
                 pass
             return {"success": False, "error": str(e)}
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Code execution error: {e}")
         return {"success": False, "error": str(e)}
@@ -0,0 +1,64 @@
+"""MigroMat runtime shared by every generated workflow script.
+
+Generated scripts import their clients, batching and run loop from here, so fixes to this
+package reach exported scripts without regenerating them.
+"""
+from typing import Dict, Any
+from datetime import datetime
+import os
+
+__version__ = '1.1.0'
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+def require(version: str):
+    """Fail fast when a script was generated for an incompatible runtime (same major, >= minor)"""
+    wanted = [int(p) for p in version.split('.')]
+    have = [int(p) for p in __version__.split('.')]
+    if have[0] != wanted[0] or have[:len(wanted)] < wanted:
+        raise RuntimeError(f"Script needs migromat_runtime {version}, found {__version__}")
+
+class Config:
+    AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY", "")
+    AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID", "")
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY", "")
+    # Point these at `python mock_services.py` to run offline
+    AIRTABLE_API_URL = os.getenv("AIRTABLE_API_URL", "https://api.airtable.com")
+    OPENAI_API_URL = os.getenv("OPENAI_API_URL", "https://api.openai.com")
+    SENDGRID_API_URL = os.getenv("SENDGRID_API_URL", "https://api.sendgrid.com")
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+    BATCH_MAX_WAIT = float(os.getenv("BATCH_MAX_WAIT", "2"))
+    ASYNC_BATCH_MAX_WAIT = float(os.getenv("ASYNC_BATCH_MAX_WAIT", "0.05"))
+    OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@example.com")
+
+class Logger:
+    def log(self, l, m): print(f"[{datetime.now().strftime('%H:%M:%S')}] [{l}] {m}")
+
+logger = Logger()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def retry_delay(attempt: int, retry_after: str = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After when the server sent one, else exponential"""
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return min(0.5 * 2 ** attempt, 8.0)
+
+def merge(*parts: Dict[str, Any]) -> Dict[str, Any]:
+    out = {}
+    for p in parts: out.update(p)
+    return out
+
+def initial_items(name: str, items):
+    started = datetime.now().isoformat()
+    return [{"workflow": name, "started": started, **item} for item in items]
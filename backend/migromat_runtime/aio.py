@@ -0,0 +1,173 @@
+"""Asyncio runtime: one pooled httpx.AsyncClient, retries, and future-based batching"""
+from typing import Dict, Any, List, Callable, Awaitable
+import asyncio
+import json
+import sys
+import httpx
+
+from migromat_runtime import Config, logger, retry_delay, merge, initial_items, RETRY_STATUSES
+
+class Batcher:
+    """Buffers calls and sends them together once max_size are queued or the oldest is ASYNC_BATCH_MAX_WAIT old"""
+    def __init__(self, send, max_size: int):
+        self.send, self.max_size, self.items, self.timer, self.tasks = send, max_size, [], None, set()
+
+    def add(self, payload) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self.items.append((payload, fut))
+        if len(self.items) >= self.max_size:
+            self.dispatch()
+        elif self.timer is None:
+            self.timer = loop.call_later(Config.ASYNC_BATCH_MAX_WAIT, self.dispatch)
+        return fut
+
+    def dispatch(self):
+        if self.timer: self.timer.cancel()
+        self.timer = None
+        items, self.items = self.items, []
+        if not items: return
+        task = asyncio.ensure_future(self._send(items))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, items):
+        try:
+            results = await self.send([p for p, _ in items]) or []
+        except Exception as e:
+            logger.log("ERROR", f"Batch: {e}")
+            results = []
+        for n, (_, fut) in enumerate(items):
+            if not fut.done(): fut.set_result(results[n] if n < len(results) else None)
+
+class API:
+    """One pooled client for every call in the run"""
+    def __init__(self):
+        self.client = None
+        self.batchers: Dict[tuple, Batcher] = {}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(Config.HTTP_TIMEOUT),
+            limits=httpx.Limits(max_connections=Config.HTTP_MAX_CONNECTIONS)
+        )
+        self.openai_slots = asyncio.Semaphore(Config.OPENAI_CONCURRENCY)
+        return self
+
+    async def __aexit__(self, *exc):
+        for b in self.batchers.values(): b.dispatch()
+        await asyncio.gather(*(t for b in self.batchers.values() for t in list(b.tasks)))
+        self.batchers.clear()
+        await self.client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transport errors, 429 and 5xx responses"""
+        for attempt in range(Config.MAX_RETRIES + 1):
+            try:
+                r = await self.client.request(method, url, **kwargs)
+                if r.status_code not in RETRY_STATUSES or attempt == Config.MAX_RETRIES:
+                    r.raise_for_status()
+                    return r
+                await asyncio.sleep(retry_delay(attempt, r.headers.get("retry-after")))
+            except httpx.TransportError:
+                if attempt == Config.MAX_RETRIES: raise
+                await asyncio.sleep(retry_delay(attempt))
+
+    def headers(self, key: str) -> Dict[str, str]:
+        # httpx rejects a bare "Bearer " header, so unset keys send no Authorization at all
+        return {"Authorization": f"Bearer {key}", "Content-Type": "application/json"} if key else {"Content-Type": "application/json"}
+
+    async def airtable(self, method: str, table: str, data: Dict = None, record_id: str = None):
+        url = f"{Config.AIRTABLE_API_URL}/v0/{Config.AIRTABLE_BASE_ID}/{table}"
+        if record_id: url += f"/{record_id}"
+        try:
+            return (await self.request(method, url, headers=self.headers(Config.AIRTABLE_API_KEY), json=None if method == "GET" else {"fields": data})).json()
+        except Exception as e:
+            logger.log("ERROR", f"Airtable: {e}")
+            return None
+
+    async def openai(self, prompt: str):
+        data = {"model": Config.OPENAI_MODEL, "messages": [{"role": "user", "content": prompt}]}
+        try:
+            async with self.openai_slots:
+                r = await self.request("POST", f"{Config.OPENAI_API_URL}/v1/chat/completions", headers=self.headers(Config.OPENAI_API_KEY), json=data)
+            return r.json()["choices"][0]["message"]["content"]
+        except Exception as e:
+            logger.log("ERROR", f"OpenAI: {e}")
+            return None
+
+    async def email(self, to: str, subject: str, body: str) -> bool:
+        return (await self._email_batch([to], subject, body))[0]
+
+    def batcher(self, key: tuple, send, max_size: int) -> Batcher:
+        if key not in self.batchers: self.batchers[key] = Batcher(send, max_size)
+        return self.batchers[key]
+
+    async def airtable_create(self, table: str, fields: Dict):
+        """Create a record; concurrent calls are combined 10 per request (Airtable's batch limit)"""
+        return await self.batcher(("airtable", table), lambda records: self._airtable_batch(table, records), 10).add(fields)
+
+    async def _airtable_batch(self, table: str, records: List[Dict]) -> List[Dict]:
+        url = f"{Config.AIRTABLE_API_URL}/v0/{Config.AIRTABLE_BASE_ID}/{table}"
+        try:
+            r = await self.request("POST", url, headers=self.headers(Config.AIRTABLE_API_KEY), json={"records": [{"fields": f} for f in records]})
+            return r.json().get("records", [])
+        except Exception as e:
+            logger.log("ERROR", f"Airtable: {e}")
+            return []
+
+    async def email_queue(self, to: str, subject: str, body: str):
+        """Send a message; identical concurrent messages share one SendGrid request (up to 1000 personalizations)"""
+        return await self.batcher(("email", subject, body), lambda recipients: self._email_batch(recipients, subject, body), 1000).add(to)
+
+    async def _email_batch(self, recipients: List[str], subject: str, body: str) -> List[bool]:
+        data = {"personalizations": [{"to": [{"email": to}]} for to in recipients], "from": {"email": Config.EMAIL_FROM}, "subject": subject, "content": [{"type": "text/plain", "value": body}]}
+        try:
+            await self.request("POST", f"{Config.SENDGRID_API_URL}/v3/mail/send", headers=self.headers(Config.SENDGRID_API_KEY), json=data)
+            return [True] * len(recipients)
+        except Exception as e:
+            logger.log("ERROR", f"Email: {e}")
+            return [False] * len(recipients)
+
+    async def openai_queue(self, prompt: str):
+        """Complete a prompt; concurrent prompts are sent together, OPENAI_CONCURRENCY at a time"""
+        return await self.batcher(("openai",), self._openai_batch, Config.OPENAI_CONCURRENCY * 4).add(prompt)
+
+    async def _openai_batch(self, prompts: List[str]) -> List[str]:
+        return await asyncio.gather(*(self.openai(p) for p in prompts))
+
+api = API()
+
+async def each(step, ds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return await asyncio.gather(*(step(d) for d in ds))
+
+Flow = Callable[[List[Dict[str, Any]]], Awaitable[List[List[Dict[str, Any]]]]]
+
+async def run_many(name: str, flow: Flow, items: List[Dict[str, Any]]):
+    """Run every item through the workflow; flow returns each step's per-item outputs"""
+    logger.log("INFO", f"Starting: {name}")
+    d0 = initial_items(name, items)
+    try:
+        async with api:
+            results = await flow(d0)
+        data = [merge(*parts) for parts in zip(d0, *results)]
+        logger.log("INFO", "✅ Done")
+        return {"status": "success", "data": data}
+    except Exception as e:
+        logger.log("ERROR", f"Failed: {e}")
+        return {"status": "failed", "error": str(e)}
+
+async def run(name: str, flow: Flow):
+    r = await run_many(name, flow, [{}])
+    if r.get("status") == "success": r["data"] = r["data"][0]
+    return r
+
+def main(name: str, flow: Flow):
+    """Script entry point: runs one item, or the JSON list of items given as the first argument"""
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f: r = asyncio.run(run_many(name, flow, json.load(f)))
+    else:
+        r = asyncio.run(run(name, flow))
+    print(json.dumps(r, indent=2))
+    with open("result.json", "w") as f: json.dump(r, f, indent=2)
+    sys.exit(0 if r.get("status") == "success" else 1)
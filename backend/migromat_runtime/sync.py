@@ -0,0 +1,184 @@
+"""Blocking runtime: one pooled httpx.Client, retries, and size/age batching"""
+from typing import Dict, Any, List, Callable
+from concurrent.futures import ThreadPoolExecutor
+import json
+import sys
+import threading
+import time
+import httpx
+
+from migromat_runtime import Config, logger, retry_delay, initial_items, RETRY_STATUSES
+
+class Batcher:
+    """Buffers calls and sends them together once max_size are queued or the oldest is BATCH_MAX_WAIT old.
+
+    A partial batch is sent from a timer thread when its wait runs out, so callbacks may run there.
+    """
+    def __init__(self, send, max_size: int):
+        self.send, self.max_size, self.items, self.timer, self.lock = send, max_size, [], None, threading.Lock()
+
+    def add(self, payload, callback=None):
+        with self.lock:
+            self.items.append((payload, callback))
+            full = len(self.items) >= self.max_size
+            if not full and self.timer is None:
+                self.timer = threading.Timer(Config.BATCH_MAX_WAIT, self._expire)
+                self.timer.daemon = True
+                self.timer.start()
+        if full: self.flush()
+
+    def _take(self):
+        with self.lock:
+            if self.timer: self.timer.cancel()
+            self.timer = None
+            items, self.items = self.items, []
+        return items
+
+    def _expire(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.log("ERROR", f"Batch: {e}")
+
+    def flush(self):
+        items = self._take()
+        if not items: return
+        results = self.send([p for p, _ in items]) or []
+        for n, (_, callback) in enumerate(items):
+            if callback: callback(results[n] if n < len(results) else None)
+
+    def cancel(self):
+        """Drop queued calls without sending them"""
+        self._take()
+
+class API:
+    def __init__(self):
+        self._client = None
+        self.batchers: Dict[tuple, Batcher] = {}
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                timeout=httpx.Timeout(Config.HTTP_TIMEOUT),
+                limits=httpx.Limits(max_connections=Config.HTTP_MAX_CONNECTIONS)
+            )
+        return self._client
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transport errors, 429 and 5xx responses"""
+        for attempt in range(Config.MAX_RETRIES + 1):
+            try:
+                r = self.client.request(method, url, **kwargs)
+                if r.status_code not in RETRY_STATUSES or attempt == Config.MAX_RETRIES:
+                    r.raise_for_status()
+                    return r
+                time.sleep(retry_delay(attempt, r.headers.get("retry-after")))
+            except httpx.TransportError:
+                if attempt == Config.MAX_RETRIES: raise
+                time.sleep(retry_delay(attempt))
+
+    def headers(self, key: str) -> Dict[str, str]:
+        # httpx rejects a bare "Bearer " header, so unset keys send no Authorization at all
+        return {"Authorization": f"Bearer {key}", "Content-Type": "application/json"} if key else {"Content-Type": "application/json"}
+
+    def airtable(self, method: str, table: str, data: Dict = None, record_id: str = None):
+        url = f"{Config.AIRTABLE_API_URL}/v0/{Config.AIRTABLE_BASE_ID}/{table}"
+        if record_id: url += f"/{record_id}"
+        try:
+            return self.request(method, url, headers=self.headers(Config.AIRTABLE_API_KEY), json=None if method == "GET" else {"fields": data}).json()
+        except Exception as e:
+            logger.log("ERROR", f"Airtable: {e}")
+            return None
+
+    def openai(self, prompt: str):
+        data = {"model": Config.OPENAI_MODEL, "messages": [{"role": "user", "content": prompt}]}
+        try:
+            r = self.request("POST", f"{Config.OPENAI_API_URL}/v1/chat/completions", headers=self.headers(Config.OPENAI_API_KEY), json=data)
+            return r.json()["choices"][0]["message"]["content"]
+        except Exception as e:
+            logger.log("ERROR", f"OpenAI: {e}")
+            return None
+
+    def email(self, to: str, subject: str, body: str) -> bool:
+        return self._email_batch([to], subject, body)[0]
+
+    def batcher(self, key: tuple, send, max_size: int) -> Batcher:
+        if key not in self.batchers: self.batchers[key] = Batcher(send, max_size)
+        return self.batchers[key]
+
+    def airtable_create(self, table: str, fields: Dict, callback=None):
+        """Queue a record; records are created 10 per request (Airtable's batch limit)"""
+        self.batcher(("airtable", table), lambda records: self._airtable_batch(table, records), 10).add(fields, callback)
+
+    def _airtable_batch(self, table: str, records: List[Dict]) -> List[Dict]:
+        url = f"{Config.AIRTABLE_API_URL}/v0/{Config.AIRTABLE_BASE_ID}/{table}"
+        try:
+            r = self.request("POST", url, headers=self.headers(Config.AIRTABLE_API_KEY), json={"records": [{"fields": f} for f in records]})
+            return r.json().get("records", [])
+        except Exception as e:
+            logger.log("ERROR", f"Airtable: {e}")
+            return []
+
+    def email_queue(self, to: str, subject: str, body: str):
+        """Queue a message; identical messages share one SendGrid request (up to 1000 personalizations)"""
+        self.batcher(("email", subject, body), lambda recipients: self._email_batch(recipients, subject, body), 1000).add(to)
+
+    def _email_batch(self, recipients: List[str], subject: str, body: str) -> List[bool]:
+        data = {"personalizations": [{"to": [{"email": to}]} for to in recipients], "from": {"email": Config.EMAIL_FROM}, "subject": subject, "content": [{"type": "text/plain", "value": body}]}
+        try:
+            self.request("POST", f"{Config.SENDGRID_API_URL}/v3/mail/send", headers=self.headers(Config.SENDGRID_API_KEY), json=data)
+            return [True] * len(recipients)
+        except Exception as e:
+            logger.log("ERROR", f"Email: {e}")
+            return [False] * len(recipients)
+
+    def openai_queue(self, prompt: str, callback=None):
+        """Queue a prompt; queued prompts are sent concurrently, OPENAI_CONCURRENCY at a time"""
+        self.batcher(("openai",), self._openai_batch, Config.OPENAI_CONCURRENCY * 4).add(prompt, callback)
+
+    def _openai_batch(self, prompts: List[str]) -> List[str]:
+        with ThreadPoolExecutor(max_workers=Config.OPENAI_CONCURRENCY) as pool:
+            return list(pool.map(self.openai, prompts))
+
+    def flush(self):
+        for b in list(self.batchers.values()): b.flush()
+
+    def close(self):
+        """Drop unsent batches and close the client"""
+        for b in list(self.batchers.values()): b.cancel()
+        self.batchers.clear()
+        if self._client is not None: self._client.close()
+
+api = API()
+
+Step = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+def run_many(name: str, steps: List[Step], items: List[Dict[str, Any]]):
+    """Run every item through each step in turn; buffered API calls are flushed after each step"""
+    logger.log("INFO", f"Starting: {name}")
+    ds = initial_items(name, items)
+    try:
+        for step in steps:
+            ds = [step(d) for d in ds]
+            api.flush()
+        logger.log("INFO", "✅ Done")
+        return {"status": "success", "data": ds}
+    except Exception as e:
+        logger.log("ERROR", f"Failed: {e}")
+        return {"status": "failed", "error": str(e)}
+
+def run(name: str, steps: List[Step]):
+    r = run_many(name, steps, [{}])
+    if r.get("status") == "success": r["data"] = r["data"][0]
+    return r
+
+def main(name: str, steps: List[Step]):
+    """Script entry point: runs one item, or the JSON list of items given as the first argument"""
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f: r = run_many(name, steps, json.load(f))
+    else:
+        r = run(name, steps)
+    print(json.dumps(r, indent=2))
+    with open("result.json", "w") as f: json.dump(r, f, indent=2)
+    sys.exit(0 if r.get("status") == "success" else 1)
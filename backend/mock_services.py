@@ -0,0 +1,247 @@
+"""Local stand-in for the Airtable, OpenAI and SendGrid APIs used by the engine and generated scripts.
+
+The three APIs do not overlap in path (/v0, /v1, /v3), so one server covers all of them:
+
+    python mock_services.py --port 8900 --latency-ms 80 --error-rate 0.02 --rate-limit 50
+    AIRTABLE_API_URL=http://localhost:8900 OPENAI_API_URL=http://localhost:8900 \\
+    SENDGRID_API_URL=http://localhost:8900 python workflow_x.py
+
+--mode record forwards to the real APIs and appends each exchange to --cassette;
+--mode replay answers from the cassette, in recorded order, without touching the network.
+"""
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, JSONResponse
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+UPSTREAMS = {
+    'airtable': 'https://api.airtable.com',
+    'openai': 'https://api.openai.com',
+    'sendgrid': 'https://api.sendgrid.com',
+}
+PREFIXES = {'v0': 'airtable', 'v1': 'openai', 'v3': 'sendgrid'}
+
+@dataclass
+class MockSettings:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: float = 0.0  # requests per second per service; 0 disables
+    mode: str = 'mock'  # 'mock' | 'record' | 'replay'
+    cassette: Optional[str] = None
+    seed: Optional[int] = None
+    upstreams: Dict[str, str] = field(default_factory=lambda: dict(UPSTREAMS))
+
+class TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 when a request may proceed, otherwise seconds until the next token"""
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+def request_key(method: str, path: str, body: bytes) -> str:
+    try:
+        canonical = json.dumps(json.loads(body), sort_keys=True).encode('utf-8') if body else b''
+    except ValueError:
+        canonical = body
+    return f"{method} {path} {hashlib.sha256(canonical).hexdigest()[:16]}"
+
+class Cassette:
+    """Recorded exchanges, one JSON object per line.
+
+    Replay prefers an exact (method, path, body) match; bodies that embed timestamps fall back
+    to the next recording for the same method and path, cycling when they run out.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._exact: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_route: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._cursors: Dict[Any, Any] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def _index(self, entry: Dict[str, Any]):
+        self._exact.setdefault(entry['key'], []).append(entry)
+        self._by_route.setdefault((entry['method'], entry['path']), []).append(entry)
+
+    def record(self, entry: Dict[str, Any]):
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self._index(entry)
+
+    def _next(self, bucket_key, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if bucket_key not in self._cursors:
+            self._cursors[bucket_key] = itertools.cycle(entries)
+        return next(self._cursors[bucket_key])
+
+    def replay(self, method: str, path: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._exact:
+                return self._next(key, self._exact[key])
+            route = (method, path)
+            if route in self._by_route:
+                return self._next(route, self._by_route[route])
+            return None
+
+def _record_id(rng: random.Random) -> str:
+    return 'rec' + ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789') for _ in range(14))
+
+def _airtable_record(fields: Dict[str, Any], rng: random.Random, record_id: Optional[str] = None) -> Dict[str, Any]:
+    return {'id': record_id or _record_id(rng), 'createdTime': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()), 'fields': fields or {}}
+
+def create_app(settings: Optional[MockSettings] = None) -> FastAPI:
+    settings = settings or MockSettings()
+    app = FastAPI(title="MigroMat mock services")
+    rng = random.Random(settings.seed)
+    buckets = {name: TokenBucket(settings.rate_limit) for name in UPSTREAMS} if settings.rate_limit > 0 else {}
+    cassette = Cassette(settings.cassette) if settings.cassette else None
+    stats = {name: {'requests': 0, 'errors': 0, 'rate_limited': 0} for name in UPSTREAMS}
+    upstream_client: Dict[str, httpx.AsyncClient] = {}
+
+    if settings.mode in ('record', 'replay') and cassette is None:
+        raise ValueError(f"--mode {settings.mode} needs a cassette path")
+
+    @app.get("/_mock/stats")
+    async def mock_stats():
+        return {'mode': settings.mode, 'services': stats}
+
+    @app.post("/_mock/reset")
+    async def mock_reset():
+        for counters in stats.values():
+            counters.update(requests=0, errors=0, rate_limited=0)
+        return {'message': 'Reset'}
+
+    @app.on_event("shutdown")
+    async def close_upstream():
+        if upstream_client:
+            await upstream_client['client'].aclose()
+
+    async def simulate(service: str) -> Optional[Response]:
+        """Latency, rate limiting and injected failures shared by every mode except record"""
+        delay = settings.latency_ms + (rng.uniform(-settings.jitter_ms, settings.jitter_ms) if settings.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if buckets:
+            wait = buckets[service].take()
+            if wait:
+                stats[service]['rate_limited'] += 1
+                return JSONResponse({'error': {'type': 'rate_limited', 'message': 'Too many requests'}}, status_code=429, headers={'Retry-After': f"{wait:.2f}"})
+        if settings.error_rate and rng.random() < settings.error_rate:
+            stats[service]['errors'] += 1
+            return JSONResponse({'error': {'type': 'server_error', 'message': 'Injected failure'}}, status_code=rng.choice([500, 502, 503]))
+        return None
+
+    def fake(service: str, method: str, path: str, payload: Any) -> Response:
+        parts = path.strip('/').split('/')
+        if service == 'openai':
+            messages = (payload or {}).get('messages') or [{}]
+            prompt = str(messages[-1].get('content', ''))
+            return JSONResponse({
+                'id': f"chatcmpl-{uuid.UUID(int=rng.getrandbits(128)).hex[:24]}", 'object': 'chat.completion', 'model': (payload or {}).get('model', 'mock'),
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': f"Mock response to: {prompt[:60]}"}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': 12, 'total_tokens': len(prompt) // 4 + 12}
+            })
+        if service == 'sendgrid':
+            return Response(status_code=202)
+        # Airtable: /v0/{base}/{table}[/{record_id}]
+        record_id = parts[3] if len(parts) > 3 else None
+        payload = payload or {}
+        if method == 'GET':
+            return JSONResponse(_airtable_record({}, rng, record_id) if record_id else {'records': []})
+        if 'records' in payload:
+            return JSONResponse({'records': [_airtable_record(r.get('fields'), rng) for r in payload['records']]})
+        return JSONResponse(_airtable_record(payload.get('fields'), rng, record_id))
+
+    async def forward(service: str, request: Request, body: bytes) -> Response:
+        if 'client' not in upstream_client:
+            upstream_client['client'] = httpx.AsyncClient(timeout=60)
+        headers = {k: v for k, v in request.headers.items() if k.lower() in ('authorization', 'content-type', 'accept')}
+        url = settings.upstreams[service] + request.url.path + (f"?{request.url.query}" if request.url.query else '')
+        r = await upstream_client['client'].request(request.method, url, content=body, headers=headers)
+        return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get('content-type'))
+
+    @app.api_route("/{prefix}/{path:path}", methods=["GET", "POST", "PATCH", "PUT", "DELETE"])
+    async def handle(prefix: str, path: str, request: Request):
+        service = PREFIXES.get(prefix)
+        if service is None:
+            return JSONResponse({'error': 'Unknown service'}, status_code=404)
+        stats[service]['requests'] += 1
+        body = await request.body()
+        route = request.url.path
+        key = request_key(request.method, route, body)
+
+        if settings.mode == 'record':
+            response = await forward(service, request, body)
+            cassette.record({
+                'key': key, 'method': request.method, 'path': route, 'status': response.status_code,
+                'content_type': response.media_type, 'body': response.body.decode('utf-8', 'replace')
+            })
+            return response
+
+        failure = await simulate(service)
+        if failure is not None:
+            return failure
+        if settings.mode == 'replay':
+            entry = cassette.replay(request.method, route, key)
+            if entry is None:
+                return JSONResponse({'error': f"No recording for {request.method} {route}"}, status_code=501)
+            return Response(content=entry['body'].encode('utf-8'), status_code=entry['status'], media_type=entry.get('content_type'))
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = None
+        return fake(service, request.method, route, payload)
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Airtable/OpenAI/SendGrid server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with a 5xx")
+    parser.add_argument('--rate-limit', type=float, default=0.0, help="requests per second per service before 429s")
+    parser.add_argument('--mode', choices=['mock', 'record', 'replay'], default='mock')
+    parser.add_argument('--cassette', help="JSONL file written in record mode and read in replay mode")
+    parser.add_argument('--seed', type=int, help="seed for latency jitter, injected errors and generated ids")
+    args = parser.parse_args()
+
+    import uvicorn
+    settings = MockSettings(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit, args.mode, args.cassette, args.seed)
+    logger.info(f"🧪 Mock services ({args.mode}) on http://{args.host}:{args.port}")
+    uvicorn.run(create_app(settings), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
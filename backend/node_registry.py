@@ -0,0 +1,182 @@
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'node_types.json')
+MAX_MEMO = 10000
+
+@dataclass(frozen=True)
+class NodeMapping:
+    kind: str
+    n8n_type: Optional[str]
+    make_module: Optional[str]
+    make_version: Optional[int]
+    engine: str = 'generic'
+    codegen: str = 'generic'
+    params: Optional[str] = None
+    aliases: Tuple[str, ...] = ()
+
+@dataclass
+class _Index:
+    """One immutable generation of the registry; swapped wholesale on reload"""
+    version: int
+    generation: str  # hash of the file contents; what caches of derived data key on
+    default: NodeMapping
+    by_key: Dict[str, NodeMapping]
+    by_make_module: Dict[str, NodeMapping]
+    by_make_app: Dict[str, NodeMapping]
+    keywords: Dict[str, List[Tuple[str, str]]]
+    make_parameters: Dict[str, Dict[str, Any]]
+    memo: Dict[Tuple[str, str], str] = field(default_factory=dict)
+
+def normalize_type(node_type: str) -> str:
+    """'n8n-nodes-base.googleSheets' / 'Google Sheets' -> 'googlesheets'"""
+    return re.sub(r'[^a-z0-9]', '', (node_type or '').split('.')[-1].lower())
+
+class NodeRegistry:
+    """Declarative node-type mappings loaded from a data file and indexed by normalized type"""
+
+    def __init__(self, path: str = DEFAULT_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = 0.0
+        self._checked = 0.0
+        self._index = self._load()
+
+    def _load(self) -> _Index:
+        self._mtime = os.path.getmtime(self.path)
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        doc = json.loads(raw)
+
+        default_spec = doc.get('default', {})
+        default = NodeMapping(
+            kind='',
+            n8n_type=None,
+            make_module=default_spec.get('make', {}).get('module'),
+            make_version=default_spec.get('make', {}).get('version'),
+            engine=default_spec.get('engine', 'generic'),
+            codegen=default_spec.get('codegen', 'generic'),
+            params=default_spec.get('params')
+        )
+
+        by_key, by_make_module, by_make_app = {}, {}, {}
+        for kind, spec in doc.get('types', {}).items():
+            make = spec.get('make') or {}
+            mapping = NodeMapping(
+                kind=kind,
+                n8n_type=spec.get('n8n'),
+                make_module=make.get('module'),
+                make_version=make.get('version'),
+                engine=spec.get('engine', default.engine),
+                codegen=spec.get('codegen', default.codegen),
+                params=spec.get('params'),
+                aliases=tuple(spec.get('aliases', []))
+            )
+            by_key[normalize_type(kind)] = mapping
+            for alias in mapping.aliases:
+                by_key.setdefault(normalize_type(alias), mapping)
+            if mapping.n8n_type:
+                by_key.setdefault(normalize_type(mapping.n8n_type), mapping)
+            if mapping.make_module:
+                by_make_module.setdefault(mapping.make_module.lower(), mapping)
+                by_make_app.setdefault(mapping.make_module.split(':')[0].lower(), mapping)
+
+        index = _Index(
+            version=doc.get('version', 0),
+            generation=hashlib.sha256(raw).hexdigest()[:16],
+            default=default,
+            by_key=by_key,
+            by_make_module=by_make_module,
+            by_make_app=by_make_app,
+            keywords={role: [tuple(k) for k in pairs] for role, pairs in doc.get('keywords', {}).items()},
+            make_parameters=doc.get('make_parameters', {})
+        )
+        logger.info(f"Loaded node registry v{index.version}: {len(doc.get('types', {}))} types from {self.path}")
+        return index
+
+    def _current(self) -> _Index:
+        """Return the live index, reloading it when the data file has changed on disk"""
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            try:
+                changed = os.path.getmtime(self.path) != self._mtime
+            except OSError:
+                changed = False
+            if changed:
+                self.reload()
+        return self._index
+
+    def reload(self) -> int:
+        """Re-read the data file; a broken file keeps the previous mappings live"""
+        with self._lock:
+            try:
+                self._index = self._load()
+            except Exception as e:
+                logger.error(f"Node registry reload failed, keeping v{self._index.version}: {e}")
+        return self._index.version
+
+    @property
+    def version(self) -> int:
+        """The data file's declared version, for display"""
+        return self._current().version
+
+    @property
+    def generation(self) -> str:
+        """Changes whenever the loaded mappings do, whether or not the file's version was bumped"""
+        return self._current().generation
+
+    def lookup(self, node_type: str) -> Optional[NodeMapping]:
+        """Exact lookup by normalized type, alias or full n8n type"""
+        return self._current().by_key.get(normalize_type(node_type))
+
+    def resolve(self, node_type: str) -> NodeMapping:
+        return self.lookup(node_type) or self._current().default
+
+    def category(self, role: str, *candidates: str) -> Optional[str]:
+        """Resolve a role ('engine', 'codegen', 'params') for the first candidate that maps to one.
+
+        Exact index hits win; unknown types fall back to the role's keyword list, memoized per type.
+        """
+        index = self._current()
+        default = getattr(index.default, role)
+        for candidate in candidates:
+            mapping = index.by_key.get(normalize_type(candidate))
+            if mapping is not None and getattr(mapping, role) != default:
+                return getattr(mapping, role)
+        for candidate in candidates:
+            if normalize_type(candidate) in index.by_key:
+                continue
+            key = (role, candidate)
+            if key not in index.memo:
+                if len(index.memo) >= MAX_MEMO:
+                    index.memo.clear()
+                lowered = (candidate or '').lower()
+                index.memo[key] = next((value for word, value in index.keywords.get(role, []) if word in lowered), default)
+            if index.memo[key] != default:
+                return index.memo[key]
+        return default
+
+    def kind_for_make_module(self, module: str) -> Optional[str]:
+        index = self._current()
+        module = (module or '').lower()
+        mapping = index.by_make_module.get(module) or index.by_make_app.get(module.split(':')[0])
+        if mapping is None:
+            mapping = index.by_key.get(normalize_type(module.split(':')[0]))
+        return mapping.kind if mapping else None
+
+    def make_parameters(self, template: Optional[str]) -> Dict[str, Any]:
+        return copy.deepcopy(self._current().make_parameters.get(template, {})) if template else {}
+
+NODE_REGISTRY = NodeRegistry(os.getenv('MIGROMAT_NODE_TYPES', DEFAULT_PATH))
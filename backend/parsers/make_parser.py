@@ -13,6 +13,7 @@ class MakeParser:
                 'id': str(i),
                 'name': module.get('module', 'Unknown'),
                 'type': module.get('type', 'unknown'),
+                'module': module.get('module', ''),
                 'parameters': module.get('parameters', {})
             })
         
@@ -0,0 +1,120 @@
+from typing import Dict, Any, List, Optional, Union, Type
+from pydantic import BaseModel, ValidationError, validator, root_validator
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 50
+
+# ============================================================================
+# N8N
+# ============================================================================
+class N8nConnectionTarget(BaseModel):
+    node: str
+    type: str = 'main'
+    index: int = 0
+
+class N8nNode(BaseModel):
+    name: str
+    type: str
+    id: Optional[str] = None
+    typeVersion: Optional[float] = None
+    position: Optional[List[float]] = None
+    parameters: Dict[str, Any] = {}
+    credentials: Dict[str, Any] = {}
+    disabled: bool = False
+
+    @validator('name', 'type')
+    def not_blank(cls, v):
+        if not v.strip():
+            raise ValueError('must not be empty')
+        return v
+
+class N8nWorkflow(BaseModel):
+    name: Optional[str] = None
+    nodes: List[N8nNode]
+    connections: Dict[str, Dict[str, List[Optional[List[N8nConnectionTarget]]]]]
+
+    @root_validator(skip_on_failure=True)
+    def check_graph(cls, values):
+        names = set()
+        for node in values['nodes']:
+            if node.name in names:
+                raise ValueError(f"duplicate node name '{node.name}'")
+            names.add(node.name)
+        for source, outputs in values['connections'].items():
+            if source not in names:
+                raise ValueError(f"connection from unknown node '{source}'")
+            for branches in outputs.values():
+                for branch in branches:
+                    for target in branch or []:
+                        if target.node not in names:
+                            raise ValueError(f"connection from '{source}' to unknown node '{target.node}'")
+        return values
+
+# ============================================================================
+# ZAPIER
+# ============================================================================
+class ZapierStep(BaseModel):
+    app: str
+    action: str = 'Action'  # not Optional: the parser builds step names from it, so null is rejected
+    params: Dict[str, Any] = {}
+
+class ZapierWorkflow(BaseModel):
+    name: Optional[str] = None
+    trigger: ZapierStep
+    steps: List[ZapierStep]
+
+# ============================================================================
+# MAKE.COM
+# ============================================================================
+class MakeRoute(BaseModel):
+    flow: List['MakeModule'] = []
+
+class MakeModule(BaseModel):
+    id: Optional[Union[int, str]] = None
+    module: str
+    version: Optional[int] = None
+    parameters: Dict[str, Any] = {}
+    mapper: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = {}
+    routes: List[MakeRoute] = []
+
+MakeRoute.update_forward_refs()
+
+class MakeWorkflow(BaseModel):
+    name: Optional[str] = None
+    flow: Optional[List[MakeModule]] = None
+    modules: Optional[List[MakeModule]] = None
+    scenario: Optional[Dict[str, Any]] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_modules(cls, values):
+        if values.get('flow') is None and values.get('modules') is None and values.get('scenario') is None:
+            raise ValueError("one of 'flow', 'modules' or 'scenario' is required")
+        return values
+
+# Models are compiled by pydantic when the classes above are created, i.e. once at import
+SCHEMAS: Dict[str, Type[BaseModel]] = {'n8n': N8nWorkflow, 'zapier': ZapierWorkflow, 'make': MakeWorkflow}
+
+def validate_workflow(platform: str, data: Any) -> List[Dict[str, Any]]:
+    """Validate an export against its platform schema, returning structured errors (empty when valid)"""
+    schema = SCHEMAS.get(platform)
+    if schema is None:
+        return [{'loc': '', 'message': f'Unsupported platform: {platform}', 'type': 'value_error.platform'}]
+    if not isinstance(data, dict):
+        return [{'loc': '', 'message': 'Workflow must be a JSON object', 'type': 'type_error.dict'}]
+    try:
+        schema.parse_obj(data)
+    except ValidationError as e:
+        errors = [
+            {
+                'loc': '.'.join(str(p) for p in err['loc'] if p != '__root__'),
+                'message': err['msg'],
+                'type': err['type']
+            }
+            for err in e.errors()[:MAX_REPORTED_ERRORS]
+        ]
+        logger.info(f"Rejected {platform} workflow with {len(errors)} schema errors")
+        return errors
+    return []
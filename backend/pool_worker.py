@@ -0,0 +1,194 @@
+"""Long-lived interpreter for InterpreterPool; runs one script at a time in a fresh namespace.
+
+Frames on the protocol pipes are a 4-byte big-endian length followed by a JSON object.
+The parent sends {"code", "name", "cpu_seconds"}; while the script runs the worker sends
+{"stream": "stdout"|"stderr", "text"} frames as lines are written, then {"exit_code"}.
+"""
+import builtins
+import contextlib
+import importlib
+import io
+import json
+import os
+import struct
+import sys
+import threading
+import traceback
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Imported once per worker instead of once per run
+PRELOAD = ['json', 'asyncio', 'httpx', 'dotenv', 'requests', 'migromat_runtime', 'migromat_runtime.sync', 'migromat_runtime.aio']
+
+# Runtime modules whose globals and classes are put back before every run
+RUNTIME = ['migromat_runtime', 'migromat_runtime.sync', 'migromat_runtime.aio']
+SYS_ATTRS = ['exit', 'stdin', 'stdout', 'stderr', 'excepthook', 'displayhook', 'argv', 'path']
+
+def read_frame(stream):
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (size,) = struct.unpack('>I', header)
+    return json.loads(stream.read(size))
+
+def write_frame(stream, message):
+    body = json.dumps(message).encode('utf-8')
+    stream.write(struct.pack('>I', len(body)) + body)
+    stream.flush()
+
+class FrameWriter(io.TextIOBase):
+    """Text stream that forwards complete lines to the parent as output frames"""
+
+    def __init__(self, name: str, proto_out, lock: threading.Lock):
+        self.name, self.proto_out, self.lock, self.buffer, self.done = name, proto_out, lock, '', False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self.lock:
+            if self.done:  # threads the script left running must not interleave with the next run
+                return len(text)
+            self.buffer += text
+            if '\n' in self.buffer:
+                cut = self.buffer.rindex('\n') + 1
+                write_frame(self.proto_out, {'stream': self.name, 'text': self.buffer[:cut]})
+                self.buffer = self.buffer[cut:]
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            if self.buffer and not self.done:
+                write_frame(self.proto_out, {'stream': self.name, 'text': self.buffer})
+            self.buffer = ''
+
+    def finish(self):
+        self.flush()
+        with self.lock:
+            self.done = True
+
+def cpu_budget(seconds):
+    """Let this run use `seconds` more CPU time; the kernel sends SIGXCPU past it (None lifts the budget)"""
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = hard
+    if seconds is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(usage.ru_utime + usage.ru_stime) + 1 + seconds
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def restore_dict(target: dict, snapshot: dict):
+    for key in [k for k in target if k not in snapshot]:
+        del target[key]
+    for key, value in snapshot.items():
+        if target.get(key, snapshot) is not value:
+            target[key] = value
+
+class Baseline:
+    """Interpreter state right after preloading, restored before each run.
+
+    Scripts share one interpreter, so anything a script patches (builtins, sys.exit, os.environ,
+    runtime Config) or leaves queued (api batchers, open clients) would otherwise reach the next run.
+    """
+
+    def __init__(self):
+        self.builtins = dict(vars(builtins))
+        self.sys = {name: getattr(sys, name) for name in SYS_ATTRS}
+        self.path = list(sys.path)
+        self.environ = dict(os.environ)
+        self.modules = {name: (sys.modules[name], dict(vars(sys.modules[name]))) for name in RUNTIME if name in sys.modules}
+        self.classes = [(value, dict(vars(value))) for name, (_, snapshot) in self.modules.items()
+                        for value in snapshot.values() if isinstance(value, type) and value.__module__ == name]
+
+    def restore(self):
+        restore_dict(vars(builtins), self.builtins)
+        for name, value in self.sys.items():
+            setattr(sys, name, value)
+        sys.path[:] = self.path
+        if dict(os.environ) != self.environ:
+            os.environ.clear()
+            os.environ.update(self.environ)
+
+        # The last run's api objects hold its pending batches (and their timers), cookies and connections
+        for name, (module, _) in self.modules.items():
+            close = getattr(vars(module).get('api'), 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+        for name, (module, snapshot) in self.modules.items():
+            sys.modules[name] = module
+            restore_dict(vars(module), snapshot)
+        for cls, snapshot in self.classes:
+            for key in [k for k in vars(cls) if k not in snapshot]:
+                delattr(cls, key)
+            for key, value in snapshot.items():
+                if key not in ('__dict__', '__weakref__') and vars(cls).get(key, snapshot) is not value:
+                    setattr(cls, key, value)
+        for module, _ in self.modules.values():
+            if 'api' in vars(module):
+                module.api = module.API()
+
+def run_script(code: str, name: str, proto_out, lock: threading.Lock) -> int:
+    stdout, stderr = FrameWriter('stdout', proto_out, lock), FrameWriter('stderr', proto_out, lock)
+    namespace = {'__name__': '__main__', '__file__': name, '__builtins__': builtins}
+    cwd, argv = os.getcwd(), sys.argv
+    sys.argv = [name]
+    exit_code = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            exec(compile(code, name, 'exec'), namespace)
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException as e:
+            traceback.print_exception(type(e), e, e.__traceback__.tb_next)  # hide this frame
+            exit_code = 1
+    stdout.finish()
+    stderr.finish()
+    sys.argv = argv
+    os.chdir(cwd)
+    return exit_code
+
+def main():
+    # Keep the protocol on private descriptors so scripts cannot read or corrupt it
+    proto_in = os.fdopen(os.dup(0), 'rb')
+    proto_out = os.fdopen(os.dup(1), 'wb')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    lock = threading.Lock()
+
+    for module in PRELOAD:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    baseline = Baseline()
+    write_frame(proto_out, {'ready': True, 'pid': os.getpid()})
+
+    while True:
+        job = read_frame(proto_in)
+        if job is None:
+            return
+        baseline.restore()
+        cpu_budget(job.get('cpu_seconds'))
+        exit_code = run_script(job['code'], job.get('name', '<script>'), proto_out, lock)
+        cpu_budget(None)
+        with lock:
+            write_frame(proto_out, {'exit_code': exit_code})
+
+if __name__ == '__main__':
+    main()
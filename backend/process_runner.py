@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional, Union, Any, Tuple, AsyncIterator, Callable, Awaitable
+from dataclasses import dataclass
+import asyncio
+import codecs
+import os
+import signal
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ProcessResult:
+    returncode: int
+    stdout: str
+    stderr: str
+
+@dataclass
+class ExitStatus:
+    returncode: Optional[int]  # None when the process was killed for a timeout or runaway output
+    timed_out: bool = False
+    truncated: bool = False
+    queue_wait: float = 0.0  # seconds spent waiting for an execution slot
+
+# ('stdout' | 'stderr', text) while the process runs, then ('exit', ExitStatus); other kinds are progress notices
+OutputEvent = Tuple[str, Any]
+
+def describe_signal(signum: int) -> str:
+    if signum == getattr(signal, 'SIGXCPU', None):
+        return 'CPU time limit exceeded'
+    try:
+        return f'Killed by {signal.Signals(signum).name}'
+    except ValueError:
+        return f'Killed by signal {signum}'
+
+def kill_tree(proc: asyncio.subprocess.Process):
+    """Kill a process and everything it started; processes run in their own session on POSIX"""
+    if proc.returncode is not None:
+        return
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+async def run_process(args: Union[str, List[str]], timeout: float, shell: bool = False, env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None, max_bytes: Optional[int] = None) -> ProcessResult:
+    """Async counterpart of subprocess.run(capture_output=True, text=True) that never blocks the event loop.
+
+    Raises asyncio.TimeoutError after killing the process tree when timeout expires; output past
+    max_bytes is dropped and the process killed (returncode -9, as for SIGKILL).
+    """
+    return await result_of(stream_process(args, timeout, max_bytes, shell=shell, env=env, cwd=cwd))
+
+async def result_of(events: AsyncIterator[OutputEvent]) -> ProcessResult:
+    """Collect an output stream into a ProcessResult, with run_process's timeout and truncation semantics"""
+    stdout, stderr, status = await collect_output(events)
+    if status.timed_out:
+        raise asyncio.TimeoutError()
+    return ProcessResult(-9 if status.truncated else status.returncode, stdout, stderr)
+
+async def collect_output(events: AsyncIterator[OutputEvent]) -> Tuple[str, str, ExitStatus]:
+    out = {'stdout': [], 'stderr': []}
+    status = ExitStatus(None)
+    async for kind, payload in events:
+        if kind == 'exit':
+            status = payload
+        elif kind in out:
+            out[kind].append(payload)
+    return ''.join(out['stdout']), ''.join(out['stderr']), status
+
+async def limit_output(events: AsyncIterator[OutputEvent], timeout: float, max_bytes: Optional[int], kill: Callable[[], Awaitable[None]]) -> AsyncIterator[OutputEvent]:
+    """Pass output events through, killing the source once the deadline passes or max_bytes have been sent"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    sent = 0
+    while True:
+        try:
+            kind, payload = await asyncio.wait_for(events.__anext__(), max(deadline - loop.time(), 0))
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            await kill()
+            yield 'exit', ExitStatus(None, timed_out=True)
+            return
+        if kind == 'exit' or max_bytes is None:
+            yield kind, payload
+            continue
+        data = payload.encode('utf-8')
+        if sent + len(data) > max_bytes:
+            keep = data[:max_bytes - sent].decode('utf-8', 'ignore')
+            if keep:
+                yield kind, keep
+            yield 'stderr', f"\n[output truncated at {max_bytes} bytes]\n"
+            await kill()
+            yield 'exit', ExitStatus(None, truncated=True)
+            return
+        sent += len(data)
+        yield kind, payload
+
+async def _process_events(proc: asyncio.subprocess.Process) -> AsyncIterator[OutputEvent]:
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump(name: str, reader: asyncio.StreamReader):
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        while True:
+            chunk = await reader.read(65536)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                await queue.put((name, text))
+            if not chunk:
+                break
+        await queue.put(None)
+
+    pumps = [asyncio.ensure_future(pump('stdout', proc.stdout)), asyncio.ensure_future(pump('stderr', proc.stderr))]
+    try:
+        open_streams = len(pumps)
+        while open_streams:
+            item = await queue.get()
+            if item is None:
+                open_streams -= 1
+            else:
+                yield item
+        returncode = await proc.wait()
+        if returncode < 0:
+            yield 'stderr', describe_signal(-returncode) + '\n'
+        yield 'exit', ExitStatus(returncode)
+    finally:
+        for task in pumps:
+            task.cancel()
+
+async def stream_process(args: Union[str, List[str]], timeout: float, max_bytes: Optional[int] = None, shell: bool = False, env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None) -> AsyncIterator[OutputEvent]:
+    """Run a process and yield its output as it is produced; the last event is ('exit', ExitStatus)"""
+    spawn = asyncio.create_subprocess_shell if shell else asyncio.create_subprocess_exec
+    argv = [args] if shell else list(args)
+    proc = await spawn(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, stdin=asyncio.subprocess.DEVNULL,
+        env={**(env or os.environ), 'PYTHONUNBUFFERED': '1'}, cwd=cwd, start_new_session=hasattr(os, 'killpg')
+    )
+
+    async def kill():
+        kill_tree(proc)
+        await proc.wait()
+
+    try:
+        async for event in limit_output(_process_events(proc), timeout, max_bytes, kill):
+            yield event
+    finally:
+        kill_tree(proc)  # client went away mid-run
@@ -0,0 +1,29 @@
+"""Apply resource limits, then exec a command in their place.
+
+    python rlimit_exec.py CPU_SECONDS MEMORY_BYTES OPEN_FILES -- command [args...]
+
+Sandboxed processes are started through this instead of a preexec_fn, which is unsafe in a
+parent that runs threads: the limits are set here, in a fresh single-threaded interpreter, just
+before the exec. A negative value leaves that limit as it is.
+"""
+import os
+import resource
+import sys
+
+LIMITS = (resource.RLIMIT_CPU, resource.RLIMIT_AS, resource.RLIMIT_NOFILE)
+
+def main(argv):
+    split = argv.index('--')
+    for which, value in zip(LIMITS, argv[:split]):
+        soft = int(value)
+        if soft < 0:
+            continue
+        _, hard = resource.getrlimit(which)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(which, (soft, hard))
+    command = argv[split + 1:]
+    os.execvp(command[0], command)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RunDispatcher:
+    """Bounded queue of triggered workflow runs (webhooks, schedules) drained by a fixed set of worker tasks.
+
+    submit() never waits: it raises asyncio.QueueFull when the backlog is at capacity, and
+    returns a future resolved when the run finishes, for callers that answer synchronously.
+    """
+
+    def __init__(self, workers: int, max_queued: int):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.accepted = 0
+        self.rejected = 0
+        self.completed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.max_queued)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        logger.info(f"Run dispatcher ready: {self.workers} workers")
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, run: Callable[..., Awaitable[None]], *args) -> asyncio.Future:
+        if self._queue is None:  # nothing would drain a queue created here
+            raise RuntimeError("Run dispatcher is not started")
+        done = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((run, args, done))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+        self.accepted += 1
+        return done
+
+    async def _work(self):
+        while True:
+            run, args, done = await self._queue.get()
+            try:
+                await run(*args)
+            except Exception as e:
+                logger.error(f"Triggered run failed: {e}")
+            finally:
+                self.completed += 1
+                if not done.done():
+                    done.set_result(None)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers, 'queued': self._queue.qsize() if self._queue else 0, 'max_queued': self.max_queued,
+            'accepted': self.accepted, 'completed': self.completed, 'rejected': self.rejected
+        }
@@ -0,0 +1,117 @@
+from typing import Dict, Any, Optional, List, AsyncIterator
+from dataclasses import dataclass
+import asyncio
+import itertools
+import os
+import sys
+import time
+import logging
+
+try:
+    import resource
+except ImportError:  # Windows: wall-clock timeouts and the output cap still apply
+    resource = None
+
+from process_runner import OutputEvent
+
+logger = logging.getLogger(__name__)
+
+# An admitted request starts its stream within moments; a reservation older than this was
+# abandoned (the handler failed or the client left before streaming began) and is dropped
+RESERVATION_TTL = 30.0
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rlimit_exec.py')
+
+@dataclass
+class Limits:
+    cpu_seconds: int
+    memory_bytes: int
+    open_files: int
+    output_bytes: int
+
+def limited_command(args: List[str], limits: Limits, cpu: bool = True) -> List[str]:
+    """`args` run through rlimit_exec.py, which applies the limits and execs them; unchanged where rlimits are unavailable.
+
+    Long-lived pool workers pass cpu=False and set their CPU budget per run instead.
+    """
+    if resource is None:
+        return list(args)
+    values = [limits.cpu_seconds if cpu else -1, limits.memory_bytes, limits.open_files]
+    return [sys.executable, '-I', '-S', LAUNCHER, *map(str, values), '--', *args]
+
+class QueueFull(Exception):
+    pass
+
+class ExecutionPool:
+    """Global cap on concurrently running user code, with a bounded FIFO queue in front of it"""
+
+    def __init__(self, max_running: int, max_queued: int):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.reserved: Dict[int, float] = {}  # token -> admission time, for requests whose streams have not started yet
+        self._tokens = itertools.count()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def admit(self) -> int:
+        """Reject up front when the queue is full so callers can answer 503 before streaming starts.
+
+        Admission reserves a place, returned as a token, that the request's gated() stream takes over
+        when it starts, so concurrent requests admitted before any of them streams still count against the limit.
+        """
+        now = time.monotonic()
+        for token, admitted in list(self.reserved.items()):  # oldest first
+            if now - admitted <= RESERVATION_TTL:
+                break
+            del self.reserved[token]
+        if self.running + self.queued + len(self.reserved) >= self.max_running + self.max_queued:
+            self.rejected += 1
+            raise QueueFull(f"{self.queued + len(self.reserved)} executions already queued")
+        token = next(self._tokens)
+        self.reserved[token] = now
+        return token
+
+    async def gated(self, events: AsyncIterator[OutputEvent], token: Optional[int] = None) -> AsyncIterator[OutputEvent]:
+        """Run an output stream once a slot is free, taking over the reservation `token` from admit().
+
+        Yields ('queued', position) while waiting; the queue wait is reported on the exit status.
+        The wrapped stream must not start its process before it is first iterated.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running)
+        self.reserved.pop(token, None)
+        started = time.monotonic()
+        if self._slots.locked():
+            self.queued += 1
+            try:
+                yield 'queued', self.queued
+                await self._slots.acquire()
+            finally:
+                self.queued -= 1
+        else:
+            await self._slots.acquire()
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.running += 1
+        try:
+            async for kind, payload in events:
+                if kind == 'exit':
+                    payload.queue_wait = waited
+                yield kind, payload
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running, 'queued': self.queued, 'reserved': len(self.reserved), 'max_running': self.max_running, 'max_queued': self.max_queued,
+            'completed': self.completed, 'rejected': self.rejected,
+            'avg_wait_ms': round(1000 * self.total_wait / self.completed, 1) if self.completed else 0.0,
+            'max_wait_ms': round(1000 * self.max_wait, 1)
+        }
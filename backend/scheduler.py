@@ -0,0 +1,418 @@
+"""Timer-heap scheduler for n8n scheduleTrigger/cron workflows.
+
+One task sleeps until the earliest due entry of a heap shared by every schedule, so the cost
+per schedule is a heap entry, not a polling task. Each fire gets a random delay bounded by a
+tenth of the schedule's period (at most max_jitter) to spread runs due on the same second.
+
+The last nominal fire time of each schedule is persisted, keyed by workflow content hash and
+trigger, so re-uploading a workflow after a restart runs one catch-up for the fires it missed.
+"""
+from typing import Dict, Any, Optional, List, Tuple, Set, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import asyncio
+import bisect
+import heapq
+import json
+import os
+import random
+import time
+import logging
+
+from node_registry import normalize_type
+from workflow_engine import CompiledPlan
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_TYPES = {'scheduletrigger', 'cron'}
+OVERLAP_POLICIES = ('skip', 'coalesce')
+FIRE_BATCH = 256
+
+class CronError(ValueError):
+    pass
+
+MONTHS = {name: i for i, name in enumerate(['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+WEEKDAYS = {name: i for i, name in enumerate(['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'])}
+
+def _parse_field(text: str, lo: int, hi: int, names: Dict[str, int]) -> List[int]:
+    def value(token: str) -> int:
+        token = token.strip().lower()
+        if token in names:
+            return names[token]
+        if not token.isdigit():
+            raise CronError(f"Invalid cron value: {token!r}")
+        return int(token)
+
+    values: Set[int] = set()
+    for part in text.split(','):
+        step, stepped = 1, '/' in part
+        if stepped:
+            part, step_text = part.split('/', 1)
+            step = value(step_text)
+            if step < 1:
+                raise CronError(f"Invalid cron step: {step_text!r}")
+        if part in ('*', '?'):
+            start, end = lo, hi
+        elif '-' in part:
+            start, end = (value(v) for v in part.split('-', 1))
+        else:
+            start = value(part)
+            end = hi if stepped else start
+        if start < lo or end > hi or start > end:
+            raise CronError(f"Cron field {text!r} out of range {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+class CronSchedule:
+    """Standard 5-field cron expression, or 6 fields with leading seconds.
+
+    Day of month and day of week are OR-ed when both are restricted, as in Vixie cron.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) == 5:
+            fields = ['0'] + fields
+        if len(fields) != 6:
+            raise CronError(f"Cron expression needs 5 or 6 fields: {expression!r}")
+        self.seconds = _parse_field(fields[0], 0, 59, {})
+        self.minutes = _parse_field(fields[1], 0, 59, {})
+        self.hours = _parse_field(fields[2], 0, 23, {})
+        self.days = _parse_field(fields[3], 1, 31, {})
+        self.months = _parse_field(fields[4], 1, 12, MONTHS)
+        self.weekdays = sorted({d % 7 for d in _parse_field(fields[5], 0, 7, WEEKDAYS)})  # 7 is Sunday too
+        self._days_any = fields[3] in ('*', '?')
+        self._weekdays_any = fields[5] in ('*', '?')
+
+    def _day_matches(self, t: datetime) -> bool:
+        in_month = t.day in self.days
+        in_week = (t.weekday() + 1) % 7 in self.weekdays
+        if self._days_any or self._weekdays_any:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching time strictly after `after`"""
+        t = after.replace(microsecond=0) + timedelta(seconds=1)
+        limit = after + timedelta(days=366 * 5)
+        while t <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0, second=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                i = bisect.bisect_right(self.hours, t.hour)
+                t = t.replace(hour=self.hours[i], minute=0, second=0) if i < len(self.hours) else t.replace(hour=0, minute=0, second=0) + timedelta(days=1)
+            elif t.minute not in self.minutes:
+                i = bisect.bisect_right(self.minutes, t.minute)
+                t = t.replace(minute=self.minutes[i], second=0) if i < len(self.minutes) else t.replace(minute=0, second=0) + timedelta(hours=1)
+            elif t.second not in self.seconds:
+                i = bisect.bisect_right(self.seconds, t.second)
+                t = t.replace(second=self.seconds[i]) if i < len(self.seconds) else t.replace(second=0) + timedelta(minutes=1)
+            else:
+                return t
+        raise CronError(f"Cron expression never fires: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"cron({self.expression})"
+
+class IntervalSchedule:
+    """Every `seconds`, counted from the previous fire"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise CronError(f"Interval must be positive: {seconds}")
+        self.seconds = seconds
+
+    def next_after(self, after: datetime) -> datetime:
+        return after + timedelta(seconds=self.seconds)
+
+    def __repr__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+def _int(params: Dict[str, Any], key: str, default: int) -> int:
+    try:
+        return int(params.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+def _schedule_trigger_rule(item: Dict[str, Any]):
+    """One entry of scheduleTrigger's rule.interval list"""
+    field = item.get('field', 'days')
+    minute, hour = _int(item, 'triggerAtMinute', 0), _int(item, 'triggerAtHour', 0)
+    if field == 'cronExpression':
+        return CronSchedule(str(item.get('expression', '')))
+    if field == 'seconds':
+        return IntervalSchedule(_int(item, 'secondsInterval', 30))
+    if field == 'minutes':
+        return CronSchedule(f"*/{_int(item, 'minutesInterval', 5)} * * * *")
+    if field == 'hours':
+        return CronSchedule(f"{minute} */{_int(item, 'hoursInterval', 1)} * * *")
+    if field == 'days':
+        n = _int(item, 'daysInterval', 1)
+        return CronSchedule(f"{minute} {hour} {'*/' + str(n) if n > 1 else '*'} * *")
+    if field == 'weeks':
+        # weeksInterval > 1 has no cron equivalent; such rules fire weekly
+        days = item.get('triggerAtDay') or [0]
+        try:
+            weekdays = ','.join(str(int(d)) for d in days)
+        except (TypeError, ValueError):
+            raise CronError(f"Invalid weekdays: {days!r}")
+        return CronSchedule(f"{minute} {hour} * * {weekdays}")
+    if field == 'months':
+        n = _int(item, 'monthsInterval', 1)
+        return CronSchedule(f"{minute} {hour} {_int(item, 'triggerAtDayOfMonth', 1)} {'*/' + str(n) if n > 1 else '*'} *")
+    raise CronError(f"Unsupported schedule field: {field!r}")
+
+def _cron_node_rule(item: Dict[str, Any]):
+    """One entry of the legacy Cron node's triggerTimes.item list"""
+    mode = item.get('mode', 'everyDay')
+    minute, hour = _int(item, 'minute', 0), _int(item, 'hour', 0)
+    if mode == 'everyMinute':
+        return CronSchedule("* * * * *")
+    if mode == 'everyHour':
+        return CronSchedule(f"{minute} * * * *")
+    if mode == 'everyDay':
+        return CronSchedule(f"{minute} {hour} * * *")
+    if mode == 'everyWeek':
+        return CronSchedule(f"{minute} {hour} * * {_int(item, 'weekday', 1)}")
+    if mode == 'everyMonth':
+        return CronSchedule(f"{minute} {hour} {_int(item, 'dayOfMonth', 1)} * *")
+    if mode == 'everyX':
+        unit = {'minutes': 60, 'hours': 3600}.get(item.get('unit', 'hours'), 3600)
+        return IntervalSchedule(_int(item, 'value', 2) * unit)
+    if mode == 'custom':
+        return CronSchedule(str(item.get('cronExpression', '')))
+    raise CronError(f"Unsupported cron mode: {mode!r}")
+
+def find_schedules(parsed: Dict[str, Any]) -> Tuple[Optional[int], List[Tuple[str, Any]]]:
+    """(index of the schedule trigger step, [(rule name, schedule)]) for a parsed n8n workflow"""
+    for i, step in enumerate(parsed['steps']):
+        kind = normalize_type(step.get('type', ''))
+        if kind not in TRIGGER_TYPES:
+            continue
+        params = step.get('parameters') or {}
+        if kind == 'scheduletrigger':
+            items, rule = (params.get('rule') or {}).get('interval') or [{}], _schedule_trigger_rule
+        else:
+            items, rule = (params.get('triggerTimes') or {}).get('item') or [{}], _cron_node_rule
+        return i, [(f"{step['name']}#{n}", rule(item)) for n, item in enumerate(items)]
+    return None, []
+
+@dataclass
+class ScheduledJob:
+    key: str
+    workflow_id: str
+    trigger: str
+    schedule: Any
+    compiled: CompiledPlan
+    jitter: float
+    next_run: Optional[datetime] = None  # nominal time, before jitter
+    last_run: Optional[datetime] = None
+    seq: int = 0
+    running: bool = False
+    pending: bool = False
+    runs: int = 0
+    skipped: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'workflow_id': self.workflow_id, 'trigger': self.trigger, 'schedule': repr(self.schedule),
+            'next_run': self.next_run.isoformat() if self.next_run else None, 'last_run': self.last_run.isoformat() if self.last_run else None,
+            'running': self.running, 'runs': self.runs, 'skipped': self.skipped, 'coalesced': self.coalesced, 'dropped': self.dropped
+        }
+
+class Scheduler:
+    """Fires registered schedules through `launch(job, nominal_time)`, which returns a future
+    resolved when the run finishes (or raises asyncio.QueueFull).
+
+    A schedule due while its previous run is still going is skipped, or with overlap='coalesce'
+    runs once more when the previous run finishes however many fires it missed.
+    """
+
+    def __init__(self, launch: Callable[[ScheduledJob, datetime], asyncio.Future], state_path: Optional[str] = None,
+                 overlap: str = 'skip', max_jitter: float = 5.0, catchup_window: float = 86400, flush_interval: float = 5.0):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"overlap must be one of {OVERLAP_POLICIES}")
+        self.launch = launch
+        self.state_path = state_path
+        self.overlap = overlap
+        self.max_jitter = max_jitter
+        self.catchup_window = catchup_window
+        self.flush_interval = flush_interval
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.by_workflow: Dict[str, List[str]] = {}
+        self.fired = 0
+        self.caught_up = 0
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._rng = random.Random()
+        self._state: Dict[str, str] = self._load_state()
+        self._dirty = False
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _load_state(self) -> Dict[str, str]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable schedule state {self.state_path}: {e}")
+            return {}
+        horizon = (datetime.now() - timedelta(seconds=self.catchup_window)).isoformat()
+        return {k: v for k, v in state.items() if v >= horizon}
+
+    def _flush(self):
+        if not (self.state_path and self._dirty):
+            return
+        self._dirty = False
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f)
+        os.replace(tmp, self.state_path)
+
+    def register(self, workflow_id: str, content_hash: str, parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Schedule the workflow's trigger rules; empty when it has no schedule trigger"""
+        index, rules = find_schedules(parsed)
+        if index is None:
+            return []
+        compiled = CompiledPlan(parsed['steps'][:index] + parsed['steps'][index + 1:], trigger=parsed['steps'][index]['name'])
+        now = datetime.now()
+        keys = []
+        for trigger, schedule in rules:
+            first = schedule.next_after(now)
+            period = (schedule.next_after(first) - first).total_seconds()
+            job = ScheduledJob(f"{content_hash}:{trigger}", workflow_id, trigger, schedule, compiled, min(self.max_jitter, period / 10))
+            if job.key in self.jobs:  # same document uploaded twice: the newer upload owns the schedule
+                self._drop(self.jobs[job.key])
+            last = self._state.get(job.key)
+            missed = schedule.next_after(datetime.fromisoformat(last)) if last else None
+            if missed is not None and missed <= now and (now - missed).total_seconds() <= self.catchup_window:
+                self.caught_up += 1
+                first = missed  # already due: fires once right away, then resumes from now
+            self.jobs[job.key] = job
+            keys.append(job.key)
+            self._push(job, first)
+        self.by_workflow[workflow_id] = keys
+        return [{'trigger': self.jobs[k].trigger, 'schedule': repr(self.jobs[k].schedule), 'next_run': self.jobs[k].next_run.isoformat()} for k in keys]
+
+    def _drop(self, job: ScheduledJob):
+        self.jobs.pop(job.key, None)
+        keys = self.by_workflow.get(job.workflow_id)
+        if keys and job.key in keys:
+            keys.remove(job.key)
+
+    def unregister(self, workflow_id: str):
+        # Heap entries of removed jobs are discarded when they come due, or here once they dominate the heap
+        for key in self.by_workflow.pop(workflow_id, []):
+            self.jobs.pop(key, None)
+        if len(self._heap) > 2 * len(self.jobs) + 1024:
+            self._heap = [entry for entry in self._heap if entry[2] in self.jobs and self.jobs[entry[2]].seq == entry[1]]
+            heapq.heapify(self._heap)
+
+    def _push(self, job: ScheduledJob, nominal: datetime):
+        self._seq += 1
+        job.seq, job.next_run = self._seq, nominal
+        due = nominal.timestamp() + (self._rng.uniform(0, job.jitter) if job.jitter else 0)
+        heapq.heappush(self._heap, (due, job.seq, job.key))
+        if self._wake is not None and self._heap[0][1] == job.seq:
+            self._wake.set()
+
+    async def start(self):
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()), asyncio.create_task(self._flush_periodically())]
+        logger.info(f"Scheduler ready: {len(self.jobs)} schedules")
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self._flush()
+            except OSError as e:
+                logger.error(f"Could not save schedule state: {e}")
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            batch = 0
+            while self._heap and self._heap[0][0] <= now and batch < FIRE_BATCH:
+                batch += 1
+                _, seq, key = heapq.heappop(self._heap)
+                job = self.jobs.get(key)
+                if job is None or job.seq != seq:
+                    continue
+                nominal = job.next_run
+                self._fire(job, nominal)
+                upcoming = job.schedule.next_after(nominal)
+                if upcoming <= datetime.now():
+                    # Resume from the present rather than replaying every slot missed while the loop was busy
+                    upcoming = job.schedule.next_after(datetime.now())
+                self._push(job, upcoming)
+            if batch == FIRE_BATCH:
+                await asyncio.sleep(0)  # let requests through between batches when many schedules are due at once
+                continue
+            self._wake.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, job: ScheduledJob, nominal: datetime):
+        self.fired += 1
+        self._state[job.key] = nominal.isoformat()
+        self._dirty = True
+        if job.running:
+            if self.overlap == 'coalesce':
+                job.pending = True
+                job.coalesced += 1
+            else:
+                job.skipped += 1
+            return
+        self._launch(job, nominal)
+
+    def _launch(self, job: ScheduledJob, nominal: datetime):
+        try:
+            done = self.launch(job, nominal)
+        except asyncio.QueueFull:
+            job.dropped += 1
+            logger.warning(f"Run queue full, dropped scheduled run of {job.workflow_id} ({job.trigger})")
+            return
+        job.running = True
+        job.runs += 1
+        job.last_run = nominal
+        done.add_done_callback(lambda _: self._finished(job))
+
+    def _finished(self, job: ScheduledJob):
+        job.running = False
+        if job.pending and self.jobs.get(job.key) is job:
+            job.pending = False
+            self._launch(job, datetime.now())
+
+    def list(self, limit: int, workflow_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        keys = self.by_workflow.get(workflow_id, []) if workflow_id else self.jobs.keys()
+        out = []
+        for key in keys:
+            if len(out) == limit:
+                break
+            out.append(self.jobs[key].summary())
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'schedules': len(self.jobs), 'heap': len(self._heap), 'fired': self.fired, 'caught_up': self.caught_up,
+            'running': sum(1 for job in self.jobs.values() if job.running), 'overlap': self.overlap
+        }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Run from the repo root or from backend/: modules import each other as top-level names
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import main
+from workflow_engine import WorkflowExecution
+
+FIELDS = 'id,status,logs'
+
+def test_unchanged_status_answers_304_on_the_next_poll(monkeypatch):
+    ex = WorkflowExecution(id='run', workflow_id='wf', status='running', started_at=datetime.now())
+    ex.add_log('info', 'Starting')
+    monkeypatch.setitem(main.executions, 'run', ex)
+    client = TestClient(main.app)
+
+    first = client.get(f'/api/executions/run?since=0&fields={FIELDS}', headers={'Origin': 'http://localhost:5173'})
+    assert 'etag' in first.headers['access-control-expose-headers'].lower()
+    cursor, etag = first.json()['log_cursor'], first.headers['ETag']
+
+    assert client.get(f'/api/executions/run?since={cursor}&fields={FIELDS}', headers={'If-None-Match': etag}).status_code == 304
+    ex.add_log('info', 'Step done')
+    changed = client.get(f'/api/executions/run?since={cursor}&fields={FIELDS}', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert [log['message'] for log in changed.json()['logs']] == ['Step done']
@@ -0,0 +1,60 @@
+import math
+
+import pytest
+
+from expressions import ExpressionContext, ExpressionError, compile_template, to_make_mapping
+
+MODULES = {'Start': 1}
+
+@pytest.mark.parametrize('template, expected', [
+    ('={{ $json.user.email }}', '{{2.user.email}}'),
+    ('=Hi {{ $json.tags[0] }}', 'Hi {{2.tags[1]}}'),
+    ('={{ $node["Start"].json.id }}', '{{1.id}}'),
+    ('={{ $("Start").item.json.id }}', '{{1.id}}'),
+    ('={{ $("Start").first().json.id }}', '{{1.id}}'),
+])
+def test_make_mapping_of_plain_paths(template, expected):
+    assert to_make_mapping(template, 2, MODULES) == expected
+
+@pytest.mark.parametrize('template', [
+    '={{ "x" + $json.name }}',
+    '={{ $json.a || $json.b }}',
+    '={{ $json.ok ? $json.a : $json.b }}',
+    '={{ !$json.a }}',
+    '={{ $json.name.toUpperCase() }}',
+    '={{ $("Start").last().json.id }}',
+])
+def test_make_mapping_refuses_compound_expressions(template):
+    assert to_make_mapping(template, 2, MODULES) is None
+
+@pytest.mark.parametrize('template', ['={{ "a".padStart(1e10) }}', '={{ "a".padEnd(20000, "-") }}', '={{ (1).toFixed(1e9) }}'])
+def test_unbounded_widths_are_rejected(template):
+    with pytest.raises(ExpressionError):
+        compile_template(template)(ExpressionContext({}))
+
+def test_padding_within_limit():
+    assert compile_template('={{ $json.n.padStart(4, "0") }}')(ExpressionContext({'n': '7'})) == '0007'
+
+@pytest.mark.parametrize('template', ['={{ ' + '!' * 3000 + '1 }}', '={{ ' + '-' * 3000 + '1 }}'])
+def test_deep_unary_chains_fail_when_evaluated(template):
+    fn = compile_template(template)
+    with pytest.raises(ExpressionError, match='nested too deeply'):
+        fn(ExpressionContext({}))
+
+@pytest.mark.parametrize('template, expected', [
+    ('={{ Math.pow(10, 400) }}', math.inf),
+    ('={{ Math.pow(-10, 401) }}', -math.inf),
+    ('={{ Math.pow(0, -1) }}', math.inf),
+    ('={{ Math.floor(Math.pow(10, 400)) }}', math.inf),
+    ('={{ Math.pow(2, 10) }}', 1024),
+])
+def test_math_overflow_gives_infinity(template, expected):
+    assert compile_template(template)(ExpressionContext({})) == expected
+
+@pytest.mark.parametrize('template', ['={{ Math.sqrt(-1) }}', '={{ Math.pow(-8, 0.5) }}', '={{ Math.floor(Math.sqrt(-1)) }}'])
+def test_math_domain_errors_give_nan(template):
+    assert math.isnan(compile_template(template)(ExpressionContext({})))
+
+def test_node_lookup_with_non_string_name_is_null():
+    ctx = ExpressionContext({'x': ['Start']}, outputs={'Start': [{'id': 1}]})
+    assert compile_template('={{ $($json.x) }}')(ctx) is None
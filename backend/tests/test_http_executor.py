@@ -0,0 +1,71 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from executors.http_executor import HttpExecutor
+from workflow_engine import WorkflowEngine
+
+PAYLOAD = os.urandom(64 * 1024)
+
+def make_engine(spill_dir) -> WorkflowEngine:
+    app = FastAPI()
+
+    @app.get("/cv.pdf")
+    async def cv():
+        return Response(PAYLOAD, media_type='application/pdf')
+
+    @app.put("/upload")
+    async def upload():
+        return {'ok': True}
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://files')
+    engine = WorkflowEngine(step_delay=0)
+    engine.http = HttpExecutor(client=lambda: client, spill_bytes=1024, spill_dir=str(spill_dir))
+    return engine
+
+DOWNLOAD = {'name': 'download CV', 'type': 'n8n-nodes-base.httpRequest', 'parameters': {'url': 'http://files/cv.pdf', 'options': {'response': {'response': {'responseFormat': 'file'}}}}}
+
+def test_spill_files_removed_after_completed_run(tmp_path):
+    engine = make_engine(tmp_path)
+    seen = []
+
+    class Peek(HttpExecutor):
+        async def execute(self, step, data, credentials):
+            path = data['binary']['data']['path']
+            seen.append(os.path.getsize(path))
+            return data
+
+    engine.executors['generic'] = Peek()
+    result = asyncio.run(engine.execute({'steps': [DOWNLOAD, {'name': 'Use', 'type': 'n8n-nodes-base.code', 'parameters': {}}]}, {}, {}))
+
+    assert seen == [len(PAYLOAD)]  # the file existed while the run used it
+    assert os.listdir(tmp_path) == []
+    assert result['binary']['data']['fileSize'] == len(PAYLOAD)
+    assert 'path' not in result['binary']['data']
+
+def test_spill_files_removed_after_failed_run(tmp_path):
+    engine = make_engine(tmp_path)
+    failing = {'name': 'Broken', 'type': 'n8n-nodes-base.httpRequest', 'parameters': {'url': 'http://files/missing'}}
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(engine.execute({'steps': [DOWNLOAD, failing]}, {}, {}))
+    assert os.listdir(tmp_path) == []
+
+UPLOAD = {'name': 'Upload', 'type': 'n8n-nodes-base.httpRequest', 'parameters': {'method': 'PUT', 'url': 'http://files/upload', 'contentType': 'binaryData'}}
+
+def test_binary_upload_streams_file_spilled_by_this_run(tmp_path):
+    result = asyncio.run(make_engine(tmp_path).execute({'steps': [DOWNLOAD, UPLOAD]}, {}, {}))
+    assert result['http_result']['body'] == {'ok': True}
+
+@pytest.mark.parametrize('path', ['/etc/passwd', '{spill}/../outside', '{spill}/response-foreign'])
+def test_binary_upload_rejects_paths_not_spilled_by_this_run(tmp_path, path):
+    spill = tmp_path / 'spill'
+    spill.mkdir()
+    (tmp_path / 'outside').write_bytes(b'secret')
+    (spill / 'response-foreign').write_bytes(b'another run')
+    item = {'binary': {'data': {'path': path.format(spill=spill)}}}
+    with pytest.raises(ValueError, match='not a file downloaded by this run'):
+        asyncio.run(make_engine(spill).execute({'steps': [UPLOAD]}, item, {}))
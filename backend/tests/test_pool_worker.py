@@ -0,0 +1,40 @@
+import asyncio
+
+from interpreter_pool import InterpreterPool
+
+DIRTY = '''
+import builtins, os, sys
+import migromat_runtime
+from migromat_runtime.sync import api
+migromat_runtime.Config.AIRTABLE_BASE_ID = "other-base"
+migromat_runtime.Config.EXTRA = 1
+api.email_queue("someone@example.com", "subject", "body")
+os.environ["LEAKED"] = "1"
+sys.exit = lambda *args: None
+builtins.print = lambda *args, **kwargs: None
+'''
+
+CHECK = '''
+import os, sys
+import migromat_runtime
+from migromat_runtime.sync import api
+print([migromat_runtime.Config.AIRTABLE_BASE_ID, hasattr(migromat_runtime.Config, "EXTRA"), len(api.batchers), "LEAKED" in os.environ])
+sys.exit(3)
+'''
+
+def test_warm_worker_does_not_leak_state_between_runs():
+    async def runs():
+        pool = InterpreterPool(size=1, max_runs=10)
+        await pool.start()
+        try:
+            before = await pool.run(CHECK)
+            await pool.run(DIRTY)
+            after = await pool.run(CHECK)
+        finally:
+            await pool.close()
+        return before, after
+
+    before, after = asyncio.run(runs())
+    assert before.stdout.endswith(", False, 0, False]\n")
+    assert after.stdout == before.stdout
+    assert after.exit_code == 3
@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+from run_dispatcher import RunDispatcher
+
+async def noop():
+    pass
+
+def test_submit_before_start_is_a_clear_error():
+    async def submit():
+        RunDispatcher(1, 1).submit(noop)
+    with pytest.raises(RuntimeError, match='not started'):
+        asyncio.run(submit())
+
+def test_submitted_run_completes():
+    async def submit():
+        dispatcher = RunDispatcher(1, 1)
+        await dispatcher.start()
+        await dispatcher.submit(noop)
+        await dispatcher.close()
+        return dispatcher.completed
+    assert asyncio.run(submit()) == 1
@@ -0,0 +1,31 @@
+import threading
+
+from migromat_runtime import Config
+from migromat_runtime.sync import Batcher
+
+def test_partial_batch_is_sent_when_its_wait_runs_out(monkeypatch):
+    monkeypatch.setattr(Config, 'BATCH_MAX_WAIT', 0.05)
+    sent, done = [], threading.Event()
+    batcher = Batcher(lambda items: sent.append(items) or items, 10)
+    batcher.add('a', lambda result: done.set())
+    batcher.add('b')
+    assert done.wait(2)
+    assert sent == [['a', 'b']]
+
+def test_full_batch_is_sent_at_once_and_cancels_the_timer(monkeypatch):
+    monkeypatch.setattr(Config, 'BATCH_MAX_WAIT', 60)
+    sent = []
+    batcher = Batcher(sent.append, 2)
+    batcher.add('a')
+    batcher.add('b')
+    assert sent == [['a', 'b']]
+    assert batcher.timer is None
+
+def test_cancel_drops_queued_calls(monkeypatch):
+    monkeypatch.setattr(Config, 'BATCH_MAX_WAIT', 0.05)
+    sent = []
+    batcher = Batcher(sent.append, 10)
+    batcher.add('a')
+    batcher.cancel()
+    threading.Event().wait(0.2)
+    assert sent == []
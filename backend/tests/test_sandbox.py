@@ -0,0 +1,43 @@
+import asyncio
+import sys
+
+import httpx
+
+import main
+from process_runner import run_process
+from sandbox import ExecutionPool, Limits, limited_command
+
+SLEEP = {'code': 'import time; time.sleep(0.5)'}
+
+def test_concurrent_requests_beyond_queue_limit_get_one_503(monkeypatch):
+    pool = ExecutionPool(max_running=2, max_queued=1)
+    monkeypatch.setattr(main, 'EXECUTION_POOL', pool)
+
+    async def fire():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://app', timeout=30) as client:
+            return await asyncio.gather(*(client.post('/api/execute/code?stream=true', json=SLEEP) for _ in range(pool.max_running + pool.max_queued + 1)))
+
+    statuses = sorted(r.status_code for r in asyncio.run(fire()))
+    assert statuses == [200, 200, 200, 503]
+    assert pool.rejected == 1
+    assert (pool.running, pool.queued, len(pool.reserved)) == (0, 0, 0)
+
+def test_stream_releases_its_own_reservation():
+    pool = ExecutionPool(max_running=2, max_queued=2)
+    first, second = pool.admit(), pool.admit()
+
+    async def drain():
+        async for _ in pool.gated(empty(), second):
+            pass
+    asyncio.run(drain())
+    assert list(pool.reserved) == [first]
+
+async def empty():
+    return
+    yield
+
+def test_limits_are_applied_before_the_command_runs():
+    limits = Limits(cpu_seconds=5, memory_bytes=1 << 30, open_files=64, output_bytes=1 << 20)
+    code = 'import resource; print(resource.getrlimit(resource.RLIMIT_NOFILE)[0], resource.getrlimit(resource.RLIMIT_CPU)[0])'
+    result = asyncio.run(run_process(limited_command([sys.executable, '-c', code], limits), timeout=30))
+    assert result.stdout.split() == ['64', '5']
@@ -0,0 +1,18 @@
+import pytest
+
+from scheduler import CronError, find_schedules
+
+def weekly(days):
+    trigger = {'name': 'Weekly', 'type': 'n8n-nodes-base.scheduleTrigger',
+               'parameters': {'rule': {'interval': [{'field': 'weeks', 'triggerAtDay': days, 'triggerAtHour': 9}]}}}
+    return find_schedules({'steps': [trigger]})
+
+def test_weekly_rule_on_given_days():
+    _, [(name, schedule)] = weekly([1, 3])
+    assert name == 'Weekly#0'
+    assert '0 9 * * 1,3' in repr(schedule)
+
+@pytest.mark.parametrize('days', [['monday'], [None], 3])
+def test_malformed_weekdays_are_a_cron_error(days):
+    with pytest.raises(CronError):
+        weekly(days)
@@ -0,0 +1,24 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+from parsers.schemas import validate_workflow
+
+def zap(action):
+    return {'name': 'zap', 'trigger': {'app': 'Webhooks', 'action': 'Catch Hook'}, 'steps': [{'app': 'Gmail', 'action': action, 'params': {}}]}
+
+def test_null_zapier_action_is_a_schema_error():
+    errors = validate_workflow('zapier', zap(None))
+    assert [e['loc'] for e in errors] == ['steps.0.action']
+
+def test_null_zapier_action_upload_answers_422():
+    client = TestClient(main.app)
+    r = client.post('/api/workflows/upload', files={'file': ('zap.json', json.dumps(zap(None)), 'application/json')})
+    assert r.status_code == 422
+    assert r.json()['detail']['errors'][0]['loc'] == 'steps.0.action'
+
+def test_missing_zapier_action_still_parses():
+    data = zap('Send Email')
+    del data['steps'][0]['action']
+    assert validate_workflow('zapier', data) == []
@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+
+from executors.http_executor import HttpExecutor
+from scheduler import Scheduler
+from webhooks import WebhookRegistry
+from workflow_engine import WorkflowEngine
+
+FETCH = {'name': 'Fetch', 'type': 'n8n-nodes-base.httpRequest', 'parameters': {'url': '={{ "http://api/" + $("Webhook").item.json.body.x + "/" + $json.body.x }}'}}
+
+def test_webhook_trigger_output_is_visible_to_later_steps():
+    seen = []
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: seen.append(str(request.url)) or httpx.Response(200, json={})))
+    engine = WorkflowEngine(step_delay=0)
+    engine.http = HttpExecutor(client=lambda: client)
+
+    registry = WebhookRegistry()
+    registry.register('wf', {'name': 'hook', 'steps': [{'name': 'Webhook', 'type': 'n8n-nodes-base.webhook', 'parameters': {'path': 'in'}}, FETCH]})
+    route = registry.match('in')
+    asyncio.run(engine.execute({'steps': route.compiled.steps}, {'body': {'x': 'abc'}}, {}, plan=route.compiled.plan, trigger=route.compiled.trigger))
+    assert seen == ['http://api/abc/abc']
+
+def test_schedule_trigger_name_is_kept_for_its_steps():
+    scheduler = Scheduler(lambda job, nominal: None)
+    trigger = {'name': 'Every hour', 'type': 'n8n-nodes-base.scheduleTrigger', 'parameters': {'rule': {'interval': [{'field': 'hours'}]}}}
+    scheduler.register('wf', 'hash', {'steps': [trigger, FETCH]})
+    (job,) = scheduler.jobs.values()
+    assert job.compiled.trigger == 'Every hour'
+    assert [s['name'] for s in job.compiled.steps] == ['Fetch']
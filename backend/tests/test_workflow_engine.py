@@ -0,0 +1,29 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import workflow_engine
+from workflow_engine import WorkflowEngine
+
+SAVE = {'steps': [{'name': 'Save', 'type': 'n8n-nodes-base.airtable', 'parameters': {}}]}
+
+def airtable_returning(count, monkeypatch):
+    def handler(request):
+        records = json.loads(request.content)['records']
+        return httpx.Response(200, json={'records': [{'id': f'rec{i}'} for i in range(min(count, len(records)))]})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(workflow_engine, 'http_client', lambda: client)
+    return WorkflowEngine(service_urls={'airtable': 'http://airtable'}, step_delay=0)
+
+def test_database_batch_maps_every_item(monkeypatch):
+    engine = airtable_returning(100, monkeypatch)
+    items = [{'name': f'n{i}'} for i in range(25)]
+    out = asyncio.run(engine.execute(SAVE, items, {}))
+    assert [o['db_result'] for o in out] == [f'rec{i % 10}' for i in range(25)]
+
+def test_database_batch_fails_when_records_go_missing(monkeypatch):
+    engine = airtable_returning(3, monkeypatch)
+    with pytest.raises(ValueError, match='created 3 of 5 records'):
+        asyncio.run(engine.execute(SAVE, [{'name': f'n{i}'} for i in range(5)], {}))
@@ -0,0 +1,30 @@
+import json
+
+from main import get_workflow_ir
+from node_registry import NODE_REGISTRY
+from parsers.n8n_parser import N8nParser
+
+WORKFLOW = {'name': 'ir', 'nodes': [
+    {'id': '1', 'name': 'Save', 'type': 'n8n-nodes-base.airtable', 'parameters': {}, 'position': [0, 0]}
+], 'connections': {}}
+
+def test_ir_rebuilt_after_node_registry_reload_without_version_bump(tmp_path):
+    original = NODE_REGISTRY.path
+    doc = json.load(open(original))
+    doc['types']['airtablenext'] = doc['types'].pop('airtable')
+    reloaded = tmp_path / 'node_types.json'
+    reloaded.write_text(json.dumps(doc))
+
+    wf = {'parsed': N8nParser().parse(WORKFLOW)}
+    before = get_workflow_ir(wf)
+    assert before.nodes[0].kind == 'airtable'
+    assert get_workflow_ir(wf) is before
+    NODE_REGISTRY.reload()  # same contents: nothing to rebuild
+    assert get_workflow_ir(wf) is before
+    try:
+        NODE_REGISTRY.path = str(reloaded)
+        NODE_REGISTRY.reload()
+        assert get_workflow_ir(wf).nodes[0].kind == 'airtablenext'
+    finally:
+        NODE_REGISTRY.path = original
+        NODE_REGISTRY.reload()
@@ -0,0 +1,75 @@
+from typing import Dict, Any, Optional, List, Set
+from dataclasses import dataclass, field
+import logging
+
+from node_registry import normalize_type
+from workflow_engine import CompiledPlan
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_TYPES = {'webhook', 'formtrigger'}
+SYNC_RESPONSE_MODES = {'lastNode', 'responseNode'}
+ANY_METHOD = {'GET', 'POST'}
+
+@dataclass
+class WebhookRoute:
+    workflow_id: str
+    name: str
+    methods: Set[str]
+    respond_sync: bool  # reply with the run's result instead of acknowledging right away
+    compiled: CompiledPlan
+    paths: List[str] = field(default_factory=list)
+
+def find_trigger(parsed: Dict[str, Any]) -> Optional[int]:
+    """Index of the workflow's inbound webhook step: n8n webhook/formTrigger, a Zapier webhook, a Make gateway"""
+    for i, step in enumerate(parsed['steps']):
+        if normalize_type(step.get('type', '')) in TRIGGER_TYPES or str(step.get('module', '')).startswith('gateway:'):
+            return i
+    return None
+
+def clean_path(path: str) -> str:
+    return path.strip().strip('/')
+
+class WebhookRegistry:
+    """Inbound webhook paths -> precompiled routes; a hit is one dict lookup"""
+
+    def __init__(self):
+        self.routes: Dict[str, WebhookRoute] = {}
+        self.by_workflow: Dict[str, WebhookRoute] = {}
+
+    def register(self, workflow_id: str, parsed: Dict[str, Any]) -> List[str]:
+        """Paths (without the /webhook/ prefix) now serving this workflow; empty if it has no webhook trigger.
+
+        Every route answers at its workflow id; the trigger's own path is added when no other workflow holds it.
+        """
+        index = find_trigger(parsed)
+        if index is None:
+            return []
+        trigger = parsed['steps'][index]
+        params = trigger.get('parameters') or {}
+        method = str(params.get('httpMethod', '')).upper()
+        steps = parsed['steps'][:index] + parsed['steps'][index + 1:]
+        route = WebhookRoute(
+            workflow_id=workflow_id, name=parsed.get('name', ''),
+            methods={method} if method else ({'POST'} if normalize_type(trigger['type']) == 'formtrigger' else set(ANY_METHOD)),
+            respond_sync=params.get('responseMode') in SYNC_RESPONSE_MODES,
+            compiled=CompiledPlan(steps, trigger=trigger['name'])
+        )
+        for path in (workflow_id, clean_path(str(params.get('path') or ''))):
+            if path and path not in self.routes:
+                self.routes[path] = route
+                route.paths.append(path)
+        self.by_workflow[workflow_id] = route
+        return route.paths
+
+    def unregister(self, workflow_id: str):
+        route = self.by_workflow.pop(workflow_id, None)
+        if route is not None:
+            for path in route.paths:
+                self.routes.pop(path, None)
+
+    def match(self, path: str) -> Optional[WebhookRoute]:
+        return self.routes.get(path) or self.routes.get(clean_path(path))
+
+    def stats(self) -> Dict[str, Any]:
+        return {'workflows': len(self.by_workflow), 'paths': len(self.routes)}
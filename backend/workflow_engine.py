@@ -1,13 +1,59 @@
 import asyncio
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Optional, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass, field
 import httpx
+import os
 
 import logging
 
+from node_registry import NODE_REGISTRY
+from executors.base_executor import BaseExecutor
+from executors.http_executor import HttpExecutor, HTTP_CONCURRENCY, http_client, spill_scope, release_spills
+from expressions import ExpressionContext, compile_parameters
+
 logger = logging.getLogger(__name__)
 
+# Pause between steps; ENGINE_STEP_DELAY=0 runs steps back to back
+STEP_DELAY = float(os.getenv('ENGINE_STEP_DELAY', 0.1))
+# Items per call for the built-in handlers (0 = the whole item list); custom executors declare batch_size
+BUILTIN_BATCH_SIZES = {
+    'database': 10,  # Airtable creates at most 10 records per request
+    'email': int(os.getenv('ENGINE_EMAIL_BATCH', 100)),
+    'ai': int(os.getenv('ENGINE_AI_CONCURRENCY', 8)),
+    'http': HTTP_CONCURRENCY,
+    'generic': 0,
+}
+
+# (step, engine category, parameter resolver or None when the step has no expressions) in execution order
+Plan = List[Tuple[Dict[str, Any], str, Optional[Callable[[ExpressionContext], Any]]]]
+
+def compile_plan(steps: List[Dict[str, Any]]) -> Plan:
+    """Resolve each step's executor category and compile its parameter expressions once"""
+    return [(step, NODE_REGISTRY.category('engine', step['type']), compile_parameters(step.get('parameters'))) for step in steps]
+
+class CompiledPlan:
+    """Steps of a workflow that runs many times (webhooks, schedules) with a cached plan,
+    recompiled if node mappings were reloaded since.
+
+    trigger names the trigger step taken out of steps: the run's input items stand in for its output.
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]], trigger: Optional[str] = None):
+        self.steps = steps
+        self.trigger = trigger
+        self._plan = compile_plan(steps)
+        self._generation = NODE_REGISTRY.generation
+
+    @property
+    def plan(self) -> Plan:
+        generation = NODE_REGISTRY.generation
+        if generation != self._generation:
+            self._plan, self._generation = compile_plan(self.steps), generation
+        return self._plan
+
+STATUS_FIELDS = ('id', 'workflow_id', 'status', 'started_at', 'completed_at', 'result', 'error', 'logs', 'duration')
+
 @dataclass
 class WorkflowExecution:
     id: str
@@ -15,7 +61,7 @@ class WorkflowExecution:
     status: str  # 'running', 'completed', 'failed'
     started_at: datetime
     completed_at: datetime = None
-    result: Dict[str, Any] = None
+    result: Union[Dict[str, Any], List[Dict[str, Any]]] = None
     error: str = None
     logs: List[Dict[str, Any]] = field(default_factory=list)
     
@@ -39,95 +85,188 @@ class WorkflowExecution:
             'logs': self.logs,
             'duration': (self.completed_at - self.started_at).total_seconds() if self.completed_at else None
         }
+    
+    def delta(self, since: int = 0, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """to_dict restricted to `fields`, with only the log entries after cursor `since`.
+
+        Logs are append-only, so the entry count is a stable cursor; log_cursor is always included.
+        """
+        state = self.to_dict()
+        state['logs'] = self.logs[since:]
+        out = {k: v for k, v in state.items() if fields is None or k in fields}
+        out['log_cursor'] = len(self.logs)
+        return out
 
 class WorkflowEngine:
-    """Execute workflows from any platform"""
+    """Execute workflows from any platform
+
+    service_urls maps 'airtable', 'openai' and 'sendgrid' to base URLs (e.g. the mock_services
+    server); steps for a mapped service make real calls there instead of returning placeholders.
+    HTTP Request steps always make real calls. All calls share one pooled client per event loop.
+    executors maps an engine category ('http', 'ai', 'email', 'database', 'generic') to a
+    BaseExecutor that replaces the built-in handler for it.
+    Steps run over lists of items, chunked to each handler's batch size (BUILTIN_BATCH_SIZES or
+    the executor's batch_size).
+    """
     
-    def __init__(self):
-        self.session = None
+    def __init__(self, service_urls: Optional[Dict[str, str]] = None, executors: Optional[Dict[str, BaseExecutor]] = None, step_delay: float = STEP_DELAY):
+        self.http = HttpExecutor()
+        self.service_urls = service_urls or {}
+        self.executors = executors or {}
+        self.step_delay = step_delay
     
     async def execute(
         self,
         workflow: Dict[str, Any],
-        input_data: Dict[str, Any],
+        input_data: Union[Dict[str, Any], List[Dict[str, Any]]],
         credentials: Dict[str, str],
-        log_callback: Callable = None
-    ) -> Dict[str, Any]:
-        """Execute workflow steps"""
+        log_callback: Callable = None,
+        plan: Optional[Plan] = None,
+        trigger: Optional[str] = None
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Execute workflow steps, or the precompiled `plan` in place of workflow['steps'].
+
+        input_data is one item or a list of items; every step runs over the whole list. A single
+        input item that stays a single item comes back as a dict, anything else as the item list.
+        `trigger` is the name of a trigger step left out of the plan; the input items are its output.
+        """
         
         self.log = log_callback or (lambda log: logger.info(log))
-        data = input_data
+        single = not isinstance(input_data, list)
+        items = [input_data] if single else input_data
+        steps = plan if plan is not None else compile_plan(workflow['steps'])
+        outputs: Dict[str, List[Dict[str, Any]]] = {trigger: items} if trigger else {}  # step name -> its output items, for $node["Name"] / $("Name")
         
-        total_steps = len(workflow['steps'])
+        total_steps = len(steps)
         self.log({'level': 'info', 'message': f"Starting workflow with {total_steps} steps"})
         
-        async with httpx.AsyncClient() as self.session:
-
-            for i, step in enumerate(workflow['steps'], 1):
-                self.log({'level': 'info', 'message': f"[{i}/{total_steps}] Executing: {step['name']}"})
+        # Files HTTP steps spill to disk are this run's alone: deleted when it ends, even on failure
+        with spill_scope() as spills:
+            for i, (step, category, resolve) in enumerate(steps, 1):
+                count = '' if len(items) == 1 else f" ({len(items)} items)"
+                self.log({'level': 'info', 'message': f"[{i}/{total_steps}] Executing: {step['name']}{count}"})
                 
                 try:
-                    data = await self.execute_step(step, data, credentials)
+                    parameters = None if resolve is None else [
+                        resolve(ExpressionContext(item, outputs, n, items=items)) for n, item in enumerate(items)
+                    ]
+                    items = await self.execute_items(step, items, credentials, category, parameters)
+                    outputs[step['name']] = items
                     self.log({'level': 'success', 'message': f"✓ {step['name']} completed"})
-                    await asyncio.sleep(0.1)  # Small delay between steps
+                    if self.step_delay:
+                        await asyncio.sleep(self.step_delay)
                 except Exception as e:
                     self.log({'level': 'error', 'message': f"✗ {step['name']} failed: {str(e)}"})
                     raise
+
+            items = release_spills(items, spills)
         
         self.log({'level': 'success', 'message': 'All steps completed successfully'})
-        return data
+        return items[0] if single and len(items) == 1 else items
+    
+    async def execute_items(
+        self,
+        step: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        credentials: Dict[str, str],
+        category: Optional[str] = None,
+        parameters: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run one step over items, in chunks of its handler's batch size"""
+        
+        category = category or NODE_REGISTRY.category('engine', step['type'])
+        executor = self.executors.get(category)
+        if executor is not None:
+            run, size = executor.execute_batch, executor.batch_size
+        else:
+            run, size = self.execute_builtin(category), BUILTIN_BATCH_SIZES.get(category, 1)
+        size = max(1, size or len(items))
+        
+        if len(items) <= size:
+            return await run(step, items, credentials, parameters)
+        out: List[Dict[str, Any]] = []
+        for start in range(0, len(items), size):
+            chunk = parameters[start:start + size] if parameters is not None else None
+            out.extend(await run(step, items[start:start + size], credentials, chunk))
+        return out
     
     async def execute_step(
         self,
         step: Dict[str, Any],
         data: Dict[str, Any],
-        credentials: Dict[str, str]
+        credentials: Dict[str, str],
+        category: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Execute single step"""
-        
-        step_type = step['type'].lower()
-        
-        # Route to appropriate executor
-        if 'http' in step_type or 'webhook' in step_type:
-            return await self.execute_http(step, data)
-        elif 'openai' in step_type or 'ai' in step_type:
-            return await self.execute_ai(step, data, credentials)
-        elif 'email' in step_type or 'gmail' in step_type:
-            return await self.execute_email(step, data, credentials)
-        elif 'database' in step_type or 'airtable' in step_type:
-            return await self.execute_database(step, data, credentials)
-        else:
-            # Generic execution (placeholder)
-            return await self.execute_generic(step, data)
+        """Execute single step for a single item"""
+        out = await self.execute_items(step, [data], credentials, category)
+        return out[0] if out else {}
     
-    async def execute_http(self, step: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute HTTP request"""
-        method = step.get('method', 'GET')
-        url = step.get('url', '')
-        headers = step.get('headers', {})
-        body = step.get('body', {})
+    def execute_builtin(self, category: str) -> Callable:
+        """Batch handler for a category no custom executor replaces"""
+        handler = {'http': self.execute_http, 'ai': self.execute_ai, 'email': self.execute_email, 'database': self.execute_database}.get(category, self.execute_generic)
         
-        logger.info(f"HTTP {method} {url}")
-        
-        # Placeholder - implement actual HTTP request
-        return {**data, 'http_result': 'success'}
+        async def run(step, items, credentials, parameters):
+            steps = [step] * len(items) if parameters is None else [{**step, 'parameters': p} for p in parameters]
+            return await handler(steps, items, credentials)
+        return run
+    
+    async def execute_http(self, steps: List[Dict[str, Any]], items: List[Dict[str, Any]], credentials: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Execute HTTP request: steps with a URL call it, the chunk concurrently; triggers and forms pass items on"""
+        async def one(step, data):
+            if not ((step.get('parameters') or {}).get('url') or step.get('url')):
+                return {**data, 'http_result': 'success'}
+            return await self.http.execute(step, data, credentials)
+        return list(await asyncio.gather(*(one(step, data) for step, data in zip(steps, items))))
+    
+    async def call_service(self, service: str, path: str, payload: Dict[str, Any], credentials: Dict[str, str]) -> httpx.Response:
+        key = credentials.get(f'{service}_api_key')
+        headers = {'Authorization': f"Bearer {key}"} if key else {}
+        r = await http_client().post(self.service_urls[service] + path, json=payload, headers=headers)
+        r.raise_for_status()
+        return r
     
-    async def execute_ai(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
-        """Execute AI operation"""
+    async def execute_ai(self, steps: List[Dict[str, Any]], items: List[Dict[str, Any]], credentials: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Execute AI operation: one completion per item, the whole chunk concurrently"""
+        if 'openai' in self.service_urls:
+            async def complete(step, data):
+                params = step.get('parameters') or {}
+                payload = {'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': params.get('prompt') or params.get('text') or f"{step['name']}: {data}"}]}
+                r = await self.call_service('openai', '/v1/chat/completions', payload, credentials)
+                return {**data, 'ai_result': r.json()['choices'][0]['message']['content']}
+            return list(await asyncio.gather(*(complete(step, data) for step, data in zip(steps, items))))
         # Placeholder - implement OpenAI/Anthropic calls
-        return {**data, 'ai_result': 'success'}
+        return [{**data, 'ai_result': 'success'} for data in items]
     
-    async def execute_email(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
-        """Execute email operation"""
+    async def execute_email(self, steps: List[Dict[str, Any]], items: List[Dict[str, Any]], credentials: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Execute email operation: a chunk sharing sender and body goes out as one bulk send"""
+        if 'sendgrid' in self.service_urls:
+            groups: Dict[tuple, List[Dict[str, Any]]] = {}
+            for step, data in zip(steps, items):
+                params = step.get('parameters') or {}
+                to = params.get('toEmail') or data.get('email', 'test@example.com')
+                key = (params.get('fromEmail') or 'noreply@example.com', params.get('text') or 'Done')
+                groups.setdefault(key, []).append({'to': [{'email': to}], 'subject': params.get('subject') or step['name']})
+            for (sender, text), personalizations in groups.items():
+                payload = {'personalizations': personalizations, 'from': {'email': sender}, 'subject': personalizations[0]['subject'], 'content': [{'type': 'text/plain', 'value': text}]}
+                await self.call_service('sendgrid', '/v3/mail/send', payload, credentials)
         # Placeholder - implement email sending
-        return {**data, 'email_result': 'success'}
+        return [{**data, 'email_result': 'success'} for data in items]
     
-    async def execute_database(self, step: Dict[str, Any], data: Dict[str, Any], credentials: Dict[str, str]) -> Dict[str, Any]:
-        """Execute database operation"""
+    async def execute_database(self, steps: List[Dict[str, Any]], items: List[Dict[str, Any]], credentials: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Execute database operation: the chunk is written as one batch of records"""
+        if 'airtable' in self.service_urls:
+            base = credentials.get('airtable_base_id', 'app')
+            records = [{'fields': {'Name': data.get('name', step['name'])}} for step, data in zip(steps, items)]
+            r = await self.call_service('airtable', f"/v0/{base}/Table", {'records': records}, credentials)
+            created = r.json().get('records', [])
+            if len(created) != len(items):
+                # Pairing what came back with the inputs would drop or misattribute items
+                raise ValueError(f"Airtable created {len(created)} of {len(items)} records")
+            return [{**data, 'db_result': record.get('id')} for data, record in zip(items, created)]
         # Placeholder - implement database queries
-        return {**data, 'db_result': 'success'}
+        return [{**data, 'db_result': 'success'} for data in items]
     
-    async def execute_generic(self, step: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_generic(self, steps: List[Dict[str, Any]], items: List[Dict[str, Any]], credentials: Dict[str, str]) -> List[Dict[str, Any]]:
         """Generic step execution (placeholder)"""
         await asyncio.sleep(0.2)  # Simulate work
-        return {**data, f"{step['name']}_result": 'success'}
+        return [{**data, f"{step['name']}_result": 'success'} for step, data in zip(steps, items)]
@@ -0,0 +1,128 @@
+from typing import Dict, Any, Optional, List, Tuple
+import base64
+import bisect
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+SORT_FIELDS = ('created_at', 'name')
+SUMMARY_FIELDS = ('id', 'name', 'platform', 'steps', 'created_at')
+
+Entry = Tuple[str, str]  # (sort key, workflow id); the id breaks ties so entries are unique
+
+class InvalidQuery(ValueError):
+    pass
+
+def encode_cursor(entry: Entry) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(entry)).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Entry:
+    try:
+        key, wid = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return str(key), str(wid)
+    except (ValueError, TypeError):
+        raise InvalidQuery("Invalid cursor")
+
+class WorkflowIndex:
+    """Listing summaries plus sorted secondary indexes, maintained on upload and delete.
+
+    Every sort field has one ordering over all workflows and one per platform, so a platform
+    filter and a range on the sort field (name prefix, creation time) are both bisect lookups.
+    Other filters are applied while walking the range, which stops once a page is full.
+    """
+
+    def __init__(self):
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+        self._orders: Dict[Tuple[Optional[str], str], List[Entry]] = {}
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    @staticmethod
+    def _sort_key(summary: Dict[str, Any], field: str) -> str:
+        return summary['name'].casefold() if field == 'name' else summary[field]
+
+    def _lists(self, summary: Dict[str, Any]):
+        for field in SORT_FIELDS:
+            entry = (self._sort_key(summary, field), summary['id'])
+            for platform in (None, summary['platform']):
+                yield self._orders.setdefault((platform, field), []), entry
+
+    def add(self, wid: str, name: Any, platform: str, steps: int, created_at: str):
+        summary = {'id': wid, 'name': str(name), 'platform': platform, 'steps': steps, 'created_at': created_at}
+        self.summaries[wid] = summary
+        for order, entry in self._lists(summary):
+            bisect.insort(order, entry)
+
+    def remove(self, wid: str):
+        summary = self.summaries.pop(wid, None)
+        if summary is None:
+            return
+        for order, entry in self._lists(summary):
+            i = bisect.bisect_left(order, entry)
+            if i < len(order) and order[i] == entry:
+                del order[i]
+
+    def query(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        platform: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        sort: str = '-created_at',
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """One page of summaries; next_cursor is None on the last page.
+
+        created_after is inclusive and created_before exclusive. Cursors stay valid across
+        uploads and deletes because they hold the last entry seen, not an offset.
+        """
+        descending = sort.startswith('-')
+        field = sort.lstrip('-')
+        if field not in SORT_FIELDS:
+            raise InvalidQuery(f"Unknown sort field: {field}")
+        fields = fields or list(SUMMARY_FIELDS)
+        unknown = [f for f in fields if f not in SUMMARY_FIELDS]
+        if unknown:
+            raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+        prefix = name_prefix.casefold() if name_prefix else None
+
+        order = self._orders.get((platform, field), [])
+        lo, hi = 0, len(order)
+        # Narrow to the range the sort index can answer directly
+        if field == 'name' and prefix:
+            lo = bisect.bisect_left(order, (prefix,))
+            hi = bisect.bisect_left(order, (prefix + '\U0010ffff',))
+        elif field == 'created_at':
+            if created_after:
+                lo = bisect.bisect_left(order, (created_after,))
+            if created_before:
+                hi = bisect.bisect_left(order, (created_before,))
+        if cursor:
+            after = decode_cursor(cursor)
+            if descending:
+                hi = min(hi, bisect.bisect_left(order, after))
+            else:
+                lo = max(lo, bisect.bisect_right(order, after))
+
+        page: List[Dict[str, Any]] = []
+        last: Optional[Entry] = None
+        more = False
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        for i in positions:
+            summary = self.summaries[order[i][1]]
+            if prefix and not summary['name'].casefold().startswith(prefix):
+                continue
+            if created_after and summary['created_at'] < created_after:
+                continue
+            if created_before and summary['created_at'] >= created_before:
+                continue
+            if len(page) == limit:
+                more = True
+                break
+            page.append({f: summary[f] for f in fields})
+            last = order[i]
+        return {'workflows': page, 'next_cursor': encode_cursor(last) if more and last else None}
@@ -0,0 +1,34 @@
+from typing import AsyncIterator, Tuple
+import time
+import zipfile
+
+class _ChunkSink:
+    """Write-only file object; zipfile falls back to data descriptors because it cannot seek"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+async def stream_zip(entries: AsyncIterator[Tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """Yield a zip archive piece by piece as entries arrive; only the current entry is held in memory"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        async for name, body in entries:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, body)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    yield sink.drain()
@@ -2,7 +2,7 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Code, Upload, Download, Copy, CheckCircle, AlertCircle, FileJson, Play, Loader, Terminal, CheckCircle2, XCircle, Trash2 } from 'lucide-react';
-import { uploadWorkflow } from '../lib/workflowApi';
+import { uploadWorkflow, executePythonStream } from '../lib/workflowApi';
 import { InteractiveTerminal } from './InteractiveTerminal';
 export const Agents: React.FC = () => {
   const [workflowFile, setWorkflowFile] = useState<File | null>(null);
@@ -78,15 +78,13 @@ const [terminalSessionId] = useState(() => Math.random().toString(36).substring(
     setExecutionOutput(prev => prev + '🔧 Preparing workflow engine...\n\n');
     
     try {
-      const response = await fetch(`http://localhost:8000/api/workflows/${workflowId}/execute/python`, {
-        method: 'POST'
+      const result = await executePythonStream(workflowId, (chunk) => {
+        setExecutionOutput(prev => prev + chunk.text);
       });
       
-      if (!response.ok) throw new Error('Execution failed');
-      
-      const result = await response.json();
-      
-      setExecutionOutput(prev => prev + result.output || 'No output');
+      if (result.status === 'timeout') setExecutionOutput(prev => prev + '\nTIMEOUT\n');
+      if (result.truncated) setExecutionOutput(prev => prev + '\n⚠️ Output limit reached - process stopped\n');
+      setExecutionOutput(prev => prev + `\n${result.success ? '✅ SUCCESS' : '❌ FAILED'}\n`);
       setExecutionStatus(result.success ? 'success' : 'failed');
       
     } catch (err: any) {
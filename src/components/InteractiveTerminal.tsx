@@ -1,6 +1,7 @@
 // src/components/InteractiveTerminal.tsx
 import React, { useState, useEffect, useRef } from 'react';
 import { Terminal, X, Minimize2, Maximize2, Trash2, Play } from 'lucide-react';
+import { executeCodeStream } from '../lib/workflowApi';
 
 interface TerminalProps {
   workflowId?: string;
@@ -90,18 +91,18 @@ export const InteractiveTerminal: React.FC<TerminalProps> = ({ workflowId, onClo
     try {
       setExecuting(true);
       
-      const response = await fetch('http://localhost:8000/api/execute/code', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ code: cmd })
+      let received = false;
+      const result = await executeCodeStream(cmd, (chunk) => {
+        received = true;
+        setOutput(prev => [...prev, chunk.text]);
       });
 
-      const result = await response.json();
-
-      if (result.success) {
-        addOutput(result.output || '✓ Success', 'output');
-      } else {
+      if (result.truncated) {
+        addOutput('Output limit reached - process stopped', 'error');
+      } else if (!result.success) {
         addOutput(result.error || 'Execution failed', 'error');
+      } else if (!received) {
+        addOutput('✓ Success', 'output');
       }
     } catch (error: any) {
       addOutput(`Connection Error: ${error.message}\nMake sure backend is running on http://localhost:8000`, 'error');
@@ -29,6 +29,7 @@ export interface ExecutionStatus {
   error: string | null;
   logs: Array<{ timestamp: string; level: string; message: string }>;
   duration: number | null;
+  log_cursor?: number;
 }
 
 // Upload workflow
@@ -46,7 +47,10 @@ export async function uploadWorkflow(file: File): Promise<WorkflowUploadResponse
     
     if (!response.ok) {
       const error = await response.json().catch(() => ({ detail: 'Upload failed' }));
-      throw new Error(error.detail || `Upload failed: ${response.statusText}`);
+      const detail = typeof error.detail === 'object' && error.detail
+        ? [error.detail.message, ...(error.detail.errors || []).slice(0, 3).map((e: any) => `${e.loc}: ${e.message}`)].join('\n')
+        : error.detail;
+      throw new Error(detail || `Upload failed: ${response.statusText}`);
     }
     
     const data = await response.json();
@@ -102,23 +106,50 @@ export async function getExecutionStatus(executionId: string): Promise<Execution
 }
 
 // Poll execution status
+// Each poll asks only for log lines after the last cursor and skips `result` until the run is
+// final; a 304 means nothing changed since the previous poll.
 export async function pollExecutionStatus(
   executionId: string,
   onUpdate?: (status: ExecutionStatus) => void
 ): Promise<ExecutionStatus> {
   let attempts = 0;
   const maxAttempts = 60; // 2 minutes (2s intervals)
+  const progressFields = 'id,workflow_id,status,started_at,completed_at,error,logs,duration';
+  let current: ExecutionStatus | null = null;
+  let etag: string | null = null;
   
   while (attempts < maxAttempts) {
     try {
-      const status = await getExecutionStatus(executionId);
+      const since = current?.log_cursor ?? 0;
+      const response = await fetch(
+        `${API_URL}/api/executions/${executionId}?since=${since}&fields=${progressFields}`,
+        { headers: etag ? { 'If-None-Match': etag } : {} }
+      );
       
-      if (onUpdate) {
-        onUpdate(status);
-      }
-      
-      if (status.status === 'completed' || status.status === 'failed') {
-        return status;
+      if (response.status !== 304) {
+        if (!response.ok) {
+          throw new Error('Status check failed');
+        }
+        etag = response.headers.get('ETag');
+        const delta = await response.json();
+        current = { ...(current ?? {}), ...delta, logs: [...(current?.logs ?? []), ...delta.logs] } as ExecutionStatus;
+        
+        if (onUpdate) {
+          onUpdate(current);
+        }
+        
+        if (current.status === 'completed' || current.status === 'failed') {
+          const tail = await fetch(`${API_URL}/api/executions/${executionId}?since=${current.log_cursor ?? 0}&fields=result,logs`);
+          if (!tail.ok) {
+            throw new Error('Status check failed');
+          }
+          const rest = await tail.json();
+          const final = { ...current, result: rest.result, logs: [...current.logs, ...rest.logs], log_cursor: rest.log_cursor } as ExecutionStatus;
+          if (onUpdate) {
+            onUpdate(final);
+          }
+          return final;
+        }
       }
       
       await new Promise(resolve => setTimeout(resolve, 2000));
@@ -145,7 +176,7 @@ export async function downloadConvertedWorkflow(
     const response = await fetch(
       `${API_URL}/api/workflows/${workflowId}/download/${targetPlatform}`,
       { 
-        method: 'POST',
+        method: 'GET',
         headers: {
           'Accept': 'application/json'
         }
@@ -191,13 +222,17 @@ export async function downloadConvertedWorkflow(
 }
 
 // Export to Python (for Agents section)
-export async function exportToPython(workflowId: string, workflowName: string): Promise<void> {
+export async function exportToPython(
+  workflowId: string,
+  workflowName: string,
+  runtime: 'sync' | 'async' = 'sync'
+): Promise<void> {
   try {
     console.log('🐍 Exporting to Python:', workflowId);
     
     const response = await fetch(
-      `${API_URL}/api/workflows/${workflowId}/export/python`,
-      { method: 'POST' }
+      `${API_URL}/api/workflows/${workflowId}/export/python?runtime=${runtime}`,
+      { method: 'GET' }
     );
     
     if (!response.ok) {
@@ -232,10 +267,31 @@ export async function exportToPython(workflowId: string, workflowName: string):
   }
 }
 
-// List all workflows
-export async function listWorkflows() {
+export interface ListWorkflowsOptions {
+  limit?: number;
+  cursor?: string;
+  platform?: 'n8n' | 'zapier' | 'make';
+  namePrefix?: string;
+  createdAfter?: string;
+  createdBefore?: string;
+  sort?: 'created_at' | '-created_at' | 'name' | '-name';
+  fields?: string[];
+}
+
+// List workflows, one page at a time (pass the returned next_cursor to continue)
+export async function listWorkflows(options: ListWorkflowsOptions = {}) {
   try {
-    const response = await fetch(`${API_URL}/api/workflows`);
+    const params = new URLSearchParams();
+    if (options.limit) params.set('limit', String(options.limit));
+    if (options.cursor) params.set('cursor', options.cursor);
+    if (options.platform) params.set('platform', options.platform);
+    if (options.namePrefix) params.set('name_prefix', options.namePrefix);
+    if (options.createdAfter) params.set('created_after', options.createdAfter);
+    if (options.createdBefore) params.set('created_before', options.createdBefore);
+    if (options.sort) params.set('sort', options.sort);
+    if (options.fields?.length) params.set('fields', options.fields.join(','));
+    const query = params.toString();
+    const response = await fetch(`${API_URL}/api/workflows${query ? `?${query}` : ''}`);
     
     if (!response.ok) {
       throw new Error('Failed to list workflows');
@@ -269,6 +325,88 @@ export async function executeCode(code: string): Promise<any> {
   }
 }
 
+export interface OutputChunk {
+  stream: 'stdout' | 'stderr';
+  text: string;
+}
+
+// Read a server-sent event stream from an execution endpoint; resolves with the 'done' payload
+async function readOutputStream(response: Response, onOutput: (chunk: OutputChunk) => void): Promise<any> {
+  if (!response.body) throw new Error('Streaming not supported');
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let done: any = null;
+  
+  while (true) {
+    const { value, done: finished } = await reader.read();
+    if (finished) break;
+    buffer += decoder.decode(value, { stream: true });
+    
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = block.match(/^event: (.*)$/m)?.[1];
+      const data = block.match(/^data: (.*)$/m)?.[1];
+      if (!data) continue;
+      if (event === 'output') onOutput(JSON.parse(data));
+      else if (event === 'queued') onOutput({ stream: 'stderr', text: `⏳ Waiting for a free execution slot (position ${JSON.parse(data).position})\n` });
+      else if (event === 'done') done = JSON.parse(data);
+    }
+  }
+  
+  if (!done) throw new Error('Execution stream ended unexpectedly');
+  return done;
+}
+
+// Execute terminal input, streaming output as it is produced
+export async function executeCodeStream(code: string, onOutput: (chunk: OutputChunk) => void): Promise<any> {
+  const response = await fetch(`${API_URL}/api/execute/code?stream=true`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ code })
+  });
+  
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({ detail: 'Code execution failed' }));
+    throw new Error(error.detail || 'Code execution failed');
+  }
+  
+  // Validation errors (e.g. empty input) still come back as plain JSON
+  if (!response.headers.get('Content-Type')?.includes('text/event-stream')) {
+    const result = await response.json();
+    if (result.output) onOutput({ stream: 'stdout', text: result.output });
+    return result;
+  }
+  
+  return readOutputStream(response, onOutput);
+}
+
+// Execute a workflow's generated Python, streaming output as it is produced
+export async function executePythonStream(
+  workflowId: string,
+  onOutput: (chunk: OutputChunk) => void,
+  runtime: 'sync' | 'async' = 'sync'
+): Promise<any> {
+  const response = await fetch(`${API_URL}/api/workflows/${workflowId}/execute/python?stream=true&runtime=${runtime}`, {
+    method: 'POST'
+  });
+  
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({ detail: 'Execution failed' }));
+    throw new Error(error.detail || 'Execution failed');
+  }
+  
+  if (!response.headers.get('Content-Type')?.includes('text/event-stream')) {
+    const result = await response.json();
+    if (result.output) onOutput({ stream: 'stdout', text: result.output });
+    return result;
+  }
+  
+  return readOutputStream(response, onOutput);
+}
+
 // Health check
 export async function healthCheck(): Promise<boolean> {
   try {